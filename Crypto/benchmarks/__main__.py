@@ -0,0 +1,66 @@
+"""
+Run the benchmark suite from the Crypto directory:
+
+    python -m benchmarks                                    # 10k and 1m rows, synthetic data
+    python -m benchmarks --sizes 10k,1m,10m --filter 'indicator|env'
+    python -m benchmarks --data recorded                    # the committed BTC/USDT candles, tiled to each size
+    python -m benchmarks --data path/to/candles.npy         # other recorded candles (see fixtures.record_ohlcv)
+    python -m benchmarks --save-baseline                    # store the results as the baseline
+    python -m benchmarks --output results.json              # compare against the baseline, exit 1 on regression
+    python -m benchmarks --no-compare                       # just print the timings
+
+Without --save-baseline or --no-compare, a missing or non-comparable baseline exits 1 as well, so a
+CI job cannot pass without having compared anything.
+"""
+import argparse
+import sys
+from pathlib import Path
+
+from benchmarks.runner import compare, load, run, save
+
+
+DEFAULT_BASELINE = Path(__file__).parent / 'baseline.json'
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='Time and memory-profile the hot paths.')
+    parser.add_argument('--sizes', default='10k,1m', help="Comma-separated fixture sizes: 10k, 1m, 10m or row counts.")
+    parser.add_argument('--filter', default=None, help='Regex selecting benchmark names.')
+    parser.add_argument('--data', default='synthetic',
+                        help="'synthetic', 'recorded' (the committed fixture) or a recorded .npy fixture.")
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--budget', type=float, default=10.0, help='Seconds of timed calls per benchmark at most.')
+    parser.add_argument('--output', default=None, help='Write the results JSON here.')
+    parser.add_argument('--baseline', default=str(DEFAULT_BASELINE))
+    parser.add_argument('--save-baseline', action='store_true', help='Write the results to --baseline instead of comparing.')
+    parser.add_argument('--no-compare', action='store_true', help='Do not compare against the baseline.')
+    parser.add_argument('--time-tolerance', type=float, default=0.25)
+    parser.add_argument('--memory-tolerance', type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes.split(','), args.filter, args.data, args.repeats, args.budget)
+    if args.output:
+        save(results, args.output)
+    if args.save_baseline:
+        save(results, args.baseline)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+    if args.no_compare:
+        return 0
+    if not Path(args.baseline).exists():
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one, or pass --no-compare")
+        return 1
+
+    baseline = load(args.baseline)
+    if baseline['source'] != results['source']:
+        print(f"Baseline was recorded on '{baseline['source']}' data, not '{results['source']}'; "
+              f"pass matching --data or --no-compare")
+        return 1
+    regressions = compare(results, baseline, args.time_tolerance, args.memory_tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,124 @@
+from pathlib import Path
+
+import ccxt
+import numpy as np
+import pandas as pd
+
+
+SIZES = {'10k': 10_000, '1m': 1_000_000, '10m': 10_000_000}
+MINUTE_MS = 60_000
+# 10k 1m BTC/USDT candles in the `record_ohlcv` layout, selected with source 'recorded'. The committed
+# file was made offline (synthetic_ohlcv, seed 1, rounded to Binance's tick and lot sizes); refresh it
+# with `record_ohlcv(fetcher, RECORDED_FIXTURE, start)` on a host with network access.
+RECORDED_FIXTURE = Path(__file__).parent / 'data' / 'btcusdt_1m.npy'
+
+
+def parse_size(size) -> int:
+    """Row count for '10k', '1m', '10m' or a plain integer."""
+    if isinstance(size, int):
+        return size
+    return SIZES.get(size.lower()) or int(size)
+
+
+def synthetic_ohlcv(rows: int, seed: int = 0, start: str = '2020-01-01', step_ms: int = MINUTE_MS,
+                    volatility: float = 1e-3, price: float = 30000.0) -> np.ndarray:
+    """
+    Reproducible random-walk candles in the raw ccxt layout.
+
+    Closes follow a geometric random walk, each open is the previous close, highs and lows extend the
+    body by a random fraction, and volumes are log-normal.
+
+    Returns:
+        np.ndarray: (rows x 6) float64 array of [timestamp ms, open, high, low, close, volume].
+    """
+    rng = np.random.default_rng(seed)
+    close = price * np.exp(np.cumsum(rng.normal(0.0, volatility, rows)))
+    open_ = np.concatenate(([price], close[:-1]))
+    body_high, body_low = np.maximum(open_, close), np.minimum(open_, close)
+    wick = np.abs(rng.normal(0.0, volatility / 2, (2, rows)))
+    out = np.empty((rows, 6))
+    out[:, 0] = pd.Timestamp(start).value // 1_000_000 + np.arange(rows) * step_ms
+    out[:, 1] = open_
+    out[:, 2] = body_high * (1 + wick[0])
+    out[:, 3] = body_low * (1 - wick[1])
+    out[:, 4] = close
+    out[:, 5] = rng.lognormal(3.0, 1.0, rows)
+    return out
+
+
+def record_ohlcv(fetcher, path, start, end=None, symbol: str = None, timeframe: str = None) -> np.ndarray:
+    """
+    Record real candles once (network needed) into an offline .npy fixture in the raw ccxt layout.
+
+    Args:
+        fetcher (CcxtFetcher): Configured fetcher; its `fetch_history` does the paging.
+        path: Output .npy path.
+        start, end, symbol, timeframe: Passed to `fetch_history`.
+    """
+    df = fetcher.fetch_history(start, end, symbol, timeframe)
+    if df is None:
+        raise RuntimeError(f"Recording failed: {fetcher.get_exception()}")
+    rows = np.column_stack([df['date'].to_numpy().astype('datetime64[ms]').astype(np.int64),
+                            df[['open', 'high', 'low', 'close', 'volume']].to_numpy(dtype=np.float64)])
+    np.save(path, rows)
+    return rows
+
+
+def recorded_ohlcv(path, rows: int = None) -> np.ndarray:
+    """
+    Load a recorded fixture, extended to `rows` candles if it is shorter.
+
+    The recording is tiled forwards and backwards in time alternately, so prices stay continuous and
+    bounded however many times it repeats; timestamps continue at the recording's bar interval.
+    """
+    recorded = np.load(path)
+    if rows is None or rows <= len(recorded):
+        return recorded[:rows].copy()
+    mirrored = recorded[::-1].copy()
+    mirrored[:, [1, 4]] = mirrored[:, [4, 1]]  # running backwards, each bar opens at its close
+    cycle = np.concatenate([recorded, mirrored])
+    out = np.resize(cycle, (rows, 6))
+    step = int(np.median(np.diff(recorded[:, 0]))) if len(recorded) > 1 else MINUTE_MS
+    out[:, 0] = recorded[0, 0] + np.arange(rows) * step
+    return out
+
+
+def ohlcv_frame(rows: np.ndarray, tic: str = 'BTC/USDT') -> pd.DataFrame:
+    """Candles in the layout `CcxtFetcher` returns: 'date', 'tic', 'open', 'high', 'low', 'close', 'volume', 'day'."""
+    dates = pd.to_datetime(rows[:, 0].astype(np.int64), unit='ms')
+    df = pd.DataFrame({'date': dates, 'tic': tic, 'open': rows[:, 1], 'high': rows[:, 2], 'low': rows[:, 3],
+                       'close': rows[:, 4], 'volume': rows[:, 5]})
+    df['day'] = df['date'].dt.dayofweek
+    return df
+
+
+def price_panel(rows: int, dates: int = 252 * 5, seed: int = 0) -> pd.DataFrame:
+    """About `rows` daily closes as a (dates x tickers) frame, the layout `HQM` and `HQMScreener` take."""
+    tickers = max(2, rows // dates)
+    rng = np.random.default_rng(seed)
+    closes = 100.0 * np.exp(np.cumsum(rng.normal(0.0005, 0.02, (dates, tickers)), axis=0))
+    index = pd.date_range('2015-01-01', periods=dates, freq='B')
+    return pd.DataFrame(closes, index=index, columns=[f'T{i:05d}' for i in range(tickers)])
+
+
+class MockCcxtExchange:
+    """
+    Offline stand-in for a ccxt exchange, serving `fetch_ohlcv` pages from a candle array.
+
+    Pages come back as lists of lists, as ccxt returns them, so the fetcher's parsing path runs
+    unchanged; `rateLimit` is 0 so the throttle never sleeps.
+    """
+    rateLimit = 0
+    parse_timeframe = staticmethod(ccxt.Exchange.parse_timeframe)
+
+    def __init__(self, rows: np.ndarray):
+        self.timestamps = rows[:, 0].astype(np.int64)
+        # integer millisecond timestamps and float prices, as ccxt parses them
+        self.rows = [[t, *bar] for t, bar in zip(self.timestamps.tolist(), rows[:, 1:].tolist())]
+        self.requests = 0
+
+    def fetch_ohlcv(self, symbol: str, timeframe: str = '1m', since: int = None, limit: int = None):
+        self.requests += 1
+        first = 0 if since is None else int(np.searchsorted(self.timestamps, since))
+        last = len(self.rows) if limit is None else first + limit
+        return self.rows[first:last]
@@ -0,0 +1,114 @@
+import gc
+import json
+import platform
+import re
+import statistics
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.fixtures import parse_size
+from benchmarks.suite import BENCHMARKS, Fixture
+
+
+def measure(fn, repeats: int = 5, budget: float = 10.0) -> dict:
+    """
+    Time `fn` and record its peak traced allocation.
+
+    One warm-up call, then up to `repeats` timed calls (fewer if they would exceed `budget` seconds),
+    then one call under `tracemalloc`, which sees NumPy and pandas buffers as well as Python objects.
+    """
+    gc.collect()
+    start = time.perf_counter()
+    fn()
+    warmup = time.perf_counter() - start
+    repeats = max(1, min(repeats, int(budget / max(warmup, 1e-9))))
+
+    times = []
+    for _ in range(repeats):
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {'min_s': min(times), 'median_s': statistics.median(times), 'repeats': repeats, 'peak_bytes': peak}
+
+
+def environment() -> dict:
+    return {'python': platform.python_version(), 'numpy': np.__version__, 'pandas': pd.__version__,
+            'machine': platform.machine(), 'processor': platform.processor(), 'system': platform.system(),
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds')}
+
+
+def run(sizes=('10k', '1m'), pattern: str = None, source: str = 'synthetic', repeats: int = 5,
+        budget: float = 10.0, log=print) -> dict:
+    """
+    Run the registered benchmarks matching `pattern` (a regex on the name) at each fixture size.
+
+    Returns:
+        dict: {'environment': ..., 'source': ..., 'results': {'<name>[<size>]': measurement}}, JSON-serializable.
+    """
+    selected = [bench for name, bench in BENCHMARKS.items() if pattern is None or re.search(pattern, name)]
+    results = {}
+    for size in sizes:
+        fixture = Fixture(parse_size(size), source)
+        for bench in selected:
+            if size not in bench.sizes:
+                continue
+            key = f'{bench.name}[{size}]'
+            result = measure(bench.setup(fixture), repeats, budget)
+            result['rows'] = fixture.rows
+            result['rows_per_s'] = fixture.rows / result['min_s'] if result['min_s'] > 0 else None
+            results[key] = result
+            log(f"{key:<45} {result['min_s'] * 1e3:>12.3f} ms {result['peak_bytes'] / 2**20:>10.1f} MiB")
+        del fixture
+        gc.collect()
+    return {'environment': environment(), 'source': source, 'results': results}
+
+
+def compare(current: dict, baseline: dict, time_tolerance: float = 0.25, memory_tolerance: float = 0.25,
+            min_seconds: float = 1e-3, min_bytes: int = 2**20) -> list:
+    """
+    Regressions of `current` against `baseline` (both as returned by `run`).
+
+    A benchmark regresses when its best time is more than `time_tolerance` slower, or its peak
+    allocation more than `memory_tolerance` larger, than in the baseline. Differences below
+    `min_seconds` / `min_bytes` are treated as noise. Benchmarks missing from either side are ignored.
+
+    Returns:
+        list: One message per regression; empty if none.
+    """
+    regressions = []
+    for key, result in current['results'].items():
+        reference = baseline['results'].get(key)
+        if reference is None:
+            continue
+        slower = result['min_s'] - reference['min_s']
+        if slower > min_seconds and result['min_s'] > reference['min_s'] * (1 + time_tolerance):
+            regressions.append(f"{key}: time {reference['min_s'] * 1e3:.3f} ms -> {result['min_s'] * 1e3:.3f} ms "
+                               f"({result['min_s'] / reference['min_s']:.2f}x)")
+        larger = result['peak_bytes'] - reference['peak_bytes']
+        if larger > min_bytes and result['peak_bytes'] > reference['peak_bytes'] * (1 + memory_tolerance):
+            regressions.append(f"{key}: peak memory {reference['peak_bytes'] / 2**20:.1f} MiB -> "
+                               f"{result['peak_bytes'] / 2**20:.1f} MiB")
+    return regressions
+
+
+def save(results: dict, path):
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2)
+
+
+def load(path) -> dict:
+    with open(path, 'r') as f:
+        return json.load(f)
@@ -0,0 +1,170 @@
+import contextlib
+import json
+import logging
+import tempfile
+from dataclasses import dataclass
+from functools import cached_property
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.fixtures import (RECORDED_FIXTURE, MockCcxtExchange, ohlcv_frame, price_panel, recorded_ohlcv,
+                                 synthetic_ohlcv)
+
+
+@dataclass
+class Benchmark:
+    """One timed operation: `setup(fixture)` does the untimed preparation and returns the callable to time."""
+    name: str
+    setup: callable
+    sizes: tuple
+
+
+BENCHMARKS = {}
+
+INDICATOR_PROPERTIES = ('rsi', 'macd', 'ema', 'sma', 'bollinger_bands', 'adx', 'cci', 'atr', 'roc', 'stoch',
+                        'williams', 'obv', 'momentum', 'donchian', 'aroon', 'adix', 'cmo', 'trix')
+
+
+def benchmark(name: str, sizes=('10k', '1m', '10m')):
+    """Register `setup` under `name` for the given fixture sizes."""
+    def register(setup):
+        BENCHMARKS[name] = Benchmark(name, setup, tuple(sizes))
+        return setup
+    return register
+
+
+def _checked(fn, name: str):
+    # the repo's screeners report errors by printing and returning None (or an empty frame); a benchmark
+    # must not time that
+    def run():
+        result = fn()
+        if result is None:
+            raise RuntimeError(f"{name} returned None")
+        if getattr(result, 'empty', False) or (hasattr(result, '__len__') and len(result) == 0):
+            raise RuntimeError(f"{name} returned an empty result")
+        return result
+    return run
+
+
+@dataclass
+class Fixture:
+    """
+    Candles of one size shared by every benchmark of a run, derived lazily and cached.
+
+    Args:
+        rows (int): Number of candles.
+        source (str): 'synthetic', 'recorded' (the committed `RECORDED_FIXTURE`) or the path of a
+            recorded .npy fixture (see `record_ohlcv`).
+        seed (int): Seed of the synthetic data. Defaults to 0.
+    """
+    rows: int
+    source: str = 'synthetic'
+    seed: int = 0
+
+    @cached_property
+    def ohlcv(self) -> np.ndarray:
+        if self.source == 'synthetic':
+            return synthetic_ohlcv(self.rows, self.seed)
+        return recorded_ohlcv(RECORDED_FIXTURE if self.source == 'recorded' else self.source, self.rows)
+
+    @cached_property
+    def frame(self):
+        return ohlcv_frame(self.ohlcv)
+
+    @cached_property
+    def exchange(self) -> MockCcxtExchange:
+        return MockCcxtExchange(self.ohlcv)
+
+    @cached_property
+    def panel(self):
+        return price_panel(self.rows, seed=self.seed)
+
+    @cached_property
+    def features(self) -> np.ndarray:
+        from finrl_implimentation.finrl_implimentation import build_features
+        return build_features(self.frame)
+
+
+def _indicator(name):
+    def setup(fixture):
+        from indicator_and_strategy.indicators import Indicator
+        indicator = Indicator(fixture.frame)
+        return _checked(lambda: getattr(indicator, name), f'Indicator.{name}')
+    return setup
+
+
+for _name in INDICATOR_PROPERTIES:
+    benchmark(f'indicator.{_name}')(_indicator(_name))
+
+
+@benchmark('momentum.execute_strategy')
+def momentum_strategy(fixture):
+    from indicator_and_strategy.momentumstrategy import MomentumStrategy
+    strategy = MomentumStrategy(fixture.frame[['date', 'close']].copy())
+    return strategy.execute_strategy
+
+
+@benchmark('meanreversion.execute_strategy')
+def mean_reversion_strategy(fixture):
+    from indicator_and_strategy.meanreversionstrategy import MeanReversionStrategy
+    strategy = MeanReversionStrategy(fixture.frame[['date', 'close']].copy())
+    return strategy.execute_strategy
+
+
+@benchmark('hqm.get_hqm_score')
+def hqm_score(fixture):
+    from indicator_and_strategy.hqm_screener import HQM
+    panel = fixture.panel
+    return _checked(lambda: HQM(panel).get_hqm_score(), 'HQM.get_hqm_score')
+
+
+@benchmark('hqm_screener.screen')
+def hqm_screen(fixture):
+    from indicator_and_strategy.hqm_screener import HQMScreener
+    screener = HQMScreener(fixture.panel)
+    return screener.screen
+
+
+@benchmark('preprocessor.preprocess')
+def preprocess(fixture):
+    from data_preprocessor.preprocessor import DataPreprocessor
+    rows = fixture.exchange.rows
+    return lambda: DataPreprocessor(rows, source='ccxt').preprocess()
+
+
+@benchmark('preprocessor.ingest')
+def ingest(fixture):
+    from data_preprocessor.preprocessor import DataPreprocessor
+    rows = fixture.exchange.rows
+    return lambda: DataPreprocessor(rows, source='ccxt').ingest()
+
+
+@benchmark('fetcher.fetch_history')
+def fetch_history(fixture):
+    from data_fetcher.datafetcher import CcxtFetcher
+    exchange = fixture.exchange
+    config = {'binance': {'symbol': 'BTC/USDT', 'timeframe': '1m', 'page_limit': 1000, 'max_workers': 4}}
+    with tempfile.TemporaryDirectory() as tmp, contextlib.chdir(tmp):
+        Path('config.json').write_text(json.dumps(config))
+        fetcher = CcxtFetcher('binance', Path(tmp) / 'config.json')
+    fetcher.exchange = exchange
+    fetcher.logger.setLevel(logging.WARNING)  # per-call INFO lines would be timed too
+    start, end = int(exchange.timestamps[0]), int(exchange.timestamps[-1]) + 1
+    return _checked(lambda: fetcher.fetch_history(start, end), 'CcxtFetcher.fetch_history')
+
+
+@benchmark('env.step')
+def env_step(fixture, n_envs: int = 64):
+    """Step `n_envs` envs for rows / n_envs steps, i.e. one env step per fixture row."""
+    from finrl_implimentation.finrl_implimentation import VecTradingEnv
+    features = fixture.features
+    env = VecTradingEnv(features, fixture.ohlcv[:, 4], n_envs=n_envs, episode_length=min(2048, len(features) // 2),
+                        seed=0)
+    actions = np.random.default_rng(0).integers(0, 3, size=(max(1, fixture.rows // n_envs), n_envs))
+
+    def run():
+        env.reset(seed=0)
+        for action in actions:
+            env.step(action)
+    return run
@@ -0,0 +1,129 @@
+import json
+import re
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.fs as pafs
+import pyarrow.parquet as pq
+
+
+CANDLE_SCHEMA = pa.schema([
+    ('date', pa.timestamp('ms')),
+    ('open', pa.float64()),
+    ('high', pa.float64()),
+    ('low', pa.float64()),
+    ('close', pa.float64()),
+    ('volume', pa.float64()),
+])
+
+
+@dataclass
+class CandleCache:
+    """
+    Persistent Parquet cache of OHLCV candles, partitioned by source/symbol/timeframe.
+
+    Each top-up is written as a new append-only part file, and a small `_meta.json` per partition
+    records the cached low- and high-water marks so callers only fetch what is missing.
+    Reads memory-map the part files and push date-range filters down to the Parquet row-group
+    statistics instead of loading whole partitions.
+
+    Args:
+        root (Path): Directory holding the cache.
+    """
+    root: Path = Path('candle_cache')
+
+    def __post_init__(self):
+        self.root = Path(self.root)
+        self._filesystem = pafs.LocalFileSystem(use_mmap=True)
+
+    def partition(self, source: str, symbol: str, timeframe: str) -> Path:
+        """Return the directory for one source/symbol/timeframe partition."""
+        safe_symbol = re.sub(r'[^A-Za-z0-9.-]', '_', symbol)
+        return self.root / f'source={source}' / f'symbol={safe_symbol}' / f'timeframe={timeframe}'
+
+    def bounds(self, source: str, symbol: str, timeframe: str):
+        """
+        Return the cached (low, high) water marks as Timestamps, or None if the partition is empty.
+        """
+        meta_file = self.partition(source, symbol, timeframe) / '_meta.json'
+        if not meta_file.exists():
+            return None
+        meta = json.loads(meta_file.read_text())
+        return pd.to_datetime(meta['low'], unit='ms'), pd.to_datetime(meta['high'], unit='ms')
+
+    def write(self, source: str, symbol: str, timeframe: str, df: pd.DataFrame, since=None):
+        """
+        Append candles to a partition and advance its water marks.
+
+        Args:
+            df (pd.DataFrame): Frame with at least 'date', 'open', 'high', 'low', 'close' and 'volume' columns.
+            since (optional): Start of the fetched range. Extends the low-water mark even when the
+                              source had no candles that early, so the gap is not fetched again.
+        """
+        bounds = self.bounds(source, symbol, timeframe)
+        if df is None or df.empty:
+            if since is not None and bounds is not None and pd.Timestamp(since) < bounds[0]:
+                self._write_meta(source, symbol, timeframe, pd.Timestamp(since), bounds[1])
+            return
+        path = self.partition(source, symbol, timeframe)
+        path.mkdir(parents=True, exist_ok=True)
+
+        table = pa.Table.from_pandas(df[CANDLE_SCHEMA.names].sort_values('date'), schema=CANDLE_SCHEMA,
+                                     preserve_index=False)
+        pq.write_table(table, path / f'part-{time.time_ns()}.parquet')
+
+        low, high = pd.Timestamp(df['date'].min()), pd.Timestamp(df['date'].max())
+        if since is not None:
+            low = min(low, pd.Timestamp(since))
+        if bounds is not None:
+            low, high = min(low, bounds[0]), max(high, bounds[1])
+        self._write_meta(source, symbol, timeframe, low, high)
+
+    def _write_meta(self, source: str, symbol: str, timeframe: str, low: pd.Timestamp, high: pd.Timestamp):
+        meta = {'low': int(low.value // 1_000_000), 'high': int(high.value // 1_000_000)}
+        (self.partition(source, symbol, timeframe) / '_meta.json').write_text(json.dumps(meta))
+
+    def read(self, source: str, symbol: str, timeframe: str, start=None, end=None) -> pd.DataFrame:
+        """
+        Read cached candles in [start, end) in the `CcxtFetcher.fetch_data` layout.
+
+        Part files are scanned in write order and later writes win, so a re-fetched (previously
+        incomplete) candle replaces the stale one.
+        """
+        path = self.partition(source, symbol, timeframe)
+        files = sorted(str(f) for f in path.glob('part-*.parquet'))
+        if not files:
+            return None
+
+        predicate = None
+        if start is not None:
+            predicate = ds.field('date') >= pa.scalar(pd.Timestamp(start).to_pydatetime(), pa.timestamp('ms'))
+        if end is not None:
+            upper = ds.field('date') < pa.scalar(pd.Timestamp(end).to_pydatetime(), pa.timestamp('ms'))
+            predicate = upper if predicate is None else predicate & upper
+
+        tables = [pq.read_table(f, filters=predicate, schema=CANDLE_SCHEMA, filesystem=self._filesystem)
+                  for f in files]
+        df = pa.concat_tables(tables).to_pandas()
+        df = (df.drop_duplicates(subset='date', keep='last')
+                .sort_values('date')
+                .reset_index(drop=True))
+        df.insert(1, 'tic', symbol)
+        df['day'] = df['date'].dt.dayofweek
+        return df
+
+    def compact(self, source: str, symbol: str, timeframe: str):
+        """Rewrite all part files of a partition into a single de-duplicated file."""
+        df = self.read(source, symbol, timeframe)
+        if df is None:
+            return
+        path = self.partition(source, symbol, timeframe)
+        old_files = list(path.glob('part-*.parquet'))
+        table = pa.Table.from_pandas(df[CANDLE_SCHEMA.names], schema=CANDLE_SCHEMA, preserve_index=False)
+        pq.write_table(table, path / f'part-{time.time_ns()}.parquet')
+        for f in old_files:
+            f.unlink()
@@ -1,10 +1,26 @@
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
 import logging
 import json
+import threading
+import time
 from pathlib import Path
 import ccxt
+import ccxt.async_support as ccxt_async
+import websockets
 import yfinance as yf
 import pandas as pd
+from data_fetcher.cache import CandleCache
+from instrumentation.recorder import result_rows, timed
+
+
+def load_config(config_file: Path) -> dict:
+    """Load a config.json (per-exchange sections with keys, symbols, timeframes, ...)."""
+    with open(config_file, 'r') as f:
+        config = json.load(f)
+    return config
+
 
 class DataFetcher(ABC):
     """
@@ -18,6 +34,7 @@ class DataFetcher(ABC):
 
     Methods:
         fetch_data(self):
+        fetch_cached(self, start, end): Serve a date range from the local candle cache, fetching only what is missing.
     """
 
 
@@ -31,16 +48,18 @@ class DataFetcher(ABC):
         self.config = self._load_config()
 
     def setup_logging(self):
-        logging.basicConfig(level=logging.INFO,
-                            format='%(asctime)s - %(levelname)s - %(message)s',
-                            handlers=[logging.FileHandler("exchange_data_fetcher.log"),
-                                      logging.StreamHandler()])
-        self.logger = logging.getLogger()
+        # configure the package logger once per process; the root logger belongs to the application
+        self.logger = logging.getLogger('data_fetcher')
+        if not self.logger.handlers:
+            formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+            for handler in (logging.FileHandler("exchange_data_fetcher.log"), logging.StreamHandler()):
+                handler.setFormatter(formatter)
+                self.logger.addHandler(handler)
+            self.logger.setLevel(logging.INFO)
+            self.logger.propagate = False
 
     def _load_config(self):
-        with open(self.config_file, 'r') as f:
-            config = json.load(f)
-        return config
+        return load_config(self.config_file)
 
     def get_exception(self):
         return self.exception
@@ -49,6 +68,50 @@ class DataFetcher(ABC):
     def fetch_data(self):
         pass
 
+    def fetch_cached(self, start=None, end=None):
+        """
+        Serve candles in [start, end) from the on-disk `CandleCache`, fetching only the missing ranges.
+
+        Candles older than the cached low-water mark or newer than the high-water mark are fetched
+        through `_fetch_range` and appended to the cache; the latest cached candle is fetched again
+        in case it was still forming. The cache directory is the config 'cache_dir' (default 'candle_cache').
+
+        Args:
+            start (str | datetime, optional): Start of the range. Defaults to the config 'start_date'.
+            end (str | datetime, optional): End of the range, exclusive. Defaults to now (UTC).
+
+        Returns:
+            pandas.DataFrame: Candles in the 'date', 'tic', 'open', ..., 'day' layout, or None on error.
+        """
+        cache = CandleCache(Path(self.config.get('cache_dir', 'candle_cache')))
+        symbol, timeframe = self._cache_key()
+        start = pd.Timestamp(start if start is not None else self.config[self.exchange_id]['start_date'])
+        end = pd.Timestamp(end) if end is not None else pd.Timestamp.now(tz='UTC').tz_localize(None)
+
+        bounds = cache.bounds(self.exchange_id, symbol, timeframe)
+        if bounds is None:
+            missing = [(start, end)]
+        else:
+            low, high = bounds
+            missing = [(s, e) for s, e in ((start, low), (high, end)) if s < e]
+
+        for missing_start, missing_end in missing:
+            self.logger.info(f"Cache miss for {symbol} {timeframe}: fetching {missing_start} to {missing_end}")
+            df = self._fetch_range(missing_start, missing_end)
+            if df is None:
+                return None
+            cache.write(self.exchange_id, symbol, timeframe, df, since=missing_start)
+
+        return cache.read(self.exchange_id, symbol, timeframe, start, end)
+
+    def _cache_key(self):
+        """Return the (symbol, timeframe) this fetcher caches under."""
+        raise NotImplementedError(f"{type(self).__name__} does not support caching")
+
+    def _fetch_range(self, start, end):
+        """Fetch candles in [start, end) in the 'date', 'open', ..., 'volume' layout."""
+        raise NotImplementedError(f"{type(self).__name__} does not support caching")
+
 
 
 class CcxtFetcher(DataFetcher):
@@ -56,6 +119,8 @@ class CcxtFetcher(DataFetcher):
         super().__init__(config_file_path)
         self.exchange_id = exchange_id
         self.exchange = self.setup_exchange()
+        self._throttle_lock = threading.Lock()
+        self._next_request_at = 0.0
 
     def setup_exchange(self):
         try: 
@@ -73,6 +138,7 @@ class CcxtFetcher(DataFetcher):
             self.exception = e
             return None
 
+    @timed('fetch.ccxt', rows=result_rows)
     def fetch_data(self):
         """
         Fetches OHLCV (Open, High, Low, Close, Volume) data for a given symbol, timeframe, and limit.
@@ -96,12 +162,7 @@ class CcxtFetcher(DataFetcher):
         try:
             ohlcv_data = self.exchange.fetch_ohlcv(symbol, timeframe, limit=limit)
             self.logger.info("Successfully fetched OHLCV data")
-            df = pd.DataFrame(ohlcv_data, columns=['date', 'open', 'high', 'low', 'close', 'volume'])
-            df.date = pd.to_datetime(df.date, unit='ms')
-            df.insert(1, 'tic', symbol)
-            df['day'] = df['date'].dt.dayofweek
-            
-            return df
+            return self._to_dataframe(ohlcv_data, symbol)
         
         except ccxt.NetworkError as e:
             self.logger.error(f"Network error: {e}")
@@ -117,11 +178,200 @@ class CcxtFetcher(DataFetcher):
             
         return None
 
+    @timed('fetch.ccxt.history', rows=result_rows)
+    def fetch_history(self, start=None, end=None, symbol: str = None, timeframe: str = None):
+        """
+        Backfills OHLCV data between `start` and `end` by splitting the range into `since`-based pages.
+
+        Pages are fetched concurrently by a thread pool while request starts are spaced by the
+        exchange `rateLimit`. Overlapping or duplicated candles are dropped, so the result is one
+        contiguous frame in the same layout as `fetch_data`.
+
+        Args:
+            start (str | datetime | int, optional): Start of the range (int values are epoch ms). Defaults to the config 'start_date'.
+            end (str | datetime | int, optional): End of the range, exclusive. Defaults to the config 'end_date' or now.
+            symbol (str, optional): Market symbol. Defaults to the config 'symbol'.
+            timeframe (str, optional): Candle timeframe. Defaults to the config 'timeframe'.
+
+        Config keys (under the exchange section):
+            page_limit (int): Candles requested per page. Defaults to 1000.
+            max_workers (int): Concurrent page requests. Defaults to 4.
+            max_retries (int): Retries per page on network errors. Defaults to 3.
+
+        Returns:
+            pandas.DataFrame: Columns 'date', 'tic', 'open', 'high', 'low', 'close', 'volume' and 'day',
+                              sorted by date. If an error occurs, returns None.
+        """
+        exchange_config = self.config[self.exchange_id]
+        symbol = symbol or exchange_config.get('symbol', 'BTC/USDT')
+        timeframe = timeframe or exchange_config.get('timeframe', '1m')
+        page_limit = exchange_config.get('page_limit', 1000)
+        max_workers = exchange_config.get('max_workers', 4)
+
+        try:
+            start_ms = self._to_milliseconds(start if start is not None else exchange_config['start_date'])
+            end_ms = self._to_milliseconds(end if end is not None else exchange_config.get('end_date'))
+            timeframe_ms = self.exchange.parse_timeframe(timeframe) * 1000
+            page_span = page_limit * timeframe_ms
+            pages = list(range(start_ms, end_ms, page_span))
+
+            self.logger.info(f"Backfilling {symbol} {timeframe} from {start_ms} to {end_ms} in {len(pages)} pages")
+
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                results = pool.map(lambda since: self._fetch_page(symbol, timeframe, since, page_limit), pages)
+                ohlcv_data = [candle for page in results for candle in page]
+
+            df = self._to_dataframe(ohlcv_data, symbol)
+            in_range = (df['date'] >= pd.to_datetime(start_ms, unit='ms')) & (df['date'] < pd.to_datetime(end_ms, unit='ms'))
+            df = (df[in_range]
+                  .drop_duplicates(subset='date', keep='last')
+                  .sort_values('date')
+                  .reset_index(drop=True))
+            self.logger.info(f"Successfully backfilled {len(df)} candles")
+            return df
+
+        except ccxt.NetworkError as e:
+            self.logger.error(f"Network error: {e}")
+            self.exception = e
+
+        except ccxt.ExchangeError as e:
+            self.logger.error(f"Exchange error: {e}")
+            self.exception = e
+
+        except Exception as e:
+            self.logger.error(f"An error occurred: {e}")
+            self.exception = e
+
+        return None
+
+    def _cache_key(self):
+        exchange_config = self.config[self.exchange_id]
+        return exchange_config.get('symbol', 'BTC/USDT'), exchange_config.get('timeframe', '1m')
+
+    def _fetch_range(self, start, end):
+        return self.fetch_history(start, end)
+
+    @timed('fetch.ccxt.page', rows=result_rows)
+    def _fetch_page(self, symbol: str, timeframe: str, since: int, limit: int):
+        """Fetch one page of candles, retrying network errors with exponential backoff."""
+        max_retries = self.config[self.exchange_id].get('max_retries', 3)
+        for attempt in range(max_retries + 1):
+            self._throttle()
+            try:
+                return self.exchange.fetch_ohlcv(symbol, timeframe, since=since, limit=limit)
+            except ccxt.NetworkError as e:
+                if attempt == max_retries:
+                    raise
+                self.logger.warning(f"Retrying page {since} after network error: {e}")
+                time.sleep(2 ** attempt * self.exchange.rateLimit / 1000)
+
+    def _throttle(self):
+        """Space request starts by the exchange rate limit across all worker threads."""
+        with self._throttle_lock:
+            now = time.monotonic()
+            wait = self._next_request_at - now
+            self._next_request_at = max(now, self._next_request_at) + self.exchange.rateLimit / 1000
+        if wait > 0:
+            time.sleep(wait)
+
+    @staticmethod
+    def _to_milliseconds(value) -> int:
+        """Convert a date-like value (or None for now) to epoch milliseconds in UTC."""
+        if value is None:
+            return int(time.time() * 1000)
+        if isinstance(value, (int, float)):
+            return int(value)
+        return int(pd.Timestamp(value).timestamp() * 1000)
+
+    @staticmethod
+    def _to_dataframe(ohlcv_data, symbol: str) -> pd.DataFrame:
+        """Convert raw ccxt OHLCV rows into the 'date', 'tic', 'open', ..., 'day' layout."""
+        df = pd.DataFrame(ohlcv_data, columns=['date', 'open', 'high', 'low', 'close', 'volume'])
+        df.date = pd.to_datetime(df.date, unit='ms')
+        df.insert(1, 'tic', symbol)
+        df['day'] = df['date'].dt.dayofweek
+        return df
+
+class AsyncCcxtFetcher(DataFetcher):
+    """
+    Fetches OHLCV data for many symbols and timeframes concurrently through ccxt's async support.
+
+    A single async exchange instance (one HTTP session) is shared by every request, and ccxt's
+    own throttler keeps the requests within the exchange rate limit.
+
+    Config keys (under the exchange section):
+        symbols (list[str]): Market symbols. Defaults to [symbol].
+        timeframes (list[str]): Candle timeframes. Defaults to [timeframe].
+        limit (int): Candles per request. Defaults to 100.
+        since (str | int, optional): Start of the window, as accepted by `CcxtFetcher.fetch_history`.
+        max_concurrency (int): Maximum requests in flight. Defaults to 10.
+    """
+
+    def __init__(self, exchange_id: str = 'binance', config_file_path: Path = None):
+        super().__init__(config_file_path)
+        self.exchange_id = exchange_id
+
+    def _create_exchange(self):
+        exchange_id = self.config[self.exchange_id].get('exchange', 'binance')
+        return getattr(ccxt_async, exchange_id)({
+            'apiKey': self.config[self.exchange_id].get('api_key', ""),
+            'secret': self.config[self.exchange_id].get('secret_key', ""),
+            'enableRateLimit': True,
+        })
+
+    def fetch_data(self):
+        """
+        Fetches every configured (symbol, timeframe) pair concurrently.
+
+        Returns:
+            pandas.DataFrame: A long-format frame with columns 'date', 'tic', 'open', 'high', 'low', 'close',
+                              'volume', 'day' and 'timeframe', sorted by date and tic.
+                              If an error occurs during the fetching process, returns None.
+        """
+        try:
+            return asyncio.run(self.fetch_data_async())
+        except Exception as e:
+            self.logger.error(f"An error occurred: {e}")
+            self.exception = e
+            return None
+
+    @timed('fetch.ccxt_async', rows=result_rows)
+    async def fetch_data_async(self):
+        """Coroutine form of `fetch_data` for callers that already run an event loop."""
+        exchange_config = self.config[self.exchange_id]
+        symbols = exchange_config.get('symbols', [exchange_config.get('symbol', 'BTC/USDT')])
+        timeframes = exchange_config.get('timeframes', [exchange_config.get('timeframe', '1m')])
+        limit = exchange_config.get('limit', 100)
+        since = exchange_config.get('since')
+        since = CcxtFetcher._to_milliseconds(since) if since is not None else None
+        semaphore = asyncio.Semaphore(exchange_config.get('max_concurrency', 10))
+
+        self.logger.info(f"Fetching {len(symbols)} symbols x {len(timeframes)} timeframes from {self.exchange_id}")
+
+        exchange = self._create_exchange()
+        try:
+            async def fetch_one(symbol, timeframe):
+                async with semaphore:
+                    ohlcv_data = await exchange.fetch_ohlcv(symbol, timeframe, since=since, limit=limit)
+                df = CcxtFetcher._to_dataframe(ohlcv_data, symbol)
+                df['timeframe'] = timeframe
+                return df
+
+            frames = await asyncio.gather(*(fetch_one(symbol, timeframe)
+                                            for symbol in symbols for timeframe in timeframes))
+        finally:
+            await exchange.close()
+
+        self.logger.info("Successfully fetched OHLCV data")
+        return pd.concat(frames, ignore_index=True).sort_values(['date', 'tic'], kind='stable').reset_index(drop=True)
+
+
 class YFinanceFetcher(DataFetcher):
     def __init__(self, exchange_id: str = 'yfinance', config_file_path: Path = None):
         super().__init__(config_file_path)
         self.exchange_id = exchange_id
 
+    @timed('fetch.yfinance', rows=result_rows)
     def fetch_data(self):
         symbol = self.config[self.exchange_id].get('symbol', 'AAPL')
         start_date = self.config[self.exchange_id].get('start_date', '2020-01-01')
@@ -137,22 +387,175 @@ class YFinanceFetcher(DataFetcher):
             self.exception = e
             return None
 
+    def _cache_key(self):
+        exchange_config = self.config[self.exchange_id]
+        return exchange_config.get('symbol', 'AAPL'), exchange_config.get('interval', '1d')
+
+    def _fetch_range(self, start, end):
+        symbol, interval = self._cache_key()
+        self.logger.info(f"Fetching stock data for {symbol} from {start} to {end}")
+        try:
+            data = yf.download(symbol, start=start, end=end, interval=interval, progress=False)
+        except Exception as e:
+            self.logger.error(f"An error occurred while fetching stock data: {e}")
+            self.exception = e
+            return None
+
+        if isinstance(data.columns, pd.MultiIndex):
+            data.columns = data.columns.get_level_values(0)
+        df = data.reset_index().rename(columns=str.lower).rename(columns={'datetime': 'date'})
+        df['date'] = pd.to_datetime(df['date'], utc=True).dt.tz_localize(None)
+        return df[(df['date'] >= start) & (df['date'] < end)]
+
 
 class BinanceStreamer(DataFetcher):
-    def __init__(self, config_file_path: Path = None):
+    """
+    Streams closed klines and trades from the Binance websocket API.
+
+    Streams reconnect automatically with exponential backoff. When a reconnect leaves a hole in the
+    kline sequence, the missing candles are backfilled through `CcxtFetcher.fetch_history` and
+    yielded before the live candle, so consumers see a contiguous series.
+
+    Config keys (under the exchange section):
+        symbols (list[str]): Market symbols. Defaults to [symbol].
+        timeframe (str): Kline interval. Defaults to '1m'.
+        ws_url (str): Websocket base URL. Defaults to 'wss://stream.binance.com:9443'; point it at a
+                      `data_fetcher.replay.ReplayServer` to replay recorded messages offline.
+        reconnect_delay (float): Initial reconnect delay in seconds. Defaults to 1.
+        max_reconnect_delay (float): Reconnect delay cap in seconds. Defaults to 60.
+        max_candles (int): Closed candles collected by `fetch_data`. Defaults to 1.
+    """
+
+    def __init__(self, config_file_path: Path = None, exchange_id: str = 'binance'):
         super().__init__(config_file_path)
+        self.exchange_id = exchange_id
+        exchange_config = self.config.get(self.exchange_id, {})
+        self.symbols = exchange_config.get('symbols', [exchange_config.get('symbol', 'BTC/USDT')])
+        self.timeframe = exchange_config.get('timeframe', '1m')
+        self.ws_url = exchange_config.get('ws_url', 'wss://stream.binance.com:9443')
+        self.reconnect_delay = exchange_config.get('reconnect_delay', 1)
+        self.max_reconnect_delay = exchange_config.get('max_reconnect_delay', 60)
+        self._tickers = {symbol.replace('/', '').upper(): symbol for symbol in self.symbols}
+        self._last_open = {}
+        self._backfill_fetcher = None
 
     def fetch_data(self):
-        pass
+        """
+        Collects the next `max_candles` closed candles from the kline stream.
 
+        Returns:
+            pandas.DataFrame: Candles with columns 'date', 'tic', 'open', 'high', 'low', 'close', 'volume' and 'day'.
+                             If an error occurs, returns None.
+        """
+        max_candles = self.config.get(self.exchange_id, {}).get('max_candles', 1)
+
+        async def collect():
+            candles = []
+            async for candle in self.stream_candles():
+                candles.append(candle)
+                if len(candles) >= max_candles:
+                    break
+            return candles
+
+        try:
+            return pd.DataFrame(asyncio.run(collect()))
+        except Exception as e:
+            self.logger.error(f"An error occurred while streaming: {e}")
+            self.exception = e
+            return None
 
-def data_fetcher_factory(source: str, config_file_path: Path = None):
+    async def stream_candles(self):
+        """
+        Async iterator of closed candles, one dict per candle in the standard OHLCV schema
+        ('date', 'tic', 'open', 'high', 'low', 'close', 'volume', 'day').
+        """
+        streams = [f"{self._stream_name(symbol)}@kline_{self.timeframe}" for symbol in self.symbols]
+        async for message in self._connect(streams):
+            kline = message.get('k')
+            if kline is None or not kline['x']:
+                continue
+            tic = self._tickers.get(kline['s'], kline['s'])
+            for candle in await self._backfill(tic, kline['t']):
+                yield candle
+            self._last_open[tic] = kline['t']
+            yield self._candle(tic, kline['t'], kline['o'], kline['h'], kline['l'], kline['c'], kline['v'])
+
+    async def stream_trades(self):
+        """
+        Async iterator of trades as dicts with 'date', 'tic', 'price', 'quantity', 'trade_id' and 'is_buyer_maker'.
+        """
+        streams = [f"{self._stream_name(symbol)}@trade" for symbol in self.symbols]
+        async for message in self._connect(streams):
+            if message.get('e') != 'trade':
+                continue
+            yield {
+                'date': pd.to_datetime(message['T'], unit='ms'),
+                'tic': self._tickers.get(message['s'], message['s']),
+                'price': float(message['p']),
+                'quantity': float(message['q']),
+                'trade_id': message['t'],
+                'is_buyer_maker': message['m'],
+            }
+
+    async def run(self, callback, trades: bool = False):
+        """Call `callback(item)` for every closed candle (or trade when `trades` is True)."""
+        stream = self.stream_trades() if trades else self.stream_candles()
+        async for item in stream:
+            callback(item)
+
+    async def _connect(self, streams):
+        """Yield decoded payloads from a combined stream, reconnecting with exponential backoff."""
+        url = f"{self.ws_url}/stream?streams={'/'.join(streams)}"
+        delay = self.reconnect_delay
+        while True:
+            try:
+                async with websockets.connect(url) as ws:
+                    self.logger.info(f"Connected to {url}")
+                    delay = self.reconnect_delay
+                    async for raw in ws:
+                        message = json.loads(raw)
+                        yield message.get('data', message)
+                self.logger.warning("Stream closed by server, reconnecting")
+            except (OSError, asyncio.TimeoutError, websockets.ConnectionClosed, websockets.InvalidHandshake) as e:
+                self.logger.warning(f"Stream error: {e}, reconnecting in {delay}s")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_reconnect_delay)
+
+    async def _backfill(self, tic: str, open_time: int):
+        """Fetch the candles missed between the last seen kline and `open_time` over REST."""
+        last_open = self._last_open.get(tic)
+        timeframe_ms = ccxt.Exchange.parse_timeframe(self.timeframe) * 1000
+        if last_open is None or open_time - last_open <= timeframe_ms:
+            return []
+
+        self.logger.info(f"Backfilling {tic} gap from {last_open + timeframe_ms} to {open_time}")
+        if self._backfill_fetcher is None:
+            self._backfill_fetcher = CcxtFetcher(self.exchange_id, self.config_file)
+        df = await asyncio.to_thread(self._backfill_fetcher.fetch_history,
+                                     last_open + timeframe_ms, open_time, tic, self.timeframe)
+        if df is None:
+            return []
+        return df.to_dict('records')
+
+    @staticmethod
+    def _stream_name(symbol: str) -> str:
+        return symbol.replace('/', '').lower()
+
+    @staticmethod
+    def _candle(tic, open_time, open_, high, low, close, volume) -> dict:
+        date = pd.to_datetime(open_time, unit='ms')
+        return {'date': date, 'tic': tic, 'open': float(open_), 'high': float(high), 'low': float(low),
+                'close': float(close), 'volume': float(volume), 'day': date.dayofweek}
+
+
+def data_fetcher_factory(source: str, config_file_path: Path = None, asynchronous: bool = False):
     """
     Function that creates and returns a data fetcher based on the input source and configuration file path.
 
     Parameters:
     source (str): The source of the data fetcher(e.g. binance, yfinance).
     config_file_path (Path, optional): The path to the configuration file. Defaults to None.
+    asynchronous (bool, optional): Return the multi-symbol AsyncCcxtFetcher for ccxt sources. Defaults to False.
 
     Returns:
     DataFetcher: An instance of the appropriate data fetcher based on the input source and configuration file path.
@@ -161,6 +564,8 @@ def data_fetcher_factory(source: str, config_file_path: Path = None):
     """
     if source == 'yfinance':
         return YFinanceFetcher(source, config_file_path)
+    elif source in ccxt.exchanges and asynchronous:
+        return AsyncCcxtFetcher(source, config_file_path)
     elif source in ccxt.exchanges:
         return CcxtFetcher(source, config_file_path)
     else:
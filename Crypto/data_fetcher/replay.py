@@ -0,0 +1,97 @@
+import asyncio
+import json
+from pathlib import Path
+
+import websockets
+
+
+def load_messages(path) -> list:
+    """Read a recording made by `record_messages`: one raw websocket message per line."""
+    with open(path, 'r') as f:
+        return [line.rstrip('\n') for line in f if line.strip()]
+
+
+async def record_messages(url: str, path, count: int) -> list:
+    """
+    Record `count` raw messages from a live stream (network needed) into an offline fixture.
+
+    Args:
+        url (str): Full stream URL, e.g. 'wss://stream.binance.com:9443/stream?streams=btcusdt@kline_1m/btcusdt@trade'.
+        path: Output file, one message per line.
+        count (int): Messages to record.
+    """
+    messages = []
+    async with websockets.connect(url) as ws:
+        while len(messages) < count:
+            messages.append(await ws.recv())
+    Path(path).write_text(''.join(f'{message}\n' for message in messages))
+    return messages
+
+
+class ReplayServer:
+    """
+    Local websocket stand-in for the Binance stream endpoint, replaying recorded messages in order.
+
+    Every connection continues where the previous one stopped, whatever stream path it asked for,
+    and stays open once the recording is exhausted. `drops` simulates outages: after sending message
+    i the server closes the connection and the next `drops[i]` messages are lost, as if they were
+    published while the client was away.
+
+    Usage:
+
+        async with ReplayServer(load_messages('binance_btcusdt_1m.jsonl'), drops={10: 6}) as server:
+            config['binance']['ws_url'] = server.url
+
+    Args:
+        messages (list[str | dict]): Raw messages; dicts are JSON-encoded.
+        drops (dict[int, int], optional): Message index -> messages lost after disconnecting there.
+        host (str): Defaults to '127.0.0.1'.
+        port (int): Defaults to 0 (any free port; see `url`).
+    """
+
+    def __init__(self, messages, drops: dict = None, host: str = '127.0.0.1', port: int = 0):
+        self.messages = [m if isinstance(m, str) else json.dumps(m) for m in messages]
+        self.drops = dict(drops or {})
+        self.host = host
+        self.port = port
+        self.paths = []
+        self._cursor = 0
+        self._server = None
+
+    @property
+    def url(self) -> str:
+        return f'ws://{self.host}:{self.port}'
+
+    @property
+    def connections(self) -> int:
+        return len(self.paths)
+
+    async def _replay(self, connection):
+        self.paths.append(connection.request.path)
+        while self._cursor < len(self.messages):
+            index = self._cursor
+            await connection.send(self.messages[index])
+            self._cursor += 1
+            if index in self.drops:
+                self._cursor += self.drops[index]
+                await connection.close()
+                return
+            await asyncio.sleep(0)
+        await connection.wait_closed()
+
+    async def start(self):
+        self._server = await websockets.serve(self._replay, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.stop()
@@ -0,0 +1,247 @@
+import io
+import logging
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import requests
+
+from data_preprocessor.preprocessor import DataPreprocessor
+
+
+FIELDS = ['open', 'high', 'low', 'close', 'volume']
+
+
+def _escape_tag(values: pd.Series) -> pd.Series:
+    """Escape commas, spaces and equals signs in line-protocol tag values."""
+    return (values.astype(str)
+                  .str.replace('\\', '\\\\', regex=False)
+                  .str.replace(',', '\\,', regex=False)
+                  .str.replace(' ', '\\ ', regex=False)
+                  .str.replace('=', '\\=', regex=False))
+
+
+def to_line_protocol(df: pd.DataFrame, measurement: str = 'candles', source: str = None) -> list:
+    """
+    Convert a candle frame ('date', 'tic', 'open', ..., 'volume') into line-protocol records.
+
+    The records are built column-wise, so converting a whole fetch costs a handful of vectorized
+    string operations instead of one format call per candle. InfluxDB rejects a whole batch over one
+    'nan' or 'inf' field, so non-finite fields are left out of their record, and a row with no
+    finite field at all is skipped.
+
+    Args:
+        df (pd.DataFrame): Candles with a 'date' column and optional 'tic' and 'timeframe' tags.
+        measurement (str): Measurement name. Defaults to 'candles'.
+        source (str, optional): Value of the 'source' tag.
+
+    Returns:
+        list[str]: One record per row with a finite field, with millisecond timestamps.
+    """
+    tags = pd.Series(measurement, index=df.index)
+    for tag in ('tic', 'timeframe'):
+        if tag in df.columns:
+            tags = tags + f',{tag}=' + _escape_tag(df[tag])
+    if source is not None:
+        tags = tags + ',source=' + _escape_tag(pd.Series(source, index=df.index))
+
+    fields = pd.Series('', index=df.index)
+    for field in FIELDS:
+        column = df[field].astype('float64')
+        finite = np.isfinite(column)
+        separator = (fields != '').map({True: ',', False: ''})
+        fields = fields.mask(finite, fields + separator + f'{field}=' + column.map(repr))
+
+    timestamps = pd.to_datetime(df['date']).astype('datetime64[ms]').astype('int64').astype(str)
+    records = tags + ' ' + fields + ' ' + timestamps
+    return records[fields != ''].tolist()
+
+
+class InfluxWriter:
+    """
+    Buffered line-protocol writer for the InfluxDB v2 HTTP API.
+
+    Records are buffered and flushed when `batch_size` records are pending or every
+    `flush_interval` seconds by a background thread. Failed flushes are retried with exponential
+    backoff over one keep-alive HTTP session; records are only dropped after `max_retries` attempts.
+
+    Args:
+        url (str): Server URL, e.g. 'http://localhost:8086'.
+        org (str): Organization name.
+        bucket (str): Bucket to write to.
+        token (str): API token.
+        batch_size (int): Records per flush. Defaults to 5000.
+        flush_interval (float): Seconds between background flushes. Defaults to 1.
+        max_retries (int): Retries per batch. Defaults to 3.
+        measurement (str): Measurement name. Defaults to 'candles'.
+    """
+
+    def __init__(self, url: str, org: str, bucket: str, token: str, batch_size: int = 5000,
+                 flush_interval: float = 1.0, max_retries: int = 3, measurement: str = 'candles'):
+        self.url = url.rstrip('/')
+        self.org = org
+        self.bucket = bucket
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.measurement = measurement
+        self.logger = logging.getLogger(__name__)
+
+        self.session = requests.Session()
+        self.session.headers.update({'Authorization': f'Token {token}',
+                                     'Content-Type': 'text/plain; charset=utf-8'})
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._closed = threading.Event()
+        self._thread = threading.Thread(target=self._flush_periodically, daemon=True)
+        self._thread.start()
+
+    @classmethod
+    def from_config(cls, config: dict, **kwargs):
+        """Build a writer from the 'influxdb' section of config.json (url, org, bucket, token or token_file)."""
+        return cls(**_connection_args(config), **kwargs)
+
+    def write(self, df: pd.DataFrame, source: str = None):
+        """Buffer a candle frame, e.g. the output of `CcxtFetcher.fetch_data`."""
+        if df is None or df.empty:
+            return
+        self._extend(to_line_protocol(df, self.measurement, source))
+
+    def write_candle(self, candle: dict, source: str = None):
+        """Buffer a single candle dict, e.g. from `BinanceStreamer.stream_candles`."""
+        self.write(pd.DataFrame([candle]), source)
+
+    def _extend(self, records: list):
+        with self._lock:
+            self._buffer.extend(records)
+            full = len(self._buffer) >= self.batch_size
+        if full:
+            self.flush()
+
+    def flush(self):
+        """Send all buffered records in batches of `batch_size`."""
+        with self._flush_lock:
+            with self._lock:
+                records, self._buffer = self._buffer, []
+            for i in range(0, len(records), self.batch_size):
+                self._post('\n'.join(records[i:i + self.batch_size]))
+
+    def _post(self, body: str):
+        params = {'org': self.org, 'bucket': self.bucket, 'precision': 'ms'}
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = self.session.post(f'{self.url}/api/v2/write', params=params, data=body.encode())
+                if response.status_code < 300:
+                    return
+                if response.status_code not in (429, 500, 502, 503, 504):
+                    self.logger.error(f"InfluxDB rejected batch: {response.status_code} {response.text}")
+                    return
+                error = f"HTTP {response.status_code}"
+            except requests.RequestException as e:
+                error = e
+            if attempt < self.max_retries:
+                self.logger.warning(f"InfluxDB write failed ({error}), retrying")
+                time.sleep(0.1 * 2 ** attempt)
+        self.logger.error(f"Dropping batch after {self.max_retries} retries: {error}")
+
+    def _flush_periodically(self):
+        while not self._closed.wait(self.flush_interval):
+            self.flush()
+
+    def close(self):
+        """Stop the background thread and flush what is left."""
+        self._closed.set()
+        self._thread.join()
+        self.flush()
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class InfluxReader:
+    """
+    Range queries against the InfluxDB v2 HTTP API, returned in the `DataPreprocessor` schema.
+
+    Args:
+        url (str): Server URL, e.g. 'http://localhost:8086'.
+        org (str): Organization name.
+        bucket (str): Bucket to read from.
+        token (str): API token.
+        measurement (str): Measurement name. Defaults to 'candles'.
+    """
+
+    def __init__(self, url: str, org: str, bucket: str, token: str, measurement: str = 'candles'):
+        self.url = url.rstrip('/')
+        self.org = org
+        self.bucket = bucket
+        self.measurement = measurement
+        self.session = requests.Session()
+        self.session.headers.update({'Authorization': f'Token {token}',
+                                     'Content-Type': 'application/vnd.flux',
+                                     'Accept': 'application/csv'})
+
+    @classmethod
+    def from_config(cls, config: dict, **kwargs):
+        """Build a reader from the 'influxdb' section of config.json (url, org, bucket, token or token_file)."""
+        return cls(**_connection_args(config), **kwargs)
+
+    def query_candles(self, tic: str, start, end, timeframe: str = None) -> pd.DataFrame:
+        """
+        Read candles for one ticker in [start, end).
+
+        Returns:
+            pd.DataFrame: Indexed by 'timestamp' with 'open', 'high', 'low', 'close', 'adj_close' and
+                          'volume' columns (as `DataPreprocessor(..., source='ccxt').preprocess()`) plus 'tic'.
+        """
+        start = pd.Timestamp(start).strftime('%Y-%m-%dT%H:%M:%SZ')
+        stop = pd.Timestamp(end).strftime('%Y-%m-%dT%H:%M:%SZ')
+        filters = f'r._measurement == "{self.measurement}" and r.tic == "{tic}"'
+        if timeframe is not None:
+            filters += f' and r.timeframe == "{timeframe}"'
+        columns = ', '.join(f'"{column}"' for column in ['_time'] + FIELDS)
+        flux = (f'from(bucket: "{self.bucket}")'
+                f' |> range(start: {start}, stop: {stop})'
+                f' |> filter(fn: (r) => {filters})'
+                f' |> pivot(rowKey: ["_time"], columnKey: ["_field"], valueColumn: "_value")'
+                f' |> keep(columns: [{columns}])'
+                f' |> sort(columns: ["_time"])')
+
+        response = self.session.post(f'{self.url}/api/v2/query', params={'org': self.org}, data=flux.encode())
+        response.raise_for_status()
+
+        df = self._parse_csv(response.text)
+        df = df.rename(columns={'_time': 'timestamp'})[['timestamp'] + FIELDS]
+        df['timestamp'] = pd.to_datetime(df['timestamp'], utc=True).dt.tz_localize(None)
+        df = DataPreprocessor(df, source='ccxt').preprocess()
+        df['tic'] = tic
+        return df
+
+    @staticmethod
+    def _parse_csv(text: str) -> pd.DataFrame:
+        """Parse a (possibly multi-table) Flux CSV response into one frame."""
+        blocks = [block for block in text.replace('\r\n', '\n').split('\n\n') if block.strip()]
+        if not blocks:
+            return pd.DataFrame(columns=['_time'] + FIELDS)
+        frames = [pd.read_csv(io.StringIO(block), comment='#') for block in blocks]
+        df = pd.concat(frames, ignore_index=True)
+        df[FIELDS] = df[FIELDS].astype(np.float64)
+        return df
+
+
+def _connection_args(config: dict) -> dict:
+    influx_config = config['influxdb']
+    token = influx_config.get('token')
+    if token is None:
+        token_file = Path(influx_config.get('token_file', Path(__file__).parent / 'influxtoken.txt'))
+        token = token_file.read_text().strip()
+    return {'url': influx_config.get('url', 'http://localhost:8086'),
+            'org': influx_config['org'],
+            'bucket': influx_config['bucket'],
+            'token': token}
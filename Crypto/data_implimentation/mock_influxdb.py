@@ -0,0 +1,173 @@
+import math
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+import pandas as pd
+
+
+def _split(text: str, separator: str) -> list:
+    """Split line-protocol text on unescaped `separator`s, keeping the escapes."""
+    parts, current, escaped = [], [], False
+    for char in text:
+        if escaped:
+            current.append(char)
+            escaped = False
+        elif char == '\\':
+            current.append(char)
+            escaped = True
+        elif char == separator:
+            parts.append(''.join(current))
+            current = []
+        else:
+            current.append(char)
+    parts.append(''.join(current))
+    return parts
+
+
+def _unescape(text: str) -> str:
+    return re.sub(r'\\(.)', r'\1', text)
+
+
+def _float(text: str) -> float:
+    value = float(text)
+    if not math.isfinite(value):  # InfluxDB has no literal for NaN or infinity
+        raise ValueError(f"invalid field value {text!r}")
+    return value
+
+
+def parse_line(line: str) -> dict:
+    """Parse one line-protocol record into {'measurement', 'tags', 'fields', 'time'}."""
+    series, fields, timestamp = _split(line, ' ')
+    measurement, *tags = _split(series, ',')
+    return {
+        'measurement': _unescape(measurement),
+        'tags': {_unescape(k): _unescape(v) for k, v in (_split(tag, '=') for tag in tags)},
+        'fields': {k: _float(v) for k, v in (_split(field, '=') for field in _split(fields, ','))},
+        'time': int(timestamp),
+    }
+
+
+class MockInfluxDB:
+    """
+    Local stand-in for the InfluxDB v2 write and query endpoints used by `InfluxWriter`/`InfluxReader`.
+
+    POST /api/v2/write keeps every request body in `writes` and parses its records into `points`.
+    `fail_writes` answers the next n writes with `fail_status` (and stores nothing), to exercise
+    retries; a batch with an unparsable record (e.g. a 'nan' field) is refused whole with 400, as
+    InfluxDB does. POST /api/v2/query understands the range/filter/pivot queries `InfluxReader` sends and
+    answers from `points` in Flux annotated CSV. Requests without the expected token get 401.
+
+    Usage:
+
+        with MockInfluxDB() as influx:
+            writer = InfluxWriter(influx.url, 'org', 'bucket', influx.token)
+    """
+
+    def __init__(self, token: str = 'token', host: str = '127.0.0.1', port: int = 0):
+        self.token = token
+        self.writes = []
+        self.points = []
+        self.queries = []
+        self.fail_writes = 0
+        self.fail_status = 503
+        self._lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def _handler(self):
+        influx = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_POST(self):
+                url = urlsplit(self.path)
+                body = self.rfile.read(int(self.headers.get('Content-Length', 0))).decode()
+                if self.headers.get('Authorization') != f'Token {influx.token}':
+                    self._reply(401, '{"code":"unauthorized"}', 'application/json')
+                elif url.path == '/api/v2/write':
+                    self._reply(*influx._write(dict(parse_qsl(url.query)), body))
+                elif url.path == '/api/v2/query':
+                    self._reply(200, influx._query(body), 'text/csv; charset=utf-8')
+                else:
+                    self._reply(404, '', 'text/plain')
+
+            def _reply(self, status: int, body: str = '', content_type: str = 'text/plain'):
+                data = body.encode()
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def _write(self, params: dict, body: str):
+        with self._lock:
+            if self.fail_writes:
+                self.fail_writes -= 1
+                return self.fail_status, '{"code":"unavailable"}', 'application/json'
+            try:
+                points = [parse_line(line) for line in body.split('\n') if line]
+            except ValueError as e:
+                return 400, f'{{"code":"invalid","message":"unable to parse: {e}"}}', 'application/json'
+            self.writes.append({'params': params, 'body': body})
+            self.points.extend(points)
+        return 204, '', 'text/plain'
+
+    def _query(self, flux: str) -> str:
+        with self._lock:
+            self.queries.append(flux)
+            points = list(self.points)
+        bucket = re.search(r'from\(bucket: "([^"]*)"\)', flux).group(1)
+        start, stop = (pd.Timestamp(t).value // 1_000_000
+                       for t in re.search(r'range\(start: (\S+), stop: ([^)\s]+)\)', flux).groups())
+        conditions = dict(re.findall(r'r\.(\w+) == "([^"]*)"', flux))
+        measurement = conditions.pop('_measurement', None)
+        columns = re.search(r'keep\(columns: \[([^\]]*)\]\)', flux).group(1).replace('"', '').split(', ')
+
+        written = {w['params'].get('bucket') for w in self.writes}
+        rows = sorted((p for p in points
+                       if bucket in written
+                       and (measurement is None or p['measurement'] == measurement)
+                       and start <= p['time'] < stop
+                       and all(p['tags'].get(k) == v for k, v in conditions.items())),
+                      key=lambda p: p['time'])
+        fields = [column for column in columns if column != '_time']
+        lines = ['#datatype,string,long,dateTime:RFC3339,' + ','.join('double' for _ in fields),
+                 '#group,false,false,false,' + ','.join('false' for _ in fields),
+                 '#default,_result,,,' + ','.join('' for _ in fields),
+                 ',result,table,' + ','.join(columns)]
+        for p in rows:
+            time = pd.to_datetime(p['time'], unit='ms').strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+            lines.append(',,0,' + ','.join([time] + [repr(p['fields'][f]) for f in fields]))
+        return '\r\n'.join(lines) + '\r\n\r\n'
+
+    def start(self) -> 'MockInfluxDB':
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
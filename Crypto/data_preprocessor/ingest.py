@@ -0,0 +1,164 @@
+import itertools
+from dataclasses import dataclass, replace
+
+import numpy as np
+import pandas as pd
+
+
+# yfinance column names -> schema field names
+_YFINANCE_COLUMNS = {'Date': 'timestamp', 'Datetime': 'timestamp', 'Open': 'open', 'High': 'high', 'Low': 'low',
+                     'Close': 'close', 'Adj Close': 'adj_close', 'Volume': 'volume', 'date': 'timestamp'}
+_UNIT_TO_NS = {'s': 1_000_000_000, 'ms': 1_000_000, 'us': 1_000, 'ns': 1}
+
+
+@dataclass(frozen=True)
+class CandleSchema:
+    """
+    Explicit layout and dtypes of a candle payload.
+
+    Args:
+        fields (tuple): Field names in payload order. Defaults to the ccxt OHLCV row layout.
+        price_dtype (type): dtype of the price fields (np.float32 halves their memory). Defaults to np.float64.
+        volume_dtype (type): dtype of 'volume'. Defaults to np.float64.
+        timestamp_unit (str): Unit of numeric timestamps ('s', 'ms', 'us' or 'ns'). Defaults to 'ms', as ccxt.
+        adj_close (bool): Add an 'adj_close' sharing the close prices when the payload has none, as
+                          `DataPreprocessor.preprocess` does for ccxt. Defaults to True.
+    """
+    fields: tuple = ('timestamp', 'open', 'high', 'low', 'close', 'volume')
+    price_dtype: type = np.float64
+    volume_dtype: type = np.float64
+    timestamp_unit: str = 'ms'
+    adj_close: bool = True
+
+    def dtype(self, name: str):
+        if name == 'timestamp':
+            return np.int64
+        return self.volume_dtype if name == 'volume' else self.price_dtype
+
+
+CCXT_SCHEMA = CandleSchema()
+YFINANCE_SCHEMA = CandleSchema(fields=('timestamp', 'open', 'high', 'low', 'close', 'adj_close', 'volume'))
+
+
+def validate_timestamps(timestamps: np.ndarray, codes: np.ndarray = None):
+    """
+    Check in one vectorized pass that timestamps are strictly increasing, i.e. sorted and free of
+    duplicates. With ticker `codes` (sorted categorical codes), rows must be strictly increasing by
+    (timestamp, tic), or grouped by ticker, in any ticker order, with increasing timestamps.
+
+    Raises:
+        ValueError: At the first offending row.
+    """
+    if len(timestamps) < 2:
+        return
+    step = np.diff(timestamps)
+    if codes is None:
+        bad = step <= 0
+        same_tic = np.ones(len(step), dtype=bool)
+    else:
+        codes = codes.astype(np.int64)
+        same_tic = codes[1:] == codes[:-1]
+        # grouped by ticker: tickers numbered by first appearance, since groups need not be alphabetical
+        appearance_step = np.diff(pd.factorize(codes)[0])
+        by_tic = (appearance_step > 0) | (same_tic & (step > 0))
+        by_time = (step > 0) | ((step == 0) & (codes[1:] > codes[:-1]))
+        bad = ~by_tic if by_tic.all() or not by_time.all() else ~by_time
+    if bad.any():
+        row = int(np.argmax(bad)) + 1
+        kind = 'Duplicate' if step[row - 1] == 0 and same_tic[row - 1] else 'Out-of-order'
+        raise ValueError(f"{kind} timestamp at row {row}: {pd.Timestamp(int(timestamps[row]))}")
+
+
+def from_arrays(timestamps, columns: dict, schema: CandleSchema = CCXT_SCHEMA, tic=None,
+                validate: bool = True) -> pd.DataFrame:
+    """
+    Assemble a typed candle frame from column arrays.
+
+    Arrays already in the schema dtype are used as they are (no copy). The frame is indexed by a
+    'timestamp' DatetimeIndex over int64 nanoseconds, and 'tic' (a single name or one per row) is
+    categorical.
+    """
+    timestamps = np.asarray(timestamps)
+    if np.issubdtype(timestamps.dtype, np.datetime64):
+        timestamps = timestamps.astype('datetime64[ns]', copy=False).view(np.int64)
+    elif np.issubdtype(timestamps.dtype, np.floating):
+        timestamps = (timestamps * _UNIT_TO_NS[schema.timestamp_unit]).astype(np.int64)
+    elif _UNIT_TO_NS[schema.timestamp_unit] != 1:
+        timestamps = timestamps.astype(np.int64, copy=False) * _UNIT_TO_NS[schema.timestamp_unit]
+
+    data = {}
+    n = len(timestamps)
+    codes = None
+    if tic is not None:
+        if isinstance(tic, str):
+            data['tic'] = pd.Categorical.from_codes(np.zeros(n, dtype=np.int8), categories=[tic])
+        else:
+            data['tic'] = pd.Categorical(tic)
+            codes = data['tic'].codes
+    for name in schema.fields:
+        if name == 'timestamp':
+            continue
+        data[name] = np.asarray(columns[name], dtype=schema.dtype(name))
+        if len(data[name]) != n:
+            raise ValueError(f"Column '{name}' has {len(data[name])} rows, expected {n}")
+    if schema.adj_close and 'adj_close' not in data and 'close' in data:
+        data['adj_close'] = data['close']
+    if 'adj_close' in data:
+        # keep the preprocess column order: adj_close right before volume
+        data = {name: data[name] for name in sorted(data, key=lambda name: (name == 'volume', name == 'adj_close'))}
+
+    if validate:
+        validate_timestamps(timestamps, codes)
+    index = pd.DatetimeIndex(timestamps.view('datetime64[ns]'), name='timestamp')
+    return pd.DataFrame(data, index=index, copy=False)
+
+
+def from_rows(rows, schema: CandleSchema = CCXT_SCHEMA, tic=None, validate: bool = True) -> pd.DataFrame:
+    """
+    Ingest a raw list of rows (e.g. ccxt `fetch_ohlcv` output) laid out as `schema.fields`.
+
+    The rows are streamed once into a preallocated float64 buffer, without building an intermediate
+    object frame; a 2-D NumPy payload is used directly.
+    """
+    width = len(schema.fields)
+    if isinstance(rows, np.ndarray):
+        buffer = rows
+    else:
+        # a ragged row would silently shift every later value of the flattened buffer
+        widths = set(map(len, rows))
+        if widths - {width}:
+            raise ValueError(f"Expected rows of {width} fields {schema.fields}, got rows of {sorted(widths)}")
+        buffer = np.fromiter(itertools.chain.from_iterable(rows), dtype=np.float64, count=len(rows) * width)
+        buffer = buffer.reshape(len(rows), width)
+    if buffer.ndim != 2 or buffer.shape[1] != width:
+        raise ValueError(f"Expected a (rows x {width}) payload, got shape {buffer.shape}")
+    timestamps = buffer[:, schema.fields.index('timestamp')].astype(np.int64) * _UNIT_TO_NS[schema.timestamp_unit]
+    columns = {name: buffer[:, j] for j, name in enumerate(schema.fields)}
+    return from_arrays(timestamps, columns, replace(schema, timestamp_unit='ns'), tic, validate)
+
+
+def from_frame(df: pd.DataFrame, schema: CandleSchema = None, tic=None, validate: bool = True) -> pd.DataFrame:
+    """
+    Ingest a candle DataFrame (lower-case ccxt/generic or yfinance column names) without modifying it.
+
+    Timestamps come from a 'timestamp'/'date' column or, failing that, the index. A 'tic' column is
+    used when `tic` is not given. yfinance's ('Close', 'AAPL') column pairs are read by their first
+    level, as `YFinanceFetcher` does; such a frame must hold a single ticker.
+    """
+    if isinstance(df.columns, pd.MultiIndex):
+        flat = df.columns.get_level_values(0)
+        if flat.has_duplicates:
+            raise ValueError(f"Expected one ticker per frame, got columns {list(df.columns)}")
+        df = df.set_axis(flat, axis=1)
+    renamed = {column: _YFINANCE_COLUMNS.get(column, column) for column in df.columns
+               if isinstance(column, str)}
+    if schema is None:
+        schema = CandleSchema(fields=('timestamp',) + tuple(
+            name for name in ('open', 'high', 'low', 'close', 'adj_close', 'volume') if name in renamed.values()))
+    columns = {renamed[column]: df[column].to_numpy() for column in renamed if renamed[column] in schema.fields}
+    timestamps = columns.pop('timestamp', None)
+    if timestamps is None:
+        timestamps = df.index.to_numpy()
+    if tic is None and 'tic' in df.columns:
+        tic = df['tic'].to_numpy()
+    return from_arrays(timestamps, columns, schema, tic, validate)
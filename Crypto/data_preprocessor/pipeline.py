@@ -0,0 +1,257 @@
+import json
+import math
+import re
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from indicator_and_strategy.indicator_engine import WINDOWLESS_INDICATORS, IndicatorEngine, IndicatorSpec
+from indicator_and_strategy.streaming_indicators import STREAMING_INDICATORS
+
+
+def iter_parquet(paths, batch_size: int = 1_000_000, columns: list = None):
+    """Yield DataFrame chunks of at most `batch_size` rows from one or more Parquet files, in file order."""
+    for path in [paths] if isinstance(paths, (str, Path)) else paths:
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=batch_size, columns=columns):
+            yield batch.to_pandas()
+
+
+def iter_csv(path, chunksize: int = 1_000_000, **read_csv_kwargs):
+    """Yield DataFrame chunks of at most `chunksize` rows from a CSV file."""
+    with pd.read_csv(path, chunksize=chunksize, **read_csv_kwargs) as reader:
+        yield from reader
+
+
+@dataclass
+class FeatureStore:
+    """
+    Append-only, memory-mapped store of model-ready arrays, one directory per ticker.
+
+    Each ticker has a float32 (rows x features) matrix, its float64 close prices and int64
+    nanosecond dates as raw binary files, plus a `_meta.json` with the feature columns, the row count
+    and the first row without NaN features. `open` maps the files read-only, so the environment
+    steps over them without loading or copying them.
+
+    Args:
+        root (Path): Directory holding the store.
+    """
+    root: Path = Path('feature_store')
+    _meta: dict = field(default_factory=dict, init=False, repr=False)
+
+    def __post_init__(self):
+        self.root = Path(self.root)
+
+    def path(self, tic: str) -> Path:
+        return self.root / re.sub(r'[^A-Za-z0-9.-]', '_', tic)
+
+    def meta(self, tic: str) -> dict:
+        if tic not in self._meta:
+            meta_file = self.path(tic) / '_meta.json'
+            self._meta[tic] = json.loads(meta_file.read_text()) if meta_file.exists() else None
+        return self._meta[tic]
+
+    def tickers(self) -> list:
+        return sorted(json.loads(f.read_text())['tic'] for f in self.root.glob('*/_meta.json'))
+
+    def append(self, tic: str, dates: np.ndarray, features: np.ndarray, close: np.ndarray, columns: list):
+        """Append rows for one ticker."""
+        meta = self.meta(tic)
+        if meta is None:
+            self.path(tic).mkdir(parents=True, exist_ok=True)
+            meta = self._meta[tic] = {'tic': tic, 'columns': list(columns), 'rows': 0, 'warmup': None}
+        elif meta['columns'] != list(columns):
+            raise ValueError(f"Feature columns of {tic} do not match the store: {meta['columns']}")
+
+        path = self.path(tic)
+        for name, values, dtype in (('features.f32', features, np.float32), ('close.f64', close, np.float64),
+                                    ('date.i64', dates, np.int64)):
+            with open(path / name, 'ab') as f:
+                np.ascontiguousarray(values, dtype=dtype).tofile(f)
+
+        if meta['warmup'] is None:
+            valid = np.flatnonzero(np.isfinite(features).all(axis=1))
+            if len(valid):
+                meta['warmup'] = meta['rows'] + int(valid[0])
+        meta['rows'] += len(features)
+        (path / '_meta.json').write_text(json.dumps(meta))
+
+    def open(self, tic: str) -> tuple:
+        """
+        Map one ticker's arrays read-only.
+
+        Returns:
+            tuple: (features (rows x features) float32 memmap, close float64 memmap, dates datetime64[ns] memmap).
+        """
+        meta = self.meta(tic)
+        if meta is None or not meta['rows']:
+            raise KeyError(f"No features stored for {tic}")
+        path, rows = self.path(tic), meta['rows']
+        features = np.memmap(path / 'features.f32', dtype=np.float32, mode='r', shape=(rows, len(meta['columns'])))
+        close = np.memmap(path / 'close.f64', dtype=np.float64, mode='r', shape=(rows,))
+        dates = np.memmap(path / 'date.i64', dtype=np.int64, mode='r', shape=(rows,)).view('datetime64[ns]')
+        return features, close, dates
+
+
+class _PartialMean:
+    """
+    Rolling mean over up to `window` values, bit for bit as pandas rolling(window, min_periods=1).mean().
+
+    The crossover signal compares two of these, so any rounding difference from the batch path flips
+    it on bars where build_features has a tie. pandas keeps Kahan-compensated running sums (separate
+    compensations for values entering and leaving the window) and returns a window of equal values
+    as exactly that value; this follows the same steps, with the window in a ring buffer.
+    """
+
+    def __init__(self, window: int):
+        self._values = deque(maxlen=window)
+        self._total = 0.0
+        self._added = 0.0  # compensation of the values entering the window
+        self._removed = 0.0  # compensation of the values leaving it
+        self._negative = 0
+        self._same = 0  # length of the trailing run of equal values
+
+    @staticmethod
+    def _add(total: float, compensation: float, value: float) -> tuple:
+        y = value - compensation
+        t = total + y
+        return t, t - total - y
+
+    def update(self, value: float) -> float:
+        values = self._values
+        if len(values) == values.maxlen:
+            old = values[0]
+            self._total, self._removed = self._add(self._total, self._removed, -old)
+            self._negative -= math.copysign(1.0, old) < 0
+        self._same = self._same + 1 if not values or value == values[-1] else 1
+        values.append(value)
+        self._total, self._added = self._add(self._total, self._added, value)
+        self._negative += math.copysign(1.0, value) < 0
+
+        n = len(values)
+        if self._same >= n:
+            return value
+        mean = self._total / n
+        if (self._negative == 0 and mean < 0) or (self._negative == n and mean > 0):
+            return 0.0
+        return mean
+
+
+class _MomentumSignal:
+    """Streaming `MomentumStrategy` position: rolling means with min_periods=1 and crossover events."""
+
+    def __init__(self, short_window: int, long_window: int):
+        self._short = _PartialMean(short_window)
+        self._long = _PartialMean(long_window)
+        self._previous = None
+        self.value = 0.0
+
+    def update(self, close: float) -> float:
+        sma, lma = self._short.update(close), self._long.update(close)
+        if self._previous is not None:
+            prev_sma, prev_lma = self._previous
+            if sma > lma and prev_sma <= prev_lma:
+                self.value = 1.0
+            elif sma < lma and prev_sma >= prev_lma:
+                self.value = -1.0
+        self._previous = (sma, lma)
+        return self.value
+
+
+class FeaturePipeline:
+    """
+    Out-of-core feature pipeline from raw candles to model-ready arrays.
+
+    Candles arrive in time-ordered chunks (from `iter_parquet`, `iter_csv` or any iterable of
+    frames). Each ticker keeps its own streaming indicators and momentum signal between chunks, so
+    warm-up state carries across chunk boundaries and the output is the same as processing the
+    whole history at once. Every chunk's rows are written straight into a `FeatureStore` as float32,
+    in the `build_features` layout (OHLC, indicator outputs, momentum signal); only one chunk is
+    ever held in memory.
+
+    Args:
+        store (FeatureStore): Destination store.
+        indicators (tuple): Indicator specs with a streaming implementation. Defaults to ('rsi', 'cci', 'adx', 'atr').
+        window (int): Default indicator window. Defaults to 14.
+        short_window (int): Short moving average of the momentum signal. Defaults to 2.
+        long_window (int): Long moving average of the momentum signal. Defaults to 5.
+        tic (str, optional): Ticker for chunks without a 'tic' column.
+    """
+
+    def __init__(self, store: FeatureStore, indicators=('rsi', 'cci', 'adx', 'atr'), window: int = 14,
+                 short_window: int = 2, long_window: int = 5, tic: str = None):
+        self.store = store
+        self.specs = [IndicatorSpec.parse(spec, window) for spec in indicators]
+        missing = [spec.name for spec in self.specs if spec.name not in STREAMING_INDICATORS]
+        if missing:
+            raise ValueError(f"No streaming implementation for: {missing}")
+        self.columns = (['open', 'high', 'low', 'close']
+                        + IndicatorEngine.from_arrays({'close': ()}, window).columns(self.specs)
+                        + ['momentum_signal'])
+        self.short_window = short_window
+        self.long_window = long_window
+        self.tic = tic
+        self._state = {}
+
+    def _ticker_state(self, tic: str) -> dict:
+        if tic not in self._state:
+            indicators = [STREAMING_INDICATORS[spec.name]() if spec.name in WINDOWLESS_INDICATORS
+                          else STREAMING_INDICATORS[spec.name](spec.window) for spec in self.specs]
+            self._state[tic] = {'indicators': indicators, 'signal': _MomentumSignal(self.short_window, self.long_window),
+                                'last_date': None}
+        return self._state[tic]
+
+    def process(self, chunk: pd.DataFrame) -> int:
+        """
+        Compute and store the features of one chunk.
+
+        Rows at or before a ticker's last processed date (overlaps between chunks) are skipped.
+
+        Returns:
+            int: Rows written.
+        """
+        chunk = chunk.assign(date=pd.to_datetime(chunk['date']))
+        if 'tic' not in chunk.columns:
+            chunk = chunk.assign(tic=self.tic)
+        written = 0
+        for tic, group in chunk.groupby('tic', sort=False):
+            written += self._process_ticker(tic, group.sort_values('date', kind='stable'))
+        return written
+
+    def _process_ticker(self, tic: str, group: pd.DataFrame) -> int:
+        state = self._ticker_state(tic)
+        dates = group['date'].to_numpy(dtype='datetime64[ns]').view(np.int64)
+        keep = np.ones(len(dates), dtype=bool)
+        keep[1:] = dates[1:] != dates[:-1]
+        if state['last_date'] is not None:
+            keep &= dates > state['last_date']
+        if not keep.all():
+            group, dates = group[keep], dates[keep]
+        if not len(dates):
+            return 0
+        state['last_date'] = int(dates[-1])
+
+        ohlcv = [group[column].to_numpy(dtype=np.float64) for column in ('open', 'high', 'low', 'close', 'volume')]
+        bars = list(zip(*(values.tolist() for values in ohlcv[1:])))
+        features = np.empty((len(dates), len(self.columns)), dtype=np.float32)
+        features[:, :4] = np.column_stack(ohlcv[:4])
+        column = 4
+        for indicator in state['indicators']:
+            update = indicator.update_bar
+            values = np.array([update(*bar) for bar in bars], dtype=np.float64).reshape(len(bars), -1)
+            features[:, column:column + values.shape[1]] = values
+            column += values.shape[1]
+        signal = state['signal'].update
+        features[:, column] = [signal(close) for close in ohlcv[3].tolist()]
+
+        self.store.append(tic, dates, features, ohlcv[3], self.columns)
+        return len(dates)
+
+    def run(self, chunks) -> FeatureStore:
+        """Process every chunk of an iterable in order and return the store."""
+        for chunk in chunks:
+            self.process(chunk)
+        return self.store
@@ -1,6 +1,11 @@
+import numpy as np
 import pandas as pd
 from dataclasses import dataclass
 
+from data_preprocessor.ingest import CCXT_SCHEMA, CandleSchema, from_frame, from_rows
+from data_preprocessor.resample import align_calendar, resample_candles
+from instrumentation.recorder import result_rows, timed
+
 @dataclass
 class DataPreprocessor:
     data: any 
@@ -12,6 +17,7 @@ class DataPreprocessor:
     :param source: The source type ('generic', 'ccxt', 'yfinance').
     """
     
+    @timed('preprocess', rows=result_rows)
     def preprocess(self):
         """
         Preprocess the data into a pandas DataFrame.
@@ -33,6 +39,63 @@ class DataPreprocessor:
         self.df = df  # Store the dataframe in the instance for later use
         return df
 
+    @timed('preprocess.ingest', rows=result_rows)
+    def ingest(self, schema: CandleSchema = None, tic=None, validate: bool = True) -> pd.DataFrame:
+        """
+        Typed ingestion path: build the frame straight from the raw payload with an explicit schema.
+
+        Row payloads (lists or 2-D arrays, e.g. ccxt `fetch_ohlcv` output) are laid out as
+        `schema.fields`; DataFrames (ccxt/generic or yfinance columns) are read without being
+        modified. Timestamps become an int64-nanosecond 'timestamp' index, prices use the schema's
+        float32/float64 dtype, `tic` is categorical, and timestamps are validated to be increasing
+        and unique.
+
+        :param schema: The payload layout and dtypes. Defaults to `CCXT_SCHEMA` for row payloads.
+        :param tic: Ticker name for the rows, if any.
+        :param validate: Raise on unsorted or duplicate timestamps.
+        :return: A pandas DataFrame in the `preprocess` layout.
+        """
+        if isinstance(self.data, pd.DataFrame):
+            df = from_frame(self.data, schema, tic, validate)
+        elif isinstance(self.data, (list, tuple, np.ndarray)):
+            df = from_rows(self.data, schema or CCXT_SCHEMA, tic, validate)
+        else:
+            raise ValueError("Unsupported data type")
+        if self.source == 'yfinance':
+            df = df.reset_index()
+        self.df = df
+        return df
+
+    @timed('preprocess.resample', rows=result_rows)
+    def resample(self, rule: str) -> pd.DataFrame:
+        """
+        Aggregate the preprocessed candles to a coarser timeframe (e.g. 1m -> '5min', '1h', '1D').
+
+        :param rule: The fixed target timeframe.
+        :return: A pandas DataFrame of OHLCV candles in the same layout.
+        """
+        return resample_candles(self._frame(), rule)
+
+    @timed('preprocess.align', rows=result_rows)
+    def align(self, calendar=None, freq: str = None, fill: str = 'ffill', backfill: bool = False) -> pd.DataFrame:
+        """
+        Align every ticker on one calendar and fill the bars a ticker is missing.
+
+        :param calendar: Explicit dates. Defaults to every date in the data, or the full range with `freq`.
+        :param freq: Frequency of a full-range calendar.
+        :param fill: 'ffill' (flat candles at the last close, zero volume), 'zero' or 'nan'.
+        :param backfill: Also fill each ticker's leading gap from its first bar.
+        :return: A pandas DataFrame with one row per date and ticker, in (date, tic) order.
+        """
+        return align_calendar(self._frame(), calendar, freq, fill, backfill)
+
+    def _frame(self) -> pd.DataFrame:
+        if hasattr(self, 'df'):
+            return self.df
+        if isinstance(self.data, pd.DataFrame):
+            return self.data
+        raise ValueError("Data has not been preprocessed yet. Call preprocess() or ingest() first.")
+
     def _list_to_dataframe(self, data):
         """
         Convert a list of lists or list of tuples into a pandas DataFrame.
@@ -60,12 +123,13 @@ class DataPreprocessor:
         """
         if self.source == 'ccxt':
             if 'adj_close' not in df.columns:
+                df = df.copy(deep=False)  # don't add the column to the caller's frame
                 df.insert(5, 'adj_close', df['close'])
-            df.set_index('timestamp', inplace=True)
+            df = df.set_index('timestamp')
         elif self.source == 'yfinance':
-            df.reset_index(inplace=True)
+            df = df.reset_index()
         else:
-            df.set_index('timestamp', inplace=True)  # Default action for generic source
+            df = df.set_index('timestamp')  # Default action for generic source
         return df
 
     def get_columns(self, *columns):
@@ -0,0 +1,188 @@
+import numpy as np
+import pandas as pd
+
+
+# column -> reduction used when aggregating candles; any other numeric column keeps its last value
+_AGGREGATIONS = {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'adj_close': 'last', 'volume': 'sum'}
+_REDUCERS = {'max': np.maximum.reduceat, 'min': np.minimum.reduceat, 'sum': np.add.reduceat}
+_PRICE_COLUMNS = ('open', 'high', 'low', 'close', 'adj_close')
+
+
+def _split(df: pd.DataFrame) -> tuple:
+    """Return (time column name or None for the index, int64 ns timestamps, tic codes or None, tic categories)."""
+    if 'date' in df.columns:
+        time_column = 'date'
+    elif 'timestamp' in df.columns:
+        time_column = 'timestamp'
+    else:
+        time_column = None
+    times = df[time_column] if time_column else df.index
+    timestamps = pd.DatetimeIndex(times).as_unit('ns').asi8
+    if 'tic' not in df.columns:
+        return time_column, timestamps, None, None
+    tic = pd.Categorical(df['tic'])
+    return time_column, timestamps, tic.codes.astype(np.int64), tic.categories
+
+
+def _assemble(df: pd.DataFrame, time_column, timestamps: np.ndarray, codes, categories, columns: dict) -> pd.DataFrame:
+    """Build the output frame in the input layout (time column or index, optional categorical tic)."""
+    dates = pd.DatetimeIndex(timestamps.view('datetime64[ns]'), name=time_column or df.index.name)
+    data = {}
+    if time_column:
+        data[time_column] = dates
+    if codes is not None:
+        data['tic'] = pd.Categorical.from_codes(codes, categories=categories)
+    data.update(columns)
+    if 'day' in df.columns:
+        data['day'] = dates.dayofweek
+    out = pd.DataFrame(data, index=None if time_column else dates, copy=False)
+    return out[[column for column in df.columns if column in out.columns]] if time_column else out
+
+
+def _numeric_columns(df: pd.DataFrame) -> list:
+    return [column for column in df.columns
+            if column not in ('date', 'timestamp', 'tic', 'day') and pd.api.types.is_numeric_dtype(df[column])]
+
+
+def resample_candles(df: pd.DataFrame, rule: str) -> pd.DataFrame:
+    """
+    Aggregate candles to a coarser fixed timeframe (e.g. '5min', '1h', '1D') in one sorted pass.
+
+    Rows are ordered by (tic, time) with one stable sort (skipped when already ordered), bar
+    boundaries are found where the ticker or the time bucket changes, and every column is reduced
+    over those segments with `ufunc.reduceat`: open first, high max, low min, close/adj_close last,
+    volume sum, other numeric columns last. Buckets are aligned to the Unix epoch and labelled by
+    their start, as pandas `resample(rule)` does for fixed frequencies.
+
+    Args:
+        df (pd.DataFrame): Candles with a 'date'/'timestamp' column or a DatetimeIndex, and optionally 'tic'.
+        rule (str): Fixed target timeframe.
+
+    Returns:
+        pd.DataFrame: Resampled candles in the input layout, ordered by (tic, time).
+    """
+    try:
+        step = pd.Timedelta(rule).value
+    except ValueError:
+        raise ValueError(f"Only fixed timeframes can be resampled, got '{rule}'") from None
+
+    time_column, timestamps, codes, categories = _split(df)
+    order = None
+    if codes is None:
+        if len(timestamps) > 1 and (np.diff(timestamps) < 0).any():
+            order = np.argsort(timestamps, kind='stable')
+    else:
+        code_step, time_step = np.diff(codes), np.diff(timestamps)
+        if ((code_step < 0) | ((code_step == 0) & (time_step < 0))).any():
+            order = np.lexsort((timestamps, codes))
+    if order is not None:
+        timestamps = timestamps[order]
+        codes = codes[order] if codes is not None else None
+
+    buckets = timestamps - timestamps % step
+    boundary = np.ones(len(buckets), dtype=bool)
+    boundary[1:] = buckets[1:] != buckets[:-1]
+    if codes is not None:
+        boundary[1:] |= codes[1:] != codes[:-1]
+    starts = np.flatnonzero(boundary)
+    ends = np.append(starts[1:], len(buckets)) - 1
+
+    columns = {}
+    for column in _numeric_columns(df):
+        values = df[column].to_numpy()
+        if order is not None:
+            values = values[order]
+        how = _AGGREGATIONS.get(column, 'last')
+        if not len(starts):
+            columns[column] = values[:0]
+        elif how == 'first':
+            columns[column] = values[starts]
+        elif how == 'last':
+            columns[column] = values[ends]
+        else:
+            columns[column] = _REDUCERS[how](values, starts)
+    return _assemble(df, time_column, buckets[starts], codes[starts] if codes is not None else None, categories, columns)
+
+
+def align_calendar(df: pd.DataFrame, calendar=None, freq: str = None, fill: str = 'ffill',
+                   backfill: bool = False) -> pd.DataFrame:
+    """
+    Align several tickers on one calendar, filling the bars a ticker is missing.
+
+    This replaces the date x ticker Cartesian merge: every row is scattered into a dense
+    (dates x tickers) grid by `searchsorted` on the calendar, gaps are filled column-wise, and the
+    grid is read back in (date, tic) order.
+
+    Args:
+        df (pd.DataFrame): Candles with a 'date'/'timestamp' column or a DatetimeIndex, and a 'tic' column.
+        calendar (array-like, optional): Explicit sorted dates. Defaults to every date present in `df`
+                                         or, with `freq`, the full range between its first and last date.
+        freq (str, optional): Frequency of a full-range calendar, e.g. '1D' or '1min'.
+        fill (str): 'ffill' carries the last close into open/high/low/close with zero volume (other
+                    columns carry their last value), 'zero' fills with 0 as the FinRL notebooks do,
+                    'nan' leaves the gaps. Defaults to 'ffill'.
+        backfill (bool): With 'ffill', also fill a ticker's leading gap from its first bar's open. Defaults to False.
+
+    Returns:
+        pd.DataFrame: len(calendar) x tickers rows in (date, tic) order, in the input layout.
+    """
+    if fill not in ('ffill', 'zero', 'nan'):
+        raise ValueError(f"Unknown fill '{fill}', expected 'ffill', 'zero' or 'nan'")
+    time_column, timestamps, codes, categories = _split(df)
+    if codes is None:
+        codes, categories = np.zeros(len(timestamps), dtype=np.int64), pd.Index([None])
+    if calendar is not None:
+        grid_dates = pd.DatetimeIndex(calendar).as_unit('ns').asi8
+    elif freq is not None:
+        grid_dates = pd.date_range(pd.Timestamp(timestamps.min()), pd.Timestamp(timestamps.max()),
+                                   freq=freq).as_unit('ns').asi8
+    else:
+        grid_dates = np.unique(timestamps)
+    n_dates, n_tics = len(grid_dates), len(categories)
+
+    slot = np.searchsorted(grid_dates, timestamps)
+    on_grid = slot < n_dates
+    on_grid[on_grid] = grid_dates[slot[on_grid]] == timestamps[on_grid]
+    cells = slot[on_grid] * n_tics + codes[on_grid]
+    present = np.zeros(n_dates * n_tics, dtype=bool)
+    present[cells] = True
+    present = present.reshape(n_dates, n_tics)
+
+    def scatter(column):
+        grid = np.full(n_dates * n_tics, np.nan)
+        grid[cells] = df[column].to_numpy()[on_grid]
+        return grid
+
+    gap = ~present.ravel()
+    if fill == 'ffill':
+        # row of the last present bar of the same ticker (or, for a backfilled leading gap, the first one)
+        last = np.where(present, np.arange(n_dates)[:, None], -1)
+        np.maximum.accumulate(last, axis=0, out=last)
+        leading = (last < 0) & backfill
+        last = np.where(leading, np.argmax(present, axis=0)[None, :], last)
+        missing = (last < 0).ravel()
+        source = (np.maximum(last, 0) * n_tics + np.arange(n_tics)[None, :]).ravel()
+        if 'close' in df.columns:
+            carried = scatter('close')[source]
+            if backfill:
+                carried = np.where(leading.ravel(), scatter('open' if 'open' in df.columns else 'close')[source], carried)
+            carried[missing] = np.nan
+
+    columns = {}
+    for column in _numeric_columns(df):
+        grid = scatter(column)
+        if fill == 'zero':
+            grid[gap] = 0.0
+        elif fill == 'ffill':
+            if column in _PRICE_COLUMNS and 'close' in df.columns:
+                filled = carried
+            elif column == 'volume':
+                filled = np.where(missing, np.nan, 0.0)
+            else:
+                filled = grid[source]
+                filled[missing] = np.nan
+            grid = np.where(gap, filled, grid)
+        columns[column] = grid.astype(np.float32) if df[column].dtype == np.float32 else grid
+
+    tic_codes = np.tile(np.arange(n_tics), n_dates) if 'tic' in df.columns else None
+    return _assemble(df, time_column, np.repeat(grid_dates, n_tics), tic_codes, categories, columns)
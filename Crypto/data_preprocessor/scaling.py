@@ -0,0 +1,284 @@
+import math
+import warnings
+from abc import ABC, abstractmethod
+
+import numpy as np
+import pandas as pd
+
+
+class Scaler(ABC):
+    """
+    Causal feature scaler with running statistics.
+
+    Each row is scaled with the statistics of every row seen up to and including it, so no future
+    information leaks into the state space and the same object keeps scaling bars in the live loop
+    after training, without touching history. Statistics are kept per column and NaN values (e.g.
+    indicator warm-up) are skipped and come out as NaN.
+
+    `update` feeds one bar, `update_batch` feeds a (rows x features) chunk in a vectorized pass with
+    identical results, and `transform` scales with the current statistics without updating them.
+    `save`/`load` persist parameters and state in one .npz file next to a trained model.
+    """
+
+    def __init__(self, n_features: int):
+        self.n_features = n_features
+        self.reset()
+
+    @abstractmethod
+    def reset(self):
+        """Clear the running statistics."""
+
+    @abstractmethod
+    def update_batch(self, values: np.ndarray) -> np.ndarray:
+        """Feed a (rows x features) chunk and return it scaled, each row with the statistics up to that row."""
+
+    @abstractmethod
+    def transform(self, values: np.ndarray) -> np.ndarray:
+        """Scale rows with the current statistics, without updating them."""
+
+    def update(self, row: np.ndarray) -> np.ndarray:
+        """Feed one bar and return it scaled."""
+        return self.update_batch(np.asarray(row).reshape(1, -1))[0]
+
+    def _params(self) -> dict:
+        return {}
+
+    def _state(self) -> dict:
+        return {}
+
+    def save(self, path):
+        """Write the scaler type, parameters and running state to an .npz file."""
+        np.savez(path, kind=type(self).__name__, n_features=self.n_features,
+                 **{f'param_{k}': v for k, v in self._params().items()}, **self._state())
+
+    @staticmethod
+    def load(path) -> 'Scaler':
+        """Restore a scaler written by `save`, ready to keep scaling where it left off."""
+        with np.load(path) as data:
+            params = {key[len('param_'):]: data[key].item() if data[key].ndim == 0 else tuple(data[key])
+                      for key in data.files if key.startswith('param_')}
+            scaler = SCALERS[str(data['kind'])](int(data['n_features']), **params)
+            for key in data.files:
+                if key not in ('kind', 'n_features') and not key.startswith('param_'):
+                    value = data[key]
+                    setattr(scaler, key, value.item() if value.ndim == 0 else value.copy())
+        return scaler
+
+
+def _as_float(values: np.ndarray) -> tuple:
+    values = np.asarray(values)
+    dtype = values.dtype if np.issubdtype(values.dtype, np.floating) else np.float64
+    return values.astype(np.float64, copy=False), dtype
+
+
+class WelfordScaler(Scaler):
+    """
+    Running z-score over the whole history (Welford mean and variance), a causal StandardScaler.
+
+    Chunks are merged into the running moments with prefix sums of the deviations from the
+    previous running mean, which is the Chan et al. parallel update applied at every row.
+    """
+
+    def reset(self):
+        self.count = np.zeros(self.n_features)
+        self.mean = np.zeros(self.n_features)
+        self.m2 = np.zeros(self.n_features)
+
+    def _state(self) -> dict:
+        return {'count': self.count, 'mean': self.mean, 'm2': self.m2}
+
+    def update_batch(self, values):
+        values, dtype = _as_float(values)
+        valid = ~np.isnan(values)
+        shifted = np.where(valid, values - self.mean, 0.0)
+        count = self.count + np.cumsum(valid, axis=0)
+        total = np.cumsum(shifted, axis=0)
+        total_sq = np.cumsum(shifted * shifted, axis=0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            offset = total / count
+            m2 = self.m2 + total_sq - total * offset
+            std = np.sqrt(np.maximum(m2, 0.0) / count)
+            scaled = np.where(std > 0, (shifted - offset) / std, 0.0)
+        scaled[~valid] = np.nan
+        if len(values):
+            self.mean = np.where(count[-1] > 0, self.mean + np.nan_to_num(offset[-1]), self.mean)
+            self.m2 = np.where(count[-1] > 0, np.maximum(np.nan_to_num(m2[-1]), 0.0), self.m2)
+            self.count = count[-1].copy()
+        return scaled.astype(dtype, copy=False)
+
+    def update(self, row):
+        row, dtype = _as_float(row)
+        valid = ~np.isnan(row)
+        self.count = self.count + valid
+        delta = np.where(valid, row - self.mean, 0.0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.mean = self.mean + np.where(valid, delta / self.count, 0.0)
+            self.m2 = self.m2 + delta * np.where(valid, row - self.mean, 0.0)
+        return self.transform(row).astype(dtype, copy=False)
+
+    def transform(self, values):
+        values, dtype = _as_float(values)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            std = np.sqrt(self.m2 / self.count)
+            scaled = np.where(std > 0, (values - self.mean) / std, 0.0)
+        scaled[np.isnan(values) | (self.count == 0)] = np.nan
+        return scaled.astype(dtype, copy=False)
+
+
+class RollingMinMaxScaler(Scaler):
+    """
+    Min-max scaling over the last `window` rows, a causal MinMaxScaler for non-stationary features
+    such as prices. Constant windows map to the lower end of `feature_range`.
+
+    Args:
+        n_features (int): Number of feature columns.
+        window (int): Rows in the rolling window, including the current one. Defaults to 252.
+        feature_range (tuple): Output (low, high). Defaults to (0, 1).
+    """
+
+    def __init__(self, n_features: int, window: int = 252, feature_range: tuple = (0.0, 1.0)):
+        self.window = window
+        self.feature_range = tuple(feature_range)
+        super().__init__(n_features)
+
+    def reset(self):
+        # ring buffer of the last `window` rows (NaN until filled) and the number of rows seen
+        self.history = np.full((self.window, self.n_features), np.nan)
+        self.position = 0
+
+    def _params(self) -> dict:
+        return {'window': self.window, 'feature_range': np.asarray(self.feature_range)}
+
+    def _state(self) -> dict:
+        return {'history': self.history, 'position': self.position}
+
+    def _scale(self, values, low, high):
+        span = high - low
+        lower, upper = self.feature_range
+        with np.errstate(divide='ignore', invalid='ignore'):
+            unit = np.where(span > 0, (values - low) / span, 0.0)
+        scaled = lower + unit * (upper - lower)
+        scaled[np.isnan(values) | np.isnan(span)] = np.nan
+        return scaled
+
+    def _bounds(self) -> tuple:
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)  # all-NaN columns during warm-up
+            return np.nanmin(self.history, axis=0), np.nanmax(self.history, axis=0)
+
+    def update(self, row):
+        row, dtype = _as_float(row)
+        self.history[self.position % self.window] = row
+        self.position += 1
+        return self._scale(row, *self._bounds()).astype(dtype, copy=False)
+
+    def update_batch(self, values):
+        values, dtype = _as_float(values)
+        seen = min(self.position, self.window - 1)
+        recent = np.roll(self.history, -(self.position % self.window), axis=0)[self.window - seen:]
+        combined = np.concatenate([recent, values])
+        rolling = pd.DataFrame(combined).rolling(self.window, min_periods=1)
+        low = rolling.min().to_numpy()[seen:]
+        high = rolling.max().to_numpy()[seen:]
+
+        tail = combined[-self.window:]
+        self.position += len(values)
+        self.history = np.full((self.window, self.n_features), np.nan)
+        slots = np.arange(self.position - len(tail), self.position) % self.window
+        self.history[slots] = tail
+        return self._scale(values, low, high).astype(dtype, copy=False)
+
+    def transform(self, values):
+        values, dtype = _as_float(values)
+        return self._scale(values, *self._bounds()).astype(dtype, copy=False)
+
+
+class EWMAScaler(Scaler):
+    """
+    Exponentially weighted z-score: the running mean and variance follow
+    mean += alpha * d and var = (1 - alpha) * (var + alpha * d**2), with d the deviation from the
+    previous mean, seeded by each column's first value (as pandas ewm(adjust=False)).
+
+    Chunks are scanned in blocks short enough that the decay factors stay well conditioned, each
+    block being two prefix sums instead of a per-row loop.
+
+    Args:
+        n_features (int): Number of feature columns.
+        alpha (float): Smoothing factor. Defaults to 2 / (span + 1) for `span`.
+        span (float): Span in rows, used when `alpha` is not given. Defaults to 100.
+    """
+
+    def __init__(self, n_features: int, alpha: float = None, span: float = 100):
+        self.alpha = alpha if alpha is not None else 2.0 / (span + 1)
+        # decay over one block bounded by 1e2 keeps the prefix-sum rescaling accurate
+        self._block = max(1, int(math.log(1e2) / -math.log1p(-self.alpha))) if self.alpha < 1 else 1
+        super().__init__(n_features)
+
+    def reset(self):
+        self.started = np.zeros(self.n_features, dtype=bool)
+        self.mean = np.zeros(self.n_features)
+        self.var = np.zeros(self.n_features)
+
+    def _params(self) -> dict:
+        return {'alpha': self.alpha}
+
+    def _state(self) -> dict:
+        return {'started': self.started, 'mean': self.mean, 'var': self.var}
+
+    def update_batch(self, values):
+        values, dtype = _as_float(values)
+        scaled = np.empty_like(values)
+        for start in range(0, len(values), self._block):
+            scaled[start:start + self._block] = self._scan(values[start:start + self._block])
+        return scaled.astype(dtype, copy=False)
+
+    def _scan(self, block):
+        valid = ~np.isnan(block)
+        # columns seen for the first time are seeded with their first value
+        first = np.argmax(valid, axis=0)
+        seed = ~self.started & valid.any(axis=0)
+        self.mean = np.where(seed, block[first, np.arange(self.n_features)], self.mean)
+        updating = valid & (self.started | (np.arange(len(block))[:, None] > first))
+        self.started = self.started | seed
+
+        a = self.alpha
+        decay = np.power(1.0 - a, np.cumsum(updating, axis=0))
+        # mean_t = decay_t * (mean_0 + sum_k a * x_k / decay_k) over the updating rows
+        weighted = np.where(updating, a * np.nan_to_num(block), 0.0) / decay
+        mean = decay * (self.mean + np.cumsum(weighted, axis=0))
+        previous_mean = np.concatenate([self.mean[None, :], mean[:-1]])
+        deviation = np.where(updating, np.nan_to_num(block) - previous_mean, 0.0)
+        var = decay * (self.var + np.cumsum((1.0 - a) * a * deviation * deviation / decay, axis=0))
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            std = np.sqrt(var)
+            scaled = np.where(std > 0, (block - mean) / std, 0.0)
+        scaled[~valid] = np.nan
+        self.mean, self.var = mean[-1].copy(), var[-1].copy()
+        return scaled
+
+    def update(self, row):
+        row, dtype = _as_float(row)
+        valid = ~np.isnan(row)
+        updating = valid & self.started
+        self.mean = np.where(valid & ~self.started, row, self.mean)
+        self.started = self.started | valid
+        deviation = np.where(updating, row - self.mean, 0.0)
+        self.mean = self.mean + self.alpha * deviation
+        self.var = np.where(updating, (1.0 - self.alpha) * (self.var + self.alpha * deviation * deviation), self.var)
+        return self.transform(row).astype(dtype, copy=False)
+
+    def transform(self, values):
+        values, dtype = _as_float(values)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            std = np.sqrt(self.var)
+            scaled = np.where(std > 0, (values - self.mean) / std, 0.0)
+        scaled[np.isnan(values) | ~self.started] = np.nan
+        return scaled.astype(dtype, copy=False)
+
+
+SCALERS = {
+    'WelfordScaler': WelfordScaler,
+    'RollingMinMaxScaler': RollingMinMaxScaler,
+    'EWMAScaler': EWMAScaler,
+}
@@ -0,0 +1,412 @@
+import asyncio
+import hashlib
+import hmac
+import itertools
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from urllib.parse import urlencode
+
+import aiohttp
+
+from data_fetcher.datafetcher import load_config
+
+
+REST_URLS = {True: 'https://testnet.binance.vision', False: 'https://api.binance.com'}
+STREAM_URLS = {True: 'wss://testnet.binance.vision/ws', False: 'wss://stream.binance.com:9443/ws'}
+FINAL_STATUSES = frozenset({'FILLED', 'CANCELED', 'REJECTED', 'EXPIRED', 'EXPIRED_IN_MATCH'})
+
+logger = logging.getLogger(__name__)
+
+
+class APIError(Exception):
+    """
+    Error response from the exchange (Binance 'code'/'msg' payload).
+
+    `code` is None when the body was not a Binance payload at all, e.g. a proxy's HTML error page;
+    such a response says nothing about whether the exchange saw the request.
+    """
+
+    def __init__(self, status: int, code: int, message: str):
+        super().__init__(f"HTTP {status}, code {code}: {message}")
+        self.status = status
+        self.code = code
+        self.message = message
+
+
+@dataclass
+class OrderRequest:
+    """
+    One order to submit.
+
+    Args:
+        symbol (str): Exchange symbol, e.g. 'BTCUSDT'.
+        side (str): 'BUY' or 'SELL'.
+        quantity (float): Base-asset quantity.
+        type (str): 'MARKET' or 'LIMIT'. Defaults to 'MARKET'.
+        price (float, optional): Limit price.
+        time_in_force (str, optional): For limit orders. Defaults to 'GTC' when a price is given.
+        client_order_id (str, optional): Assigned by the client when not given.
+    """
+    symbol: str
+    side: str
+    quantity: float
+    type: str = 'MARKET'
+    price: float = None
+    time_in_force: str = None
+    client_order_id: str = None
+
+    def params(self) -> dict:
+        params = {'symbol': self.symbol, 'side': self.side, 'type': self.type, 'quantity': f'{self.quantity:.8f}',
+                  'newClientOrderId': self.client_order_id, 'newOrderRespType': 'RESULT'}
+        if self.price is not None:
+            params['price'] = f'{self.price:.8f}'
+            params['timeInForce'] = self.time_in_force or 'GTC'
+        return params
+
+
+@dataclass
+class OrderState:
+    """
+    Latest known state of an order, updated from REST responses and the user-data stream.
+
+    The status is 'PENDING' until the exchange answers, then the exchange's order status. It is
+    'UNKNOWN' while a submission whose outcome was lost (timeout, dropped connection, 5xx) is being
+    settled: the exchange may still have accepted such an order.
+    """
+    request: OrderRequest
+    status: str = 'PENDING'
+    order_id: int = None
+    filled: float = 0.0
+    quote_filled: float = 0.0
+    commission: float = 0.0
+    error: str = None
+    updated: float = field(default_factory=time.time)
+    _done: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+    @property
+    def average_price(self) -> float:
+        return self.quote_filled / self.filled if self.filled else float('nan')
+
+    @property
+    def done(self) -> bool:
+        return self.status in FINAL_STATUSES
+
+
+class ExecutionClient:
+    """
+    Asynchronous Binance spot order client.
+
+    One pooled keep-alive `aiohttp` session carries every request, and the HMAC key is prepared
+    once so each order is signed with a single digest copy. `place_orders` pre-signs a whole
+    batch and sends it concurrently (bounded by `max_concurrency`), so rebalancing many symbols
+    costs about one round trip instead of one per order. Order states are tracked from the
+    user-data stream's execution reports rather than by polling.
+
+    Use as an async context manager:
+
+        async with ExecutionClient.from_config() as client:
+            await client.start_user_stream()
+            states = await client.place_orders([OrderRequest('BTCUSDT', 'BUY', 0.001), ...])
+
+    Args:
+        api_key (str): API key.
+        secret_key (str): API secret.
+        rest_url (str): REST base URL. Defaults to the Binance spot testnet.
+        stream_url (str): User-data websocket base URL. Defaults to the Binance spot testnet.
+        recv_window (int): Signed-request validity window in ms. Defaults to 5000.
+        max_concurrency (int): Orders in flight at once; also the connection pool size. Defaults to 32.
+        timeout (float): Per-request timeout in seconds. Defaults to 10.
+    """
+
+    def __init__(self, api_key: str, secret_key: str, rest_url: str = REST_URLS[True],
+                 stream_url: str = STREAM_URLS[True], recv_window: int = 5000, max_concurrency: int = 32,
+                 timeout: float = 10.0):
+        self.api_key = api_key
+        self.rest_url = rest_url.rstrip('/')
+        self.stream_url = stream_url.rstrip('/')
+        self.recv_window = recv_window
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.orders = {}
+        self.time_offset = 0
+        self._mac = hmac.new(secret_key.encode(), digestmod=hashlib.sha256)
+        self._ids = itertools.count()
+        self._prefix = f'x{int(time.time() * 1000) % 10**10}'
+        self._session = None
+        self._semaphore = None
+        self._listen_key = None
+        self._tasks = []
+
+    @classmethod
+    def from_config(cls, config_file_path: Path = None, exchange_id: str = 'binance', testnet: bool = None, **kwargs):
+        """
+        Build a client from the `config.json` used by the data fetchers.
+
+        Reads 'api_key' and 'secret_key' from the `exchange_id` section, plus the optional
+        'testnet' (default True), 'rest_url' and 'stream_url' keys.
+        """
+        config = load_config(config_file_path or Path.cwd() / 'config.json')[exchange_id]
+        testnet = config.get('testnet', True) if testnet is None else testnet
+        return cls(config.get('api_key', ''), config.get('secret_key', ''),
+                   rest_url=config.get('rest_url', REST_URLS[testnet]),
+                   stream_url=config.get('stream_url', STREAM_URLS[testnet]), **kwargs)
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def start(self):
+        """Open the pooled keep-alive session."""
+        if self._session is None:
+            connector = aiohttp.TCPConnector(limit=self.max_concurrency, keepalive_timeout=60, ttl_dns_cache=300)
+            self._session = aiohttp.ClientSession(connector=connector, headers={'X-MBX-APIKEY': self.api_key},
+                                                  timeout=aiohttp.ClientTimeout(total=self.timeout))
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    async def close(self):
+        """Stop the user-data stream and close the session."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        if self._listen_key is not None:
+            try:
+                await self._request('DELETE', '/api/v3/userDataStream', {'listenKey': self._listen_key})
+            except (APIError, aiohttp.ClientError, asyncio.TimeoutError):
+                pass
+            self._listen_key = None
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    # signing and transport
+
+    def sign(self, params: dict) -> str:
+        """Return the signed query string for `params`, stamped with the (offset-corrected) time."""
+        params = {key: value for key, value in params.items() if value is not None}
+        params['recvWindow'] = self.recv_window
+        params['timestamp'] = int(time.time() * 1000) + self.time_offset
+        query = urlencode(params)
+        mac = self._mac.copy()
+        mac.update(query.encode())
+        return f'{query}&signature={mac.hexdigest()}'
+
+    async def _request(self, method: str, path: str, params: dict = None, signed_query: str = None) -> dict:
+        url = f'{self.rest_url}{path}'
+        if signed_query is not None:
+            url = f'{url}?{signed_query}'
+        async with self._semaphore:
+            async with self._session.request(method, url, params=params) as response:
+                body = await response.text()
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            payload = None
+        if not isinstance(payload, dict):
+            raise APIError(response.status, None, f"Undecodable response: {body[:200]!r}")
+        if response.status >= 400:
+            raise APIError(response.status, payload.get('code', 0), payload.get('msg', ''))
+        return payload
+
+    async def sync_time(self):
+        """Measure the offset between the exchange clock and the local clock used in signatures."""
+        before = time.time() * 1000
+        payload = await self._request('GET', '/api/v3/time')
+        self.time_offset = int(payload['serverTime'] - (before + time.time() * 1000) / 2)
+        return self.time_offset
+
+    # orders
+
+    def _track(self, request: OrderRequest) -> OrderState:
+        if request.client_order_id is None:
+            request.client_order_id = f'{self._prefix}-{next(self._ids)}'
+        state = self.orders[request.client_order_id] = OrderState(request)
+        return state
+
+    def _apply(self, state: OrderState, status: str, order_id=None, filled=None, quote_filled=None,
+               commission: float = 0.0):
+        if order_id is not None:
+            state.order_id = order_id
+        if filled is not None:
+            state.filled = float(filled)
+        if quote_filled is not None:
+            state.quote_filled = float(quote_filled)
+        state.commission += commission
+        # a stream report can arrive before the REST response; never move a finished order back
+        if not state.done:
+            state.status = status
+        state.updated = time.time()
+        if state.done:
+            state._done.set()
+
+    async def _submit(self, state: OrderState, signed_query: str) -> OrderState:
+        submitted = time.time()
+        try:
+            payload = await self._request('POST', '/api/v3/order', signed_query=signed_query)
+        except APIError as e:
+            state.error = str(e)
+            if e.status < 500 and e.code is not None:
+                self._apply(state, 'REJECTED')
+                return state
+            self._unknown(state, submitted)
+            return state
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            state.error = str(e) or type(e).__name__
+            self._unknown(state, submitted)
+            return state
+        self._apply(state, payload.get('status', 'NEW'), payload.get('orderId'), payload.get('executedQty'),
+                    payload.get('cummulativeQuoteQty'))
+        return state
+
+    def _unknown(self, state: OrderState, submitted: float):
+        """Mark an order whose submission outcome was lost and settle it in the background."""
+        if state.status != 'PENDING':  # the user-data stream has already reported it
+            return
+        self._apply(state, 'UNKNOWN')
+        self._tasks.append(asyncio.create_task(self._settle(state, submitted)))
+
+    async def _settle(self, state: OrderState, submitted: float, interval: float = 0.25):
+        """
+        Query an 'UNKNOWN' order by client order id until its fate is known.
+
+        An execution report from the user-data stream settles it as well. 'Order does not exist' is
+        only final once `recv_window` has passed since the submission: from then on the exchange
+        would refuse the request as expired, so the order can no longer appear.
+        """
+        request = state.request
+        expired_at = submitted + self.recv_window / 1000
+        while state.status == 'UNKNOWN':
+            try:
+                payload = await self._query(request)
+            except APIError as e:
+                if e.code == -2013 and time.time() > expired_at:
+                    state.error = f'{state.error}; not found after the request expired'
+                    self._apply(state, 'REJECTED')
+                    return
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logger.warning(f"Query of order {request.client_order_id} failed: {e}")
+            else:
+                if state.status == 'UNKNOWN':
+                    self._apply(state, payload['status'], payload.get('orderId'), payload.get('executedQty'),
+                                payload.get('cummulativeQuoteQty'))
+                return
+            await asyncio.sleep(interval)
+            interval = min(interval * 2, 5.0)
+
+    async def _query(self, request: OrderRequest) -> dict:
+        return await self._request('GET', '/api/v3/order', signed_query=self.sign(
+            {'symbol': request.symbol, 'origClientOrderId': request.client_order_id}))
+
+    async def _reconcile(self):
+        """Query every open tracked order, for reports missed while the user-data stream was down."""
+        async def refresh(state):
+            updated = state.updated
+            try:
+                payload = await self._query(state.request)
+            except (APIError, aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logger.warning(f"Query of order {state.request.client_order_id} failed: {e}")
+                return
+            if state.updated == updated:  # nothing newer arrived from the stream meanwhile
+                self._apply(state, payload['status'], payload.get('orderId'), payload.get('executedQty'),
+                            payload.get('cummulativeQuoteQty'))
+
+        # PENDING orders still await their REST response and UNKNOWN ones are being settled already
+        open_orders = [state for state in self.orders.values()
+                       if not state.done and state.status not in ('PENDING', 'UNKNOWN')]
+        await asyncio.gather(*(refresh(state) for state in open_orders))
+
+    async def place_order(self, request: OrderRequest) -> OrderState:
+        """Submit one order and return its state after the exchange's response."""
+        state = self._track(request)
+        return await self._submit(state, self.sign(request.params()))
+
+    async def place_orders(self, requests: list) -> list:
+        """
+        Submit many orders concurrently.
+
+        The whole batch is signed up front and then sent over the pooled session. Failed orders do
+        not abort the batch: orders the exchange refuses are 'REJECTED' with its error message, and
+        orders whose submission outcome was lost are 'UNKNOWN' until the user-data stream or a query
+        by client order id settles them (`wait_for` waits for that).
+
+        Returns:
+            list: `OrderState` per request, in order.
+        """
+        states = [self._track(request) for request in requests]
+        signed = [self.sign(request.params()) for request in requests]
+        return list(await asyncio.gather(*(self._submit(state, query) for state, query in zip(states, signed))))
+
+    async def cancel_order(self, symbol: str, client_order_id: str) -> OrderState:
+        state = self.orders[client_order_id]
+        payload = await self._request('DELETE', '/api/v3/order', signed_query=self.sign(
+            {'symbol': symbol, 'origClientOrderId': client_order_id}))
+        self._apply(state, payload.get('status', 'CANCELED'), payload.get('orderId'), payload.get('executedQty'),
+                    payload.get('cummulativeQuoteQty'))
+        return state
+
+    async def wait_for(self, client_order_ids=None, timeout: float = None) -> list:
+        """Wait until the given orders (default: all tracked) reach a final status, from the user-data stream."""
+        ids = list(self.orders) if client_order_ids is None else list(client_order_ids)
+        await asyncio.wait_for(asyncio.gather(*(self.orders[i]._done.wait() for i in ids)), timeout)
+        return [self.orders[i] for i in ids]
+
+    # user-data stream
+
+    async def start_user_stream(self, keepalive: float = 30 * 60):
+        """Open the user-data stream and track execution reports in the background."""
+        payload = await self._request('POST', '/api/v3/userDataStream')
+        self._listen_key = payload['listenKey']
+        connected = asyncio.get_running_loop().create_future()
+        self._tasks.append(asyncio.create_task(self._consume(connected)))
+        self._tasks.append(asyncio.create_task(self._keepalive(keepalive)))
+        await connected
+
+    async def _keepalive(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self._request('PUT', '/api/v3/userDataStream', {'listenKey': self._listen_key})
+            except (APIError, aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logger.warning(f"User-data stream keepalive failed: {e}")
+
+    async def _consume(self, connected: asyncio.Future):
+        delay = 1.0
+        while True:
+            try:
+                async with self._session.ws_connect(f'{self.stream_url}/{self._listen_key}', heartbeat=30) as ws:
+                    if not connected.done():
+                        connected.set_result(None)
+                    else:
+                        self._tasks.append(asyncio.create_task(self._reconcile()))
+                    delay = 1.0
+                    async for message in ws:
+                        if message.type == aiohttp.WSMsgType.TEXT:
+                            self.on_event(json.loads(message.data))
+                        elif message.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                            break
+            except asyncio.CancelledError:
+                raise
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if not connected.done():
+                    connected.set_exception(e)
+                    return
+                logger.warning(f"User-data stream dropped ({e}), reconnecting in {delay:.0f}s")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 60.0)
+
+    def on_event(self, event: dict):
+        """Apply one user-data stream event (execution reports update the tracked orders)."""
+        if event.get('e') != 'executionReport':
+            return
+        # a cancel report carries the cancelled order's id in 'C'
+        state = self.orders.get(event.get('C') or event['c'])
+        if state is None:
+            return
+        commission = float(event.get('n') or 0.0) if event.get('x') == 'TRADE' else 0.0
+        self._apply(state, event['X'], event.get('i'), event.get('z'), event.get('Z'), commission)
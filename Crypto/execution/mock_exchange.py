@@ -0,0 +1,239 @@
+import asyncio
+import hashlib
+import hmac
+import itertools
+import json
+import time
+import uuid
+from urllib.parse import parse_qsl
+
+from aiohttp import web
+
+
+class MockExchange:
+    """
+    Local stand-in for the Binance spot REST and user-data stream endpoints used by `ExecutionClient`.
+
+    Signed requests are checked against `api_key`/`secret_key`. MARKET orders fill at once at
+    `prices[symbol]`, LIMIT orders rest as NEW until cancelled or `fill`ed, and every change is
+    pushed as an executionReport to the connected user-data streams. An optional `latency` (seconds) delays each
+    REST response, to measure how well a client overlaps its requests. The next `unknown_orders` new
+    orders get Binance's 503 "execution status unknown" answer (or, with `html_errors`, a proxy's
+    HTML 502 page); with `execute_unknown` they are still executed, otherwise dropped.
+    `disconnect_streams` drops the user-data stream connections, as a network blip would.
+
+    Usage:
+
+        async with MockExchange(prices={'BTCUSDT': 60000.0}) as exchange:
+            client = ExecutionClient('key', 'secret', rest_url=exchange.rest_url, stream_url=exchange.stream_url)
+    """
+
+    def __init__(self, api_key: str = 'key', secret_key: str = 'secret', prices: dict = None, latency: float = 0.0,
+                 host: str = '127.0.0.1', port: int = 0):
+        self.api_key = api_key
+        self.secret_key = secret_key.encode()
+        self.prices = dict(prices or {})
+        self.latency = latency
+        self.host = host
+        self.port = port
+        self.orders = {}
+        self.requests = 0
+        self.unknown_orders = 0
+        self.execute_unknown = True
+        self.html_errors = False
+        self.closed_listen_keys = []
+        self._ids = itertools.count(1)
+        self._streams = {}
+        self._runner = None
+
+        self.app = web.Application()
+        self.app.add_routes([
+            web.get('/api/v3/time', self._time),
+            web.post('/api/v3/order', self._new_order),
+            web.delete('/api/v3/order', self._cancel_order),
+            web.get('/api/v3/order', self._query_order),
+            web.post('/api/v3/userDataStream', self._new_listen_key),
+            web.put('/api/v3/userDataStream', self._keepalive_listen_key),
+            web.delete('/api/v3/userDataStream', self._close_listen_key),
+            web.get('/ws/{listen_key}', self._stream),
+        ])
+
+    @property
+    def rest_url(self) -> str:
+        return f'http://{self.host}:{self.port}'
+
+    @property
+    def stream_url(self) -> str:
+        return f'ws://{self.host}:{self.port}/ws'
+
+    async def start(self):
+        self._runner = web.AppRunner(self.app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        await self.disconnect_streams()
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+    # helpers
+
+    @staticmethod
+    def _error(status: int, code: int, message: str) -> web.Response:
+        return web.json_response({'code': code, 'msg': message}, status=status)
+
+    def _unknown(self) -> web.Response:
+        if self.html_errors:
+            return web.Response(status=502, text='<html><body><h1>502 Bad Gateway</h1></body></html>',
+                                content_type='text/html')
+        return self._error(503, -1007, 'Timeout waiting for response from backend server. '
+                                       'Send status unknown; execution status unknown.')
+
+    async def _signed(self, request: web.Request):
+        """Return the request parameters if the key and signature check out, else an error response."""
+        self.requests += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if request.headers.get('X-MBX-APIKEY') != self.api_key:
+            return None, self._error(401, -2015, 'Invalid API-key, IP, or permissions for action.')
+        query = request.query_string
+        payload, _, signature = query.rpartition('&signature=')
+        expected = hmac.new(self.secret_key, payload.encode(), hashlib.sha256).hexdigest()
+        if not hmac.compare_digest(signature, expected):
+            return None, self._error(400, -1022, 'Signature for this request is not valid.')
+        return dict(parse_qsl(payload)), None
+
+    def _response(self, order: dict) -> dict:
+        return {'symbol': order['symbol'], 'orderId': order['orderId'], 'clientOrderId': order['clientOrderId'],
+                'transactTime': order['updateTime'], 'price': order['price'], 'origQty': order['origQty'],
+                'executedQty': order['executedQty'], 'cummulativeQuoteQty': order['cummulativeQuoteQty'],
+                'status': order['status'], 'timeInForce': order['timeInForce'], 'type': order['type'],
+                'side': order['side']}
+
+    async def _publish(self, order: dict, execution_type: str, last_qty: float = 0.0, last_price: float = 0.0,
+                       cancel_id: str = ''):
+        event = json.dumps({
+            'e': 'executionReport', 'E': order['updateTime'], 's': order['symbol'],
+            'c': cancel_id or order['clientOrderId'], 'C': order['clientOrderId'] if cancel_id else '',
+            'S': order['side'], 'o': order['type'], 'f': order['timeInForce'], 'q': order['origQty'],
+            'p': order['price'], 'x': execution_type, 'X': order['status'], 'i': order['orderId'],
+            'l': f'{last_qty:.8f}', 'z': order['executedQty'], 'L': f'{last_price:.8f}',
+            'n': f'{last_qty * last_price * 0.001:.8f}', 'N': 'USDT', 'T': order['updateTime'],
+            'Z': order['cummulativeQuoteQty'],
+        })
+        for sockets in self._streams.values():
+            for ws in list(sockets):
+                if not ws.closed:
+                    await ws.send_str(event)
+
+    async def disconnect_streams(self):
+        """Close every user-data stream connection; the listenKeys stay valid for reconnecting."""
+        for sockets in self._streams.values():
+            for ws in list(sockets):
+                await ws.close()
+
+    async def fill(self, client_order_id: str, price: float = None):
+        """Fill a resting order, as if the market traded through its price."""
+        order = self.orders[client_order_id]
+        quantity = float(order['origQty'])
+        price = float(order['price']) if price is None else price
+        order.update(status='FILLED', executedQty=f'{quantity:.8f}', cummulativeQuoteQty=f'{quantity * price:.8f}',
+                     updateTime=int(time.time() * 1000))
+        await self._publish(order, 'TRADE', quantity, price)
+
+    # REST handlers
+
+    async def _time(self, request):
+        return web.json_response({'serverTime': int(time.time() * 1000)})
+
+    async def _new_order(self, request):
+        params, error = await self._signed(request)
+        if error is not None:
+            return error
+        symbol, order_type = params.get('symbol'), params.get('type')
+        if symbol not in self.prices:
+            return self._error(400, -1121, 'Invalid symbol.')
+        if order_type not in ('MARKET', 'LIMIT'):
+            return self._error(400, -1116, 'Invalid orderType.')
+        unknown = self.unknown_orders > 0
+        if unknown:
+            self.unknown_orders -= 1
+            if not self.execute_unknown:
+                return self._unknown()
+        client_order_id = params.get('newClientOrderId') or uuid.uuid4().hex
+        quantity = float(params['quantity'])
+        order = self.orders[client_order_id] = {
+            'symbol': symbol, 'orderId': next(self._ids), 'clientOrderId': client_order_id,
+            'price': params.get('price', '0.00000000'), 'origQty': f'{quantity:.8f}',
+            'executedQty': '0.00000000', 'cummulativeQuoteQty': '0.00000000', 'status': 'NEW',
+            'timeInForce': params.get('timeInForce', 'GTC'), 'type': order_type, 'side': params['side'],
+            'updateTime': int(time.time() * 1000),
+        }
+        await self._publish(order, 'NEW')
+        if order_type == 'MARKET':
+            price = self.prices[symbol]
+            order.update(status='FILLED', executedQty=f'{quantity:.8f}', cummulativeQuoteQty=f'{quantity * price:.8f}')
+            await self._publish(order, 'TRADE', quantity, price)
+        return self._unknown() if unknown else web.json_response(self._response(order))
+
+    async def _cancel_order(self, request):
+        params, error = await self._signed(request)
+        if error is not None:
+            return error
+        order = self.orders.get(params.get('origClientOrderId'))
+        if order is None or order['status'] != 'NEW':
+            return self._error(400, -2011, 'Unknown order sent.')
+        order.update(status='CANCELED', updateTime=int(time.time() * 1000))
+        await self._publish(order, 'CANCELED', cancel_id=uuid.uuid4().hex)
+        return web.json_response(self._response(order))
+
+    async def _query_order(self, request):
+        params, error = await self._signed(request)
+        if error is not None:
+            return error
+        order = self.orders.get(params.get('origClientOrderId'))
+        if order is None:
+            return self._error(400, -2013, 'Order does not exist.')
+        return web.json_response(self._response(order))
+
+    async def _new_listen_key(self, request):
+        if request.headers.get('X-MBX-APIKEY') != self.api_key:
+            return self._error(401, -2015, 'Invalid API-key, IP, or permissions for action.')
+        listen_key = uuid.uuid4().hex
+        self._streams[listen_key] = set()
+        return web.json_response({'listenKey': listen_key})
+
+    async def _keepalive_listen_key(self, request):
+        if request.query.get('listenKey') not in self._streams:
+            return self._error(400, -1125, 'This listenKey does not exist.')
+        return web.json_response({})
+
+    async def _close_listen_key(self, request):
+        self.closed_listen_keys.append(request.query.get('listenKey'))
+        for ws in self._streams.pop(request.query.get('listenKey'), ()):
+            await ws.close()
+        return web.json_response({})
+
+    async def _stream(self, request):
+        sockets = self._streams.get(request.match_info['listen_key'])
+        if sockets is None:
+            raise web.HTTPNotFound()
+        ws = web.WebSocketResponse(heartbeat=30)
+        await ws.prepare(request)
+        sockets.add(ws)
+        try:
+            async for _ in ws:
+                pass
+        finally:
+            sockets.discard(ws)
+        return ws
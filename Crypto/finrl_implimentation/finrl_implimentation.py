@@ -0,0 +1,204 @@
+import gymnasium as gym
+import numpy as np
+import pandas as pd
+from gymnasium import spaces
+
+from indicator_and_strategy.backtester import FillModel
+from indicator_and_strategy.indicator_engine import IndicatorEngine
+from indicator_and_strategy.momentumstrategy import MomentumStrategy
+from instrumentation.recorder import stage, timed
+from reward_funcation.reward_funcation import get_reward_function
+
+
+# Actions, as in the README action space
+HOLD, BUY, SELL = 0, 1, 2
+DEFAULT_INDICATORS = ('rsi', 'cci', 'adx', 'atr')
+
+
+def build_features(dataset: pd.DataFrame, indicators=DEFAULT_INDICATORS, window: int = 14,
+                   short_window: int = 2, long_window: int = 5) -> np.ndarray:
+    """
+    Precompute the per-bar part of the state space into one contiguous float32 array.
+
+    Columns are OHLC, the indicator outputs (see `Indicator.compute`) and the `MomentumStrategy`
+    signal (+1 long, -1 short, 0 flat), i.e. the README layout minus the holding/balance features,
+    which the environment appends at step time.
+
+    Returns:
+        np.ndarray: (bars x features) C-contiguous float32 array; indicator warm-up rows are NaN.
+    """
+    ohlc = dataset[['open', 'high', 'low', 'close']].to_numpy(dtype=np.float64)
+    indicator_matrix = IndicatorEngine(dataset, window).compute_matrix(list(indicators))
+    closes = pd.DataFrame({'date': np.arange(len(dataset)), 'close': dataset['close'].to_numpy()})
+    signal = MomentumStrategy(closes, short_window, long_window).target_positions()
+    return np.ascontiguousarray(np.column_stack([ohlc, indicator_matrix, signal]), dtype=np.float32)
+
+
+class VecTradingEnv:
+    """
+    N single-instrument trading environments stepped together with NumPy.
+
+    All features are precomputed into one contiguous array, so a step is a handful of vectorized
+    operations indexed by each env's bar pointer: no DataFrame access and no per-env Python loop.
+    The observation is the feature row of the current bar followed by the holding one-hot
+    (long, short, flat) and the cash balance relative to the initial cash.
+
+    Actions are HOLD (keep the position), BUY (go long `position_size` units) and SELL (go short).
+    Trades fill at the current close through the shared `FillModel`. The reward is computed for all
+    envs at once by a `Reward` from `reward_funcation` (by default the change in equity over the next
+    bar relative to the initial cash).
+
+    Args:
+        features (np.ndarray): (bars x features) float array from `build_features` (may be a memmap).
+        prices (np.ndarray): Close price per bar.
+        n_envs (int): Number of environments. Defaults to 1.
+        episode_length (int, optional): Bars per episode. Defaults to the whole usable range.
+        initial_cash (float): Starting cash. Defaults to 100000.
+        position_size (float): Units held when long or short. Defaults to 1.
+        fill_model (FillModel, optional): Costs applied to trades. Defaults to `FillModel()`.
+        start (int, optional): First usable bar. Defaults to the first bar without NaN features.
+        end (int, optional): One past the last usable bar. Defaults to the number of bars.
+        random_start (bool): Start episodes at random bars instead of `start`. Defaults to True.
+        autoreset (bool): Reset finished envs inside `step`, as vectorized envs do. Defaults to True.
+        seed (int, optional): Seed for the episode start sampler.
+        reward (str | Reward): Name in `REWARD_FUNCTIONS` or a `Reward` instance. Defaults to 'equity_change'.
+        reward_kwargs (dict, optional): Constructor arguments for a reward given by name.
+    """
+
+    def __init__(self, features: np.ndarray, prices: np.ndarray, n_envs: int = 1, episode_length: int = None,
+                 initial_cash: float = 100000.0, position_size: float = 1.0, fill_model: FillModel = None,
+                 start: int = None, end: int = None, random_start: bool = True, autoreset: bool = True,
+                 seed: int = None, reward='equity_change', reward_kwargs: dict = None):
+        self.features = features
+        self.prices = np.ascontiguousarray(prices, dtype=np.float64)
+        self.n_envs = n_envs
+        self.initial_cash = initial_cash
+        self.position_size = position_size
+        self.fill_model = fill_model or FillModel()
+        self.end = len(features) if end is None else end
+        if start is None:
+            valid = np.flatnonzero(np.isfinite(features[:self.end]).all(axis=1))
+            start = int(valid[0]) if len(valid) else 0
+        self.start = start
+        self.episode_length = episode_length or (self.end - self.start - 1)
+        if self.episode_length < 1 or self.start + self.episode_length >= self.end:
+            raise ValueError("Not enough bars for one episode")
+        self.random_start = random_start
+        self.autoreset = autoreset
+        self.rng = np.random.default_rng(seed)
+
+        self.n_features = features.shape[1]
+        self.observation_dim = self.n_features + 4
+        self.t = np.zeros(n_envs, dtype=np.int64)
+        self.episode_end = np.zeros(n_envs, dtype=np.int64)
+        self.position = np.zeros(n_envs)
+        self.cash = np.zeros(n_envs)
+        self._obs = np.empty((n_envs, self.observation_dim), dtype=np.float32)
+        self._all = np.arange(n_envs)
+        self.reward = get_reward_function(reward, **(reward_kwargs or {}))
+        self.reward.bind(n_envs, initial_cash)
+
+    @classmethod
+    def from_dataset(cls, dataset: pd.DataFrame, indicators=DEFAULT_INDICATORS, window: int = 14,
+                     short_window: int = 2, long_window: int = 5, **kwargs):
+        """Build the env from a candle frame ('date', 'open', 'high', 'low', 'close', 'volume')."""
+        features = build_features(dataset, indicators, window, short_window, long_window)
+        return cls(features, dataset['close'].to_numpy(), **kwargs)
+
+    @classmethod
+    def from_store(cls, store, tic: str, **kwargs):
+        """Step over one ticker's memory-mapped arrays in a `FeatureStore`, without loading them."""
+        features, close, _ = store.open(tic)
+        if kwargs.get('start') is None and store.meta(tic)['warmup'] is not None:
+            kwargs['start'] = store.meta(tic)['warmup']
+        return cls(features, close, **kwargs)
+
+    def reset(self, seed: int = None) -> np.ndarray:
+        """Reset every env and return the stacked observations."""
+        if seed is not None:
+            self.rng = np.random.default_rng(seed)
+        self._reset_envs(self._all)
+        return self._observe()
+
+    def _reset_envs(self, envs: np.ndarray):
+        if self.random_start:
+            self.t[envs] = self.rng.integers(self.start, self.end - self.episode_length, size=len(envs))
+        else:
+            self.t[envs] = self.start
+        self.episode_end[envs] = self.t[envs] + self.episode_length
+        self.position[envs] = 0.0
+        self.cash[envs] = self.initial_cash
+        self.reward.reset_envs(envs)
+
+    def _observe(self) -> np.ndarray:
+        obs = self._obs
+        obs[:, :self.n_features] = self.features[self.t]
+        holding = obs[:, self.n_features:self.n_features + 3]
+        holding[:, 0] = self.position > 0
+        holding[:, 1] = self.position < 0
+        holding[:, 2] = self.position == 0
+        obs[:, self.n_features + 3] = self.cash / self.initial_cash
+        return obs.copy()
+
+    @timed('env.step', rows=lambda result, self, *args, **kwargs: self.n_envs)
+    def step(self, actions):
+        """
+        Step every env with one action each.
+
+        Returns:
+            tuple: (observations, rewards, dones, infos). With `autoreset`, finished envs are reset and
+                   their final observation is in infos[i]['terminal_observation'].
+        """
+        actions = np.asarray(actions).reshape(self.n_envs)
+        price = self.prices[self.t]
+        target = np.where(actions == BUY, self.position_size,
+                          np.where(actions == SELL, -self.position_size, self.position))
+        quantity = target - self.position
+        fill_price = self.fill_model.fill_price(price, quantity)
+        fee = self.fill_model.fee(quantity, fill_price)
+        equity_before = self.cash + self.position * price
+        self.cash -= quantity * fill_price + fee
+        self.position = target
+
+        self.t += 1
+        equity_after = self.cash + self.position * self.prices[self.t]
+        current_step = self.episode_length - (self.episode_end - self.t)
+        with stage('env.reward', self.n_envs):
+            rewards = self.reward(equity_before, equity_after, fee, current_step, self.episode_length)
+        dones = self.t >= self.episode_end
+
+        infos = [{} for _ in range(self.n_envs)]
+        if self.autoreset and dones.any():
+            finished = np.flatnonzero(dones)
+            terminal = self._observe()
+            for i in finished:
+                infos[i]['terminal_observation'] = terminal[i]
+                infos[i]['equity'] = float(equity_after[i])
+            self._reset_envs(finished)
+        return self._observe(), rewards.astype(np.float32), dones, infos
+
+
+class TradingEnv(gym.Env):
+    """
+    Gymnasium wrapper around a single `VecTradingEnv`, a drop-in for FinRL's StockTradingEnv in
+    stable-baselines3 training loops. Accepts the same arguments as `VecTradingEnv.from_dataset`.
+    """
+    metadata = {'render_modes': []}
+
+    def __init__(self, dataset: pd.DataFrame = None, features: np.ndarray = None, prices: np.ndarray = None, **kwargs):
+        kwargs.update(n_envs=1, autoreset=False)
+        if dataset is not None:
+            self.env = VecTradingEnv.from_dataset(dataset, **kwargs)
+        else:
+            self.env = VecTradingEnv(features, prices, **kwargs)
+        self.observation_space = spaces.Box(-np.inf, np.inf, shape=(self.env.observation_dim,), dtype=np.float32)
+        self.action_space = spaces.Discrete(3)
+
+    def reset(self, *, seed: int = None, options: dict = None):
+        super().reset(seed=seed)
+        return self.env.reset(seed)[0], {}
+
+    def step(self, action):
+        obs, rewards, dones, _ = self.env.step(np.array([action]))
+        info = {'equity': float(self.env.cash[0] + self.env.position[0] * self.env.prices[self.env.t[0]])}
+        return obs[0], float(rewards[0]), bool(dones[0]), False, info
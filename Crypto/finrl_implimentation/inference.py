@@ -0,0 +1,324 @@
+import inspect
+import json
+import socket
+import threading
+from abc import ABC, abstractmethod
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import numpy as np
+
+from instrumentation.recorder import result_rows, timed
+
+try:
+    import onnxruntime
+except ImportError:  # onnxruntime is optional; NumpyPolicy needs nothing beyond NumPy
+    onnxruntime = None
+
+
+_ACTIVATIONS = {
+    'tanh': np.tanh,
+    'relu': lambda x: np.maximum(x, 0.0),
+    'identity': lambda x: x,
+}
+
+
+def _torch_policy(model, algo: str):
+    """Return the SB3 policy of `model`, loading it from a saved .zip with the `algo` class if given a path."""
+    if isinstance(model, (str, Path)):
+        import stable_baselines3
+        model = getattr(stable_baselines3, algo.upper()).load(model, device='cpu')
+    return model.policy
+
+
+def _linear_stack(module) -> tuple:
+    """Weights, biases and activation name of an nn.Sequential of Linear layers with one activation type."""
+    weights, biases, activation = [], [], 'identity'
+    for layer in module:
+        name = type(layer).__name__.lower()
+        if name == 'linear':
+            weights.append(layer.weight.detach().cpu().numpy())
+            biases.append(layer.bias.detach().cpu().numpy())
+        elif name in _ACTIVATIONS:
+            activation = name
+        else:
+            raise ValueError(f"Unsupported layer {type(layer).__name__} in the policy network")
+    return weights, biases, activation
+
+
+def export_policy(model, path, algo: str = 'a2c', vec_normalize=None):
+    """
+    Export the deterministic action path of a trained stable-baselines3 MLP policy to an .npz file.
+
+    This is the only step that needs torch and stable-baselines3; `NumpyPolicy.load` serves the file
+    with NumPy alone. The policy network (`mlp_extractor.policy_net`) and the action head are saved
+    as plain weight matrices, with the action space and, if the model was trained behind
+    `VecNormalize`, its observation statistics.
+
+    Args:
+        model: Trained model (A2C, PPO, ...) or the path of its saved .zip.
+        path: Output .npz path.
+        algo (str): SB3 class used to load `model` from a path. Defaults to 'a2c'.
+        vec_normalize (VecNormalize, optional): Normalization wrapper the model was trained with.
+    """
+    policy = _torch_policy(model, algo)
+    if type(policy.features_extractor).__name__ != 'FlattenExtractor':
+        raise ValueError(f"Only flat Box observations are supported, got {type(policy.features_extractor).__name__}")
+    weights, biases, activation = _linear_stack(policy.mlp_extractor.policy_net)
+    weights.append(policy.action_net.weight.detach().cpu().numpy())
+    biases.append(policy.action_net.bias.detach().cpu().numpy())
+
+    space = policy.action_space
+    arrays = {f'weight_{i}': w for i, w in enumerate(weights)}
+    arrays.update({f'bias_{i}': b for i, b in enumerate(biases)})
+    if type(space).__name__ == 'Discrete':
+        arrays.update(action_space='discrete')
+    else:
+        arrays.update(action_space='box', low=space.low, high=space.high)
+    if vec_normalize is not None and vec_normalize.norm_obs:
+        arrays.update(obs_mean=vec_normalize.obs_rms.mean, obs_var=vec_normalize.obs_rms.var,
+                      clip_obs=vec_normalize.clip_obs, epsilon=vec_normalize.epsilon)
+    np.savez(path, activation=activation, **arrays)
+
+
+def export_onnx(model, path, algo: str = 'a2c', vec_normalize=None, opset: int = 17):
+    """
+    Export the same deterministic path as `export_policy` (observations -> logits or action mean) to ONNX.
+
+    Observation normalization is folded into the graph and the action space is stored in the model
+    metadata, so `OnnxPolicy` needs only the file. The batch dimension is dynamic, so one session call
+    scores every symbol of a bar. Needs torch and onnx.
+    """
+    import onnx
+    import torch
+
+    policy = _torch_policy(model, algo)
+    if vec_normalize is not None and vec_normalize.norm_obs:
+        rms = vec_normalize.obs_rms
+        mean = torch.as_tensor(rms.mean, dtype=torch.float32)
+        std = torch.as_tensor(np.sqrt(rms.var + vec_normalize.epsilon), dtype=torch.float32)
+        clip_obs = float(vec_normalize.clip_obs)
+    else:
+        mean, std, clip_obs = None, None, None
+
+    class ActionHead(torch.nn.Module):
+        def __init__(self):
+            super().__init__()
+            self.policy_net = policy.mlp_extractor.policy_net
+            self.action_net = policy.action_net
+
+        def forward(self, obs):
+            if mean is not None:
+                obs = torch.clamp((obs - mean) / std, -clip_obs, clip_obs)
+            return self.action_net(self.policy_net(obs))
+
+    dummy = torch.zeros((1,) + policy.observation_space.shape, dtype=torch.float32)
+    # torch >= 2.9 defaults to the dynamo exporter, which needs onnxscript; the TorchScript one handles this graph
+    legacy = {'dynamo': False} if 'dynamo' in inspect.signature(torch.onnx.export).parameters else {}
+    torch.onnx.export(ActionHead().eval(), dummy, str(path), input_names=['obs'], output_names=['output'],
+                      dynamic_axes={'obs': {0: 'batch'}, 'output': {0: 'batch'}}, opset_version=opset, **legacy)
+
+    space = policy.action_space
+    if type(space).__name__ == 'Discrete':
+        meta = {'action_space': 'discrete'}
+    else:
+        meta = {'action_space': 'box', 'low': json.dumps(space.low.tolist()), 'high': json.dumps(space.high.tolist())}
+    graph = onnx.load(str(path))
+    onnx.helper.set_model_props(graph, meta)
+    onnx.save(graph, str(path))
+
+
+class Policy(ABC):
+    """
+    Deterministic policy served without stable-baselines3.
+
+    `predict` takes a (symbols x observation_dim) batch and returns one action per row: the argmax
+    of the logits for a discrete action space, or the action mean clipped to the bounds for a box,
+    as SB3's `predict(deterministic=True)` does.
+    """
+
+    def __init__(self, action_space: str = 'discrete', low=None, high=None, obs_mean=None, obs_var=None,
+                 clip_obs: float = 10.0, epsilon: float = 1e-8):
+        self.action_space = action_space
+        self.low, self.high = low, high
+        self.obs_mean = None if obs_mean is None else np.asarray(obs_mean, dtype=np.float32)
+        self.obs_std = None if obs_var is None else np.sqrt(np.asarray(obs_var) + epsilon).astype(np.float32)
+        self.clip_obs = clip_obs
+
+    @abstractmethod
+    def forward(self, obs: np.ndarray) -> np.ndarray:
+        """Logits (discrete) or action means (box) for a batch of observations."""
+
+    def _normalize(self, obs) -> np.ndarray:
+        obs = np.asarray(obs, dtype=np.float32)
+        if obs.ndim == 1:
+            obs = obs[None, :]
+        if self.obs_mean is not None:
+            obs = np.clip((obs - self.obs_mean) / self.obs_std, -self.clip_obs, self.clip_obs)
+        return obs
+
+    @timed('inference.predict', rows=result_rows)
+    def predict(self, obs: np.ndarray) -> np.ndarray:
+        output = self.forward(self._normalize(obs))
+        if self.action_space == 'discrete':
+            return output.argmax(axis=1)
+        return np.clip(output, self.low, self.high)
+
+
+class NumpyPolicy(Policy):
+    """
+    MLP forward pass in NumPy: one float32 matrix product and activation per layer for the whole batch.
+
+    Args:
+        weights (list): Layer weight matrices (out x in), the action head last.
+        biases (list): Layer biases.
+        activation (str): Hidden-layer activation, 'tanh' (SB3's default for A2C/PPO), 'relu' or 'identity'.
+        **kwargs: Action space and observation normalization, see `Policy`.
+    """
+
+    def __init__(self, weights: list, biases: list, activation: str = 'tanh', **kwargs):
+        super().__init__(**kwargs)
+        # stored transposed so a batch goes through as obs @ W
+        self.weights = [np.ascontiguousarray(np.asarray(w, dtype=np.float32).T) for w in weights]
+        self.biases = [np.asarray(b, dtype=np.float32) for b in biases]
+        self.activation = _ACTIVATIONS[activation]
+
+    @classmethod
+    def load(cls, path) -> 'NumpyPolicy':
+        """Load a policy written by `export_policy`."""
+        with np.load(path) as data:
+            n_layers = sum(key.startswith('weight_') for key in data.files)
+            kwargs = {key: data[key] for key in ('low', 'high', 'obs_mean', 'obs_var') if key in data.files}
+            kwargs.update({key: data[key].item() for key in ('clip_obs', 'epsilon') if key in data.files})
+            return cls([data[f'weight_{i}'] for i in range(n_layers)], [data[f'bias_{i}'] for i in range(n_layers)],
+                       activation=str(data['activation']), action_space=str(data['action_space']), **kwargs)
+
+    def forward(self, obs):
+        x = obs
+        for w, b in zip(self.weights[:-1], self.biases[:-1]):
+            x = self.activation(x @ w + b)
+        return x @ self.weights[-1] + self.biases[-1]
+
+
+class OnnxPolicy(Policy):
+    """
+    Policy run by an onnxruntime CPU session from a file written by `export_onnx`.
+
+    Args:
+        path: The .onnx file.
+        threads (int): Intra-op threads; 1 keeps small batches latency-bound rather than scheduling-bound. Defaults to 1.
+    """
+
+    def __init__(self, path, threads: int = 1):
+        if onnxruntime is None:
+            raise ImportError("OnnxPolicy requires onnxruntime (pip install onnxruntime)")
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = threads
+        self.session = onnxruntime.InferenceSession(str(path), options, providers=['CPUExecutionProvider'])
+        meta = self.session.get_modelmeta().custom_metadata_map
+        bounds = {key: np.asarray(json.loads(meta[key]), dtype=np.float32) for key in ('low', 'high') if key in meta}
+        super().__init__(action_space=meta.get('action_space', 'discrete'), **bounds)
+
+    def forward(self, obs):
+        return self.session.run(None, {'obs': obs})[0]
+
+
+class PolicyServer:
+    """
+    Local JSON API around a `Policy`, for a live loop running in another process.
+
+    POST /predict with {"observations": {"BTCUSDT": [...], ...}} returns {"actions": {"BTCUSDT": 1, ...}},
+    every symbol of the bar scored in one batched forward pass; GET /health returns {"status": "ok"}.
+    The server listens on a background thread.
+
+    Args:
+        policy (Policy): Policy to serve.
+        host (str): Defaults to '127.0.0.1'.
+        port (int): Defaults to 0 (any free port; see `url`).
+    """
+
+    def __init__(self, policy: Policy, host: str = '127.0.0.1', port: int = 0):
+        self.policy = policy
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # keep-alive, so the caller reuses its connection
+
+            def setup(self):
+                super().setup()
+                # headers and body go out as separate writes; without this Nagle holds the body back ~40 ms
+                self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+            def _reply(self, status: int, payload: dict):
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                if self.path == '/health':
+                    self._reply(200, {'status': 'ok'})
+                else:
+                    self._reply(404, {'error': f'Unknown path {self.path}'})
+
+            def do_POST(self):
+                if self.path != '/predict':
+                    self._reply(404, {'error': f'Unknown path {self.path}'})
+                    return
+                try:
+                    request = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+                    actions = server.predict(request['observations'])
+                except (ValueError, KeyError, TypeError) as e:
+                    self._reply(400, {'error': f'Bad request: {e!r}'})
+                    return
+                self._reply(200, {'actions': actions})
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def predict(self, observations: dict) -> dict:
+        """Score one bar: {symbol: observation} -> {symbol: action}."""
+        symbols = list(observations)
+        if not symbols:
+            return {}
+        actions = self.policy.predict(np.array([observations[s] for s in symbols], dtype=np.float32))
+        return dict(zip(symbols, actions.tolist()))
+
+    def start(self) -> 'PolicyServer':
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def load_policy(path, **kwargs) -> Policy:
+    """Load an exported policy by extension: .npz with NumPy, .onnx with onnxruntime."""
+    path = Path(path)
+    if path.suffix == '.onnx':
+        return OnnxPolicy(path, **kwargs)
+    if path.suffix == '.npz':
+        return NumpyPolicy.load(path)
+    raise ValueError(f"Unknown policy format '{path.suffix}', expected .npz or .onnx")
@@ -0,0 +1,248 @@
+import multiprocessing as mp
+import traceback
+from multiprocessing import shared_memory
+
+import numpy as np
+from gymnasium import spaces
+
+from finrl_implimentation.finrl_implimentation import VecTradingEnv
+from instrumentation.recorder import timed
+
+try:
+    from stable_baselines3.common.vec_env import VecEnv
+except ImportError:  # stable-baselines3 is optional; the interface below matches its VecEnv
+    VecEnv = object
+
+
+_STEP, _RESET, _SEED, _CLOSE, _ACK = b's', b'r', b'd', b'c', b'k'
+
+
+class _RemoteTraceback(Exception):
+    """Traceback of an exception raised in a worker, chained to its re-raised copy in the parent."""
+
+    def __init__(self, tb: str):
+        self.tb = tb
+
+    def __str__(self):
+        return self.tb
+
+
+def _attach(blocks: dict) -> tuple:
+    handles, arrays = [], {}
+    for key, (name, shape, dtype) in blocks.items():
+        shm = shared_memory.SharedMemory(name=name)
+        handles.append(shm)
+        arrays[key] = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+    return handles, arrays
+
+
+def _worker(conn, blocks: dict, env_slice: tuple, shard: tuple, seed: int, env_kwargs: dict):
+    """
+    Rollout worker: steps its `VecTradingEnv` over its shard of the time series.
+
+    Actions are read from and observations, rewards, dones and terminal observations written to the
+    shared buffers in place; the pipe only carries one-byte commands and acknowledgements. Once the
+    environment is built the worker reports ready, or sends the exception that prevented it.
+    """
+    handles, arrays = _attach(blocks)
+    lo, hi = env_slice
+    actions, obs, rewards = arrays['actions'][lo:hi], arrays['obs'][lo:hi], arrays['rewards'][lo:hi]
+    dones, terminal = arrays['dones'][lo:hi], arrays['terminal'][lo:hi]
+    try:
+        try:
+            env = VecTradingEnv(arrays['features'], arrays['prices'], n_envs=hi - lo, start=shard[0], end=shard[1],
+                                seed=seed, **env_kwargs)
+        except Exception as e:
+            tb = traceback.format_exc()
+            try:
+                conn.send((e, tb))
+            except Exception:  # unpicklable exception
+                conn.send((RuntimeError(repr(e)), tb))
+            return
+        conn.send(None)
+        while True:
+            command = conn.recv_bytes()
+            if command == _STEP:
+                step_obs, step_rewards, step_dones, infos = env.step(actions)
+                for i in np.flatnonzero(step_dones):
+                    terminal[i] = infos[i]['terminal_observation']
+                obs[:] = step_obs
+                rewards[:] = step_rewards
+                dones[:] = step_dones
+            elif command == _RESET:
+                obs[:] = env.reset()
+            elif command[:1] == _SEED:
+                env.rng = np.random.default_rng(int.from_bytes(command[1:], 'little', signed=True)
+                                                if len(command) > 1 else None)
+            elif command == _CLOSE:
+                break
+            conn.send_bytes(_ACK)
+    finally:
+        del obs, rewards, dones, terminal, actions, arrays
+        for shm in handles:
+            shm.close()
+
+
+class SharedMemoryVecEnv(VecEnv):
+    """
+    stable-baselines3 compatible VecEnv that collects rollouts on several worker processes.
+
+    The feature array and prices are placed in shared memory once. The usable bars are split into
+    one contiguous shard per worker, and each worker steps `envs_per_worker` environments of a
+    `VecTradingEnv` over its shard. Actions, observations, rewards and dones are exchanged through
+    shared-memory buffers; the pipes only carry one-byte step/reset commands, so nothing is pickled
+    per step.
+
+    Args:
+        features (np.ndarray): (bars x features) array from `build_features`.
+        prices (np.ndarray): Close price per bar.
+        n_workers (int): Worker processes. Defaults to the CPU count.
+        envs_per_worker (int): Environments stepped by each worker. Defaults to 1.
+        seed (int, optional): Base seed; worker i uses seed + i.
+        start_method (str, optional): multiprocessing start method. Defaults to the platform default.
+        **env_kwargs: Passed to `VecTradingEnv` (episode_length, fill_model, initial_cash, ...).
+    """
+
+    def __init__(self, features: np.ndarray, prices: np.ndarray, n_workers: int = None, envs_per_worker: int = 1,
+                 seed: int = None, start_method: str = None, **env_kwargs):
+        n_workers = n_workers or mp.cpu_count()
+        n_envs = n_workers * envs_per_worker
+        features = np.ascontiguousarray(features, dtype=np.float32)
+        observation_dim = features.shape[1] + 4
+
+        valid = np.flatnonzero(np.isfinite(features).all(axis=1))
+        first_valid = int(valid[0]) if len(valid) else 0
+        bounds = np.linspace(first_valid, len(features), n_workers + 1).astype(np.int64)
+
+        self._handles = []
+        self._arrays = {}
+        self._conns, self._processes = [], []
+        self.closed = False
+        try:
+            blocks = {}
+            for key, shape, dtype in (('features', features.shape, np.float32), ('prices', (len(prices),), np.float64),
+                                      ('actions', (n_envs,), np.int64), ('obs', (n_envs, observation_dim), np.float32),
+                                      ('rewards', (n_envs,), np.float32), ('dones', (n_envs,), np.bool_),
+                                      ('terminal', (n_envs, observation_dim), np.float32)):
+                size = max(int(np.prod(shape)) * np.dtype(dtype).itemsize, 1)
+                shm = shared_memory.SharedMemory(create=True, size=size)
+                self._handles.append(shm)
+                self._arrays[key] = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+                blocks[key] = (shm.name, shape, dtype)
+            self._arrays['features'][:] = features
+            self._arrays['prices'][:] = prices
+
+            context = mp.get_context(start_method)
+            for w in range(n_workers):
+                parent, child = context.Pipe()
+                env_slice = (w * envs_per_worker, (w + 1) * envs_per_worker)
+                worker_seed = None if seed is None else seed + w
+                process = context.Process(target=_worker, daemon=True,
+                                          args=(child, blocks, env_slice, (int(bounds[w]), int(bounds[w + 1])),
+                                                worker_seed, env_kwargs))
+                process.start()
+                child.close()
+                self._conns.append(parent)
+                self._processes.append(process)
+            for w, conn in enumerate(self._conns):
+                try:
+                    failure = conn.recv()
+                except EOFError:
+                    raise RuntimeError(f"Rollout worker {w} exited during startup") from None
+                if failure is not None:
+                    error, tb = failure
+                    raise error from _RemoteTraceback(f"\n\nIn rollout worker {w}:\n{tb}")
+
+            observation_space = spaces.Box(-np.inf, np.inf, shape=(observation_dim,), dtype=np.float32)
+            action_space = spaces.Discrete(3)
+            if VecEnv is object:
+                self.num_envs, self.observation_space, self.action_space = n_envs, observation_space, action_space
+            else:
+                super().__init__(n_envs, observation_space, action_space)
+        except BaseException:
+            self.close()  # don't leave shared memory blocks or worker processes behind
+            raise
+
+    def _broadcast(self, command: bytes):
+        for conn in self._conns:
+            conn.send_bytes(command)
+        for conn in self._conns:
+            conn.recv_bytes()
+
+    def reset(self):
+        self._broadcast(_RESET)
+        return self._arrays['obs'].copy()
+
+    def step_async(self, actions):
+        self._arrays['actions'][:] = np.asarray(actions).reshape(self.num_envs)
+        for conn in self._conns:
+            conn.send_bytes(_STEP)
+
+    @timed('env.step_wait', rows=lambda result, self, *args, **kwargs: self.num_envs)
+    def step_wait(self):
+        for conn in self._conns:
+            conn.recv_bytes()
+        dones = self._arrays['dones'].copy()
+        infos = [{} for _ in range(self.num_envs)]
+        for i in np.flatnonzero(dones):
+            infos[i]['terminal_observation'] = self._arrays['terminal'][i].copy()
+        return self._arrays['obs'].copy(), self._arrays['rewards'].copy(), dones, infos
+
+    def step(self, actions):
+        self.step_async(actions)
+        return self.step_wait()
+
+    def close(self):
+        if self.closed:
+            return
+        for conn in self._conns:
+            try:
+                conn.send_bytes(_CLOSE)
+            except OSError:  # the worker is already gone
+                pass
+        for process in self._processes:
+            process.join()
+        for conn in self._conns:
+            conn.close()
+        self._arrays.clear()
+        for shm in self._handles:
+            shm.close()
+            shm.unlink()
+        self.closed = True
+
+    # remaining VecEnv interface: the workers own plain VecTradingEnv shards, not gym.Env wrappers, so
+    # only the attributes SB3 itself asks for are answered; anything else is an AttributeError, as
+    # for a gym.Env lacking it
+
+    _ATTRIBUTES = {'render_mode': None}
+
+    def _indices(self, indices) -> list:
+        if indices is None:
+            return list(range(self.num_envs))
+        if isinstance(indices, int):
+            return [indices]
+        return list(indices)
+
+    def get_attr(self, attr_name, indices=None):
+        if attr_name not in self._ATTRIBUTES:
+            raise AttributeError(f"Worker environments have no attribute '{attr_name}'")
+        return [self._ATTRIBUTES[attr_name]] * len(self._indices(indices))
+
+    def set_attr(self, attr_name, value, indices=None):
+        raise AttributeError(f"Worker environments do not support setting '{attr_name}'")
+
+    def env_method(self, method_name, *method_args, indices=None, **method_kwargs):
+        raise AttributeError(f"Worker environments have no method '{method_name}'")
+
+    def env_is_wrapped(self, wrapper_class, indices=None):
+        return [False] * len(self._indices(indices))
+
+    def seed(self, seed=None):
+        """Reseed the workers' episode start samplers: env i gets seed + i, as SB3 seeds its VecEnvs."""
+        envs_per_worker = self.num_envs // len(self._conns)
+        for w, conn in enumerate(self._conns):
+            payload = b'' if seed is None else int(seed + w * envs_per_worker).to_bytes(8, 'little', signed=True)
+            conn.send_bytes(_SEED + payload)
+        for conn in self._conns:
+            conn.recv_bytes()
+        return [None if seed is None else seed + i for i in range(self.num_envs)]
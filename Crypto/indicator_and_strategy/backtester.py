@@ -0,0 +1,163 @@
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from indicator_and_strategy.metrics import StreamingMetrics
+
+
+@dataclass
+class FillModel:
+    """
+    Execution cost model shared by `Backtester` and the RL trading environment.
+
+    Args:
+        buy_cost_pct (float): Fee on bought notional, as FinRL's `buy_cost_pct`. Defaults to 0.001.
+        sell_cost_pct (float): Fee on sold notional, as FinRL's `sell_cost_pct`. Defaults to 0.001.
+        slippage_bps (float): Adverse price move applied to every fill, in basis points. Defaults to 0.
+        max_participation (float): Largest fraction of a bar's volume one order may fill in that bar;
+                                   the rest stays working into the next bars. Defaults to 1.
+    """
+    buy_cost_pct: float = 0.001
+    sell_cost_pct: float = 0.001
+    slippage_bps: float = 0.0
+    max_participation: float = 1.0
+
+    def fill_price(self, price, side):
+        """Price paid (side > 0) or received (side < 0) after slippage, element-wise over arrays."""
+        return price * (1.0 + np.sign(side) * self.slippage_bps * 1e-4)
+
+    def fee(self, quantity, price):
+        """Fee for filling signed `quantity` at `price`, element-wise over arrays."""
+        notional = np.abs(quantity) * price
+        return np.where(np.asarray(quantity) > 0, notional * self.buy_cost_pct, notional * self.sell_cost_pct)
+
+    def fill(self, quantity: float, price: float) -> tuple:
+        """(fill price, fee) of one fill of nonzero `quantity` at `price`; `fill_price`/`fee` for plain floats."""
+        if quantity > 0:
+            price = price * (1.0 + self.slippage_bps * 1e-4)
+            return price, quantity * price * self.buy_cost_pct
+        price = price * (1.0 - self.slippage_bps * 1e-4)
+        return price, -quantity * price * self.sell_cost_pct
+
+
+@dataclass
+class BacktestResult:
+    """Per-bar state arrays, the fill log and the running metrics of one backtest."""
+    equity: np.ndarray
+    cash: np.ndarray
+    position: np.ndarray
+    fills: pd.DataFrame
+    metrics: StreamingMetrics = field(repr=False)
+
+    @property
+    def total_fees(self) -> float:
+        return float(self.fills['fee'].sum())
+
+
+class Backtester:
+    """
+    Event-driven single-instrument backtester.
+
+    Bars are replayed in order. At each bar the working order (difference between the target and
+    the current position) fills at the bar's open through the `FillModel`, limited to
+    `max_participation` of the bar's volume (nothing fills on a bar whose volume is missing); the
+    book is marked to market at the close, and then the target for the next bar is read. Targets
+    come from a precomputed array, a `Strategy` (its `target_positions`) or a callable agent, so
+    rule-based strategies and trained policies run through the same simulator. All state lives in
+    preallocated NumPy arrays.
+
+    Args:
+        dataset (pd.DataFrame): Candles with 'close' and optionally 'open' (defaults to close), 'volume' and 'date' columns.
+        fill_model (FillModel, optional): Costs and fill limits. Defaults to `FillModel()`.
+        initial_cash (float): Starting cash. Defaults to 100000.
+        position_size (float): Units traded per unit of target (targets of +-1 mean +-position_size units). Defaults to 1.
+    """
+
+    def __init__(self, dataset: pd.DataFrame, fill_model: FillModel = None, initial_cash: float = 100000.0,
+                 position_size: float = 1.0):
+        self.dataset = dataset
+        self.fill_model = fill_model or FillModel()
+        self.initial_cash = initial_cash
+        self.position_size = position_size
+        self.close = dataset['close'].to_numpy(dtype=np.float64)
+        self.open = dataset['open'].to_numpy(dtype=np.float64) if 'open' in dataset.columns else self.close
+        if 'volume' in dataset.columns:
+            volume = dataset['volume'].to_numpy(dtype=np.float64)
+            # a NaN volume would make the participation limit, and from there cash and equity, NaN
+            self.volume = np.where(np.isnan(volume), 0.0, volume)
+        else:
+            self.volume = np.full(len(dataset), np.inf)
+
+    @classmethod
+    def from_cache(cls, cache, source: str, symbol: str, timeframe: str, start=None, end=None, **kwargs):
+        """Replay candles straight from a `CandleCache` partition."""
+        return cls(cache.read(source, symbol, timeframe, start, end), **kwargs)
+
+    def run(self, targets) -> BacktestResult:
+        """
+        Replay the candles against `targets`.
+
+        Args:
+            targets: One of
+                - array-like of target positions decided at each bar's close,
+                - a `Strategy` instance (uses `target_positions()`),
+                - a callable `agent(bar, position, cash) -> target` evaluated at each bar's close.
+
+        Returns:
+            BacktestResult: Equity, cash and position per bar, the fill log and metrics.
+        """
+        agent = None
+        if callable(targets):
+            agent = targets
+        elif hasattr(targets, 'target_positions'):
+            targets = targets.target_positions()
+        if agent is None:
+            targets = np.asarray(targets, dtype=np.float64) * self.position_size
+            if len(targets) != len(self.close):
+                raise ValueError(f"Expected {len(self.close)} targets, got {len(targets)}")
+            targets = targets.tolist()
+
+        n = len(self.close)
+        equity = np.empty(n)
+        cash_out = np.empty(n)
+        position_out = np.empty(n)
+        fill_bar = np.empty(n, dtype=np.int64)
+        fill_quantity = np.empty(n)
+        fill_price = np.empty(n)
+        fill_fee = np.empty(n)
+        n_fills = 0
+
+        fill = self.fill_model.fill
+        participation = self.fill_model.max_participation
+        opens, closes, volumes = self.open.tolist(), self.close.tolist(), self.volume.tolist()
+
+        cash, position, target = float(self.initial_cash), 0.0, 0.0
+        for i in range(n):
+            working = target - position
+            if working != 0.0:
+                limit = participation * volumes[i]
+                quantity = working if abs(working) <= limit else (limit if working > 0 else -limit)
+                if quantity != 0.0:
+                    price, fee = fill(quantity, opens[i])
+                    cash -= quantity * price + fee
+                    position += quantity
+                    fill_bar[n_fills] = i
+                    fill_quantity[n_fills] = quantity
+                    fill_price[n_fills] = price
+                    fill_fee[n_fills] = fee
+                    n_fills += 1
+
+            equity[i] = cash + position * closes[i]
+            cash_out[i] = cash
+            position_out[i] = position
+            target = agent(i, position, cash) * self.position_size if agent is not None else targets[i]
+
+        fills = pd.DataFrame({'bar': fill_bar[:n_fills], 'quantity': fill_quantity[:n_fills],
+                              'price': fill_price[:n_fills], 'fee': fill_fee[:n_fills]})
+        if 'date' in self.dataset.columns:
+            fills.insert(0, 'date', self.dataset['date'].to_numpy()[fills['bar'].to_numpy()])
+
+        metrics = StreamingMetrics()
+        metrics.update_batch(np.diff(equity, prepend=self.initial_cash), position_out)
+        return BacktestResult(equity, cash_out, position_out, fills, metrics)
@@ -1,6 +1,6 @@
 import pandas as pd
 import numpy as np
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import datetime as dt 
 import yfinance as yf
 
@@ -108,6 +108,152 @@ class HQM:
         print(f'An error occurred: {exception}')
 
 
+
+# HQM lookbacks in trading days; the past price is `iloc[-days]` from the screening date, as in HQM
+HQM_PERIODS = {
+    'One Year Return': 252,
+    'Six Month Return': 21 * 6,
+    'Three Month Return': 21 * 3,
+    'One Month Return': 21,
+}
+
+
+def percentile_rank(values: np.ndarray) -> np.ndarray:
+    """
+    Row-wise percentile rank, equal to `DataFrame.rank(axis=1, pct=True)` (average ties, NaN kept).
+
+    Each row is sorted once; tied runs get the mean of their first and last rank, and ranks are
+    divided by the number of non-NaN values in the row.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n_rows, n_cols = values.shape
+    order = np.argsort(values, axis=1, kind='stable')
+    ordered = np.take_along_axis(values, order, axis=1)
+    columns = np.broadcast_to(np.arange(n_cols), (n_rows, n_cols))
+
+    new_run = np.ones((n_rows, n_cols), dtype=bool)
+    new_run[:, 1:] = ordered[:, 1:] != ordered[:, :-1]
+    run_start = np.maximum.accumulate(np.where(new_run, columns, 0), axis=1)
+    run_end = np.empty_like(new_run)
+    run_end[:, :-1] = new_run[:, 1:]
+    run_end[:, -1] = True
+    last = np.minimum.accumulate(np.where(run_end, columns, n_cols)[:, ::-1], axis=1)[:, ::-1]
+
+    counts = np.count_nonzero(~np.isnan(values), axis=1)[:, None]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        ranked = np.where(np.isnan(ordered), np.nan, ((run_start + last) / 2 + 1) / counts)
+    out = np.empty_like(ranked)
+    np.put_along_axis(out, order, ranked, axis=1)
+    return out
+
+
+@dataclass
+class HQMScreener:
+    """
+    Vectorized High Quality Momentum screener over a (dates x tickers) price matrix.
+
+    For a set of screening dates, the lookback returns of every period, their cross-sectional
+    percentiles and the `HQM Score` (mean percentile) are computed for all tickers at once, with the
+    same column names and conventions as `HQM.get_hqm_score`. Missing prices only affect the
+    tickers (and periods) they belong to: a NaN return gets a NaN percentile and the score averages
+    the remaining percentiles.
+
+    Args:
+        prices (pd.DataFrame): Prices indexed by date with one column per ticker.
+        portfolio_value (float): Capital split equally across the selected tickers. Defaults to 100000.
+        periods (dict): Column name -> lookback in rows. Defaults to `HQM_PERIODS`.
+    """
+    prices: pd.DataFrame
+    portfolio_value: float = 100000
+    periods: dict = field(default_factory=lambda: dict(HQM_PERIODS))
+
+    def __post_init__(self):
+        self._values = self.prices.to_numpy(dtype=np.float64)
+
+    def scores(self, rows) -> dict:
+        """
+        Compute returns, percentiles and HQM scores on the given row positions.
+
+        Returns:
+            dict: Column name -> (len(rows) x tickers) array, including 'latest Price' and 'HQM Score'.
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        latest = self._values[rows]
+        out = {'latest Price': latest}
+        percentiles = []
+        for name, days in self.periods.items():
+            past_rows = rows - days + 1
+            past = self._values[np.maximum(past_rows, 0)]
+            with np.errstate(invalid='ignore', divide='ignore'):
+                change = np.where((past_rows >= 0)[:, None], (latest - past) / past * 100, np.nan)
+            out[name] = change
+            out[f'{name} Percentile'] = percentile_rank(change)
+            percentiles.append(out[f'{name} Percentile'])
+        stacked = np.stack(percentiles)
+        counts = np.count_nonzero(~np.isnan(stacked), axis=0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            out['HQM Score'] = np.nansum(stacked, axis=0) / np.where(counts, counts, np.nan)
+        return out
+
+    def screen(self, date=None, top: int = None) -> pd.DataFrame:
+        """
+        Screen one date (the last one by default).
+
+        Args:
+            top (int, optional): Keep only the `top` tickers by HQM Score. Defaults to every scored ticker.
+
+        Returns:
+            pd.DataFrame: One row per ticker with the `HQM.get_hqm_score` columns, sorted by HQM Score.
+        """
+        row = len(self.prices) - 1 if date is None else self.prices.index.get_loc(date)
+        return self.rolling([self.prices.index[row]], top).droplevel('date')
+
+    def rolling(self, rebalance='ME', top: int = None) -> pd.DataFrame:
+        """
+        Re-screen the universe on every rebalance date in one pass.
+
+        Args:
+            rebalance: A pandas offset alias (the last trading date of each period is used, requires a
+                       DatetimeIndex), an integer step in rows, or an explicit list of dates.
+            top (int, optional): Keep only the `top` tickers by HQM Score on each date.
+
+        Returns:
+            pd.DataFrame: Rows indexed by (date, ticker), sorted by HQM Score within each date, with
+                          the price, 'Number of Shares to buy', returns, percentiles and 'HQM Score'.
+        """
+        index = self.prices.index
+        if isinstance(rebalance, str):
+            positions = pd.Series(np.arange(len(index)), index=index)
+            rows = positions.resample(rebalance).last().dropna().to_numpy(dtype=np.int64)
+        elif isinstance(rebalance, (int, np.integer)):
+            rows = np.arange(len(index) - 1, -1, -rebalance)[::-1]
+        else:
+            rows = index.get_indexer(pd.Index(rebalance))
+            if (rows < 0).any():
+                raise KeyError(f"Rebalance dates not in the price index: {list(pd.Index(rebalance)[rows < 0])}")
+
+        scores = self.scores(rows)
+        score = scores['HQM Score']
+        ranking = np.argsort(np.where(np.isnan(score), np.inf, -score), axis=1, kind='stable')
+        selected = np.isfinite(np.take_along_axis(score, ranking, axis=1))
+        if top is not None:
+            selected[:, top:] = False
+        date_idx, rank_idx = np.nonzero(selected)
+        ticker_idx = ranking[date_idx, rank_idx]
+
+        position_size = self.portfolio_value / selected.sum(axis=1)[date_idx]
+        latest = scores['latest Price'][date_idx, ticker_idx]
+        table = pd.DataFrame({'latest Price': latest,
+                              'Number of Shares to buy': (position_size // latest).astype('int64')},
+                             index=pd.MultiIndex.from_arrays([index[rows][date_idx], self.prices.columns[ticker_idx]],
+                                                             names=['date', 'ticker']))
+        for name in self.periods:
+            table[name] = scores[name][date_idx, ticker_idx]
+            table[f'{name} Percentile'] = scores[f'{name} Percentile'][date_idx, ticker_idx]
+        table['HQM Score'] = score[date_idx, ticker_idx]
+        return table
+
+
 if __name__ == '__main__':
 
     # Example usage
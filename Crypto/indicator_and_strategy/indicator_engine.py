@@ -0,0 +1,285 @@
+import numpy as np
+import pandas as pd
+import talib
+from dataclasses import dataclass
+
+from instrumentation.recorder import stage
+
+
+@dataclass(frozen=True)
+class IndicatorSpec:
+    """
+    Declarative description of one indicator to compute.
+
+    Args:
+        name (str): Name of the indicator, matching the `Indicator` property names (e.g. 'rsi', 'bollinger_bands').
+        window (int, optional): Lookback window. Defaults to the engine window.
+    """
+    name: str
+    window: int = None
+
+    @classmethod
+    def parse(cls, spec, default_window: int):
+        """Normalize 'rsi', ('rsi', 14), {'name': 'rsi', 'window': 14} or an IndicatorSpec."""
+        if isinstance(spec, cls):
+            parsed = spec
+        elif isinstance(spec, str):
+            parsed = cls(spec)
+        elif isinstance(spec, dict):
+            parsed = cls(**spec)
+        else:
+            parsed = cls(*spec)
+        if parsed.window is None:
+            parsed = cls(parsed.name, default_window)
+        return parsed
+
+
+class IndicatorEngine:
+    """
+    Computes many indicators in one pass over contiguous float64 arrays.
+
+    The OHLCV columns are extracted from the dataset once. Every intermediate (moving averages,
+    standard deviations, rolling extremes, true range, multi-output talib calls) is memoized by its
+    parameters, so indicators that share one (e.g. 'sma' and the 'bollinger_bands' middle band, or
+    'atr', 'adx' and 'adix' and their true range) compute it once.
+    Results are written straight into a single preallocated column-major feature matrix.
+
+    Args:
+        dataset (pd.DataFrame): Frame with 'open', 'high', 'low', 'close' and 'volume' columns.
+        window (int): Default lookback window. Defaults to 14.
+    """
+
+    def __init__(self, dataset: pd.DataFrame, window: int = 14):
+        self.index = dataset.index
+        self.window = window
+        self.arrays = {column: np.ascontiguousarray(dataset[column].to_numpy(), dtype=np.float64)
+                       for column in ('open', 'high', 'low', 'close', 'volume') if column in dataset.columns}
+        self._cache = {}
+
+    @classmethod
+    def from_arrays(cls, arrays: dict, window: int = 14, index=None):
+        """Build an engine from already extracted OHLCV arrays (no DataFrame needed)."""
+        engine = cls.__new__(cls)
+        engine.arrays = {column: np.ascontiguousarray(values, dtype=np.float64) for column, values in arrays.items()}
+        engine.index = index if index is not None else pd.RangeIndex(len(next(iter(engine.arrays.values()))))
+        engine.window = window
+        engine._cache = {}
+        return engine
+
+    def _shared(self, key, compute):
+        """Memoize an intermediate result by key."""
+        if key not in self._cache:
+            self._cache[key] = compute()
+        return self._cache[key]
+
+    def columns(self, specs) -> list:
+        """Return the output column names for `specs`, in matrix order."""
+        names = []
+        for spec in specs:
+            spec = IndicatorSpec.parse(spec, self.window)
+            outputs = _OUTPUTS.get(spec.name)
+            if outputs is None:
+                raise ValueError(f"Unknown indicator: {spec.name}")
+            prefix = spec.name if spec.name in WINDOWLESS_INDICATORS else f"{spec.name}_{spec.window}"
+            names.extend(prefix if suffix is None else f"{prefix}_{suffix}" for suffix in outputs)
+        return names
+
+    def compute_matrix(self, specs, out: np.ndarray = None) -> np.ndarray:
+        """
+        Compute `specs` into a (rows x features) float64 matrix.
+
+        Args:
+            specs (list): Indicator specs accepted by `IndicatorSpec.parse`.
+            out (np.ndarray, optional): Preallocated matrix to fill. Allocated column-major if not given.
+
+        Returns:
+            np.ndarray: The filled feature matrix, columns ordered as `columns(specs)`.
+        """
+        specs = [IndicatorSpec.parse(spec, self.window) for spec in specs]
+        n_columns = len(self.columns(specs))
+        n_rows = len(self.index)
+        if out is None:
+            out = np.empty((n_rows, n_columns), dtype=np.float64, order='F')
+        elif out.shape != (n_rows, n_columns):
+            raise ValueError(f"Expected an output matrix of shape {(n_rows, n_columns)}, got {out.shape}")
+
+        column = 0
+        for spec in specs:
+            with stage(f'indicator.{spec.name}', n_rows):
+                for values in _INDICATORS[spec.name](self, spec.window):
+                    out[:, column] = values
+                    column += 1
+        return out
+
+    def compute(self, specs) -> pd.DataFrame:
+        """Compute `specs` and wrap the feature matrix in a DataFrame aligned to the dataset index."""
+        matrix = self.compute_matrix(specs)
+        return pd.DataFrame(matrix, index=self.index, columns=self.columns(specs), copy=False)
+
+    # shared intermediates
+
+    def sma(self, window: int) -> np.ndarray:
+        return self._shared(('sma', window), lambda: talib.SMA(self.arrays['close'], window))
+
+    def ema(self, window: int) -> np.ndarray:
+        return self._shared(('ema', window), lambda: talib.EMA(self.arrays['close'], window))
+
+    def stddev(self, window: int) -> np.ndarray:
+        return self._shared(('stddev', window), lambda: talib.STDDEV(self.arrays['close'], window, 1))
+
+    def highest(self, window: int) -> np.ndarray:
+        return self._shared(('highest', window), lambda: talib.MAX(self.arrays['high'], window))
+
+    def lowest(self, window: int) -> np.ndarray:
+        return self._shared(('lowest', window), lambda: talib.MIN(self.arrays['low'], window))
+
+    def shifted_close(self, window: int) -> np.ndarray:
+        def compute():
+            shifted = np.full_like(self.arrays['close'], np.nan)
+            shifted[window:] = self.arrays['close'][:-window]
+            return shifted
+        return self._shared(('shifted_close', window), compute)
+
+    def true_range(self) -> np.ndarray:
+        return self._shared(('true_range',), lambda: talib.TRANGE(self.arrays['high'], self.arrays['low'],
+                                                                   self.arrays['close']))
+
+    def adx(self, window: int) -> np.ndarray:
+        """talib's ADX, built on the shared true range (matches talib.ADX up to rounding)."""
+        def compute():
+            result = np.full_like(self.arrays['close'], np.nan)
+            if len(result) < 2 * window:
+                return result
+            # talib seeds its Wilder sums with the first window - 1 moves; scaling them makes the
+            # mean-seeded average of `_wilder` equal those sums / window from bar `window` on
+            smoothed = []
+            for values in (self.true_range().copy(), *_directional_movement(self.arrays['high'], self.arrays['low'])):
+                values[0] = 0.0
+                values[1:window] *= (window - 1) / window
+                smoothed.append(_wilder(values, window))
+            true_range, plus_di, minus_di = smoothed
+            with np.errstate(divide='ignore', invalid='ignore'):
+                for di in (plus_di, minus_di):
+                    np.divide(di, true_range, out=di)
+                    di *= 100.0
+                di_sum = plus_di + minus_di
+                dx = np.abs(np.subtract(minus_di, plus_di, out=minus_di), out=minus_di)
+                dx /= di_sum
+                dx *= 100.0
+            # talib skips the DX of bars whose true range sum or DI sum is zero (below 1e-8): it counts
+            # as 0 in the first average and leaves the ADX unchanged afterwards
+            kept = ~((true_range < 1e-8 / window) | (di_sum < 1e-8))  # NaN is kept and propagates, as in talib
+            dx, kept = dx[window - 1:], kept[window - 1:]  # dx[1:window + 1] make the first ADX, at bar 2 * window - 1
+            dx[0] = 0.0
+            dx[1:window + 1][~kept[1:window + 1]] = 0.0
+            kept[:window + 1] = True
+            if kept.all():
+                result[window - 1:] = _wilder(dx, window)
+            else:
+                result[window - 1:] = _wilder(dx[kept], window)[np.cumsum(kept) - 1]
+            return result
+        return self._shared(('adx', window), compute)
+
+    def talib_call(self, function: str, *args) -> tuple:
+        """Memoize a (possibly multi-output) talib call on the dataset arrays."""
+        def compute():
+            inputs = [self.arrays[column] for column in _TALIB_INPUTS[function]]
+            result = getattr(talib, function)(*inputs, *args)
+            return result if isinstance(result, tuple) else (result,)
+        return self._shared((function,) + args, compute)
+
+
+def _wilder(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Wilder's moving average of `values` from index 1 on, as talib's ATR smooths the true range: the
+    mean of values[1:window + 1] at index `window`, then (previous * (window - 1) + value) / window.
+    """
+    # talib's true range of (x, 0, 0) is x itself for x >= 0, so its ATR is the Wilder average of x;
+    # index 0 is never averaged but must not be NaN, which talib would skip as leading data
+    if len(values) and values[0] != 0.0:
+        values = values.copy()
+        values[0] = 0.0
+    zeros = np.zeros(len(values))
+    return talib.ATR(values, zeros, zeros, window)
+
+
+def _directional_movement(high: np.ndarray, low: np.ndarray) -> tuple:
+    """(+DM, -DM) of every bar against the previous one, as talib's ADX counts them."""
+    up, down = np.empty_like(high), np.empty_like(low)
+    up[0] = down[0] = 0.0
+    np.subtract(high[1:], high[:-1], out=up[1:])
+    np.subtract(low[:-1], low[1:], out=down[1:])
+    plus, minus = up * (up > down), down * (down > up)  # branch-free: the masks are unpredictable
+    return np.maximum(plus, 0.0, out=plus), np.maximum(minus, 0.0, out=minus)
+
+
+def _adxr(engine, window):
+    # talib's ADXR: the mean of the ADX and the ADX window - 1 bars earlier
+    adx, lag = engine.adx(window), window - 1
+    result = np.full_like(adx, np.nan)
+    if len(adx) > lag:
+        result[lag:] = (adx[lag:] + adx[:len(adx) - lag]) / 2.0
+    return (result,)
+
+
+def _bollinger_bands(engine, window):
+    middle = engine.sma(window)
+    deviation = 2.0 * engine.stddev(window)
+    return middle + deviation, middle, middle - deviation
+
+
+def _williams(engine, window):
+    highest, lowest = engine.highest(window), engine.lowest(window)
+    price_range = highest - lowest
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result = np.where(price_range != 0, (highest - engine.arrays['close']) / price_range * -100.0, 0.0)
+    result[np.isnan(highest)] = np.nan
+    return (result,)
+
+
+def _roc(engine, window):
+    previous = engine.shifted_close(window)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result = np.where(previous != 0, (engine.arrays['close'] / previous - 1.0) * 100.0, 0.0)
+    result[np.isnan(previous)] = np.nan
+    return (result,)
+
+
+_TALIB_INPUTS = {
+    'RSI': ('close',), 'MACD': ('close',), 'CCI': ('high', 'low', 'close'), 'STOCH': ('high', 'low', 'close'),
+    'OBV': ('close', 'volume'), 'DPO': ('close',), 'AROON': ('high', 'low'), 'CMO': ('close',), 'TRIX': ('close',),
+}
+
+# name -> callable(engine, window) returning a tuple of arrays, in the order of _OUTPUTS[name]
+_INDICATORS = {
+    'rsi': lambda engine, window: engine.talib_call('RSI', window),
+    'macd': lambda engine, window: engine.talib_call('MACD'),
+    'ema': lambda engine, window: (engine.ema(window),),
+    'sma': lambda engine, window: (engine.sma(window),),
+    'bollinger_bands': _bollinger_bands,
+    'adx': lambda engine, window: (engine.adx(window),),
+    'cci': lambda engine, window: engine.talib_call('CCI', window),
+    'atr': lambda engine, window: (_wilder(engine.true_range(), window),),
+    'roc': _roc,
+    'stoch': lambda engine, window: engine.talib_call('STOCH'),
+    'williams': _williams,
+    'obv': lambda engine, window: engine.talib_call('OBV'),
+    'momentum': lambda engine, window: (engine.arrays['close'] - engine.shifted_close(window),),
+    'donchian': lambda engine, window: engine.talib_call('DPO', window),
+    'aroon': lambda engine, window: engine.talib_call('AROON', window),
+    'adix': _adxr,
+    'cmo': lambda engine, window: engine.talib_call('CMO', window),
+    'trix': lambda engine, window: engine.talib_call('TRIX', window),
+}
+
+# indicators with fixed periods, named without a window
+WINDOWLESS_INDICATORS = frozenset({'macd', 'stoch', 'obv'})
+
+# name -> output column suffixes (None for single-output indicators)
+_OUTPUTS = {name: (None,) for name in _INDICATORS}
+_OUTPUTS.update({
+    'macd': ('macd', 'signal', 'hist'),
+    'bollinger_bands': ('upper', 'middle', 'lower'),
+    'stoch': ('slowk', 'slowd'),
+    'aroon': ('down', 'up'),
+})
@@ -1,16 +1,32 @@
 import talib
 import pandas as pd
 from dataclasses import dataclass
+from indicator_and_strategy.indicator_engine import IndicatorEngine
+from instrumentation.recorder import attribute_rows, timed
 
 @dataclass
 class Indicator:
     dataset: pd.DataFrame
     window: int = 14
 
+    def compute(self, specs) -> pd.DataFrame:
+        """Compute many indicators in one pass into a single feature matrix.
+
+        Args:
+            specs (list): Indicators to compute, e.g. ['rsi', ('ema', 50), {'name': 'bollinger_bands', 'window': 20}].
+                          Names match the properties of this class; the window defaults to `self.window`.
+
+        Returns:
+            pd.DataFrame: One column per indicator output (e.g. 'rsi_14', 'bollinger_bands_20_upper'),
+                          aligned to the dataset index.
+        """
+        return IndicatorEngine(self.dataset, self.window).compute(specs)
+
     @property
     # adding property decorator to return the values of the function as a property of the class object 
     # we can use it as if it was a normal attribute of the class object
     # (eg: obj.sma = 10)
+    @timed('indicator.rsi', rows=attribute_rows('dataset'))
     def rsi(self):
         """Calculate the Relative Strength Index (RSI) using the talib library."""
         try:
@@ -20,6 +36,7 @@ class Indicator:
             return pd.Series(dtype='float64')
         
     @property
+    @timed('indicator.macd', rows=attribute_rows('dataset'))
     def macd(self):
         """Calculate the Moving Average Convergence Divergence (MACD) using the talib library."""
         try:
@@ -30,6 +47,7 @@ class Indicator:
             return pd.Series(dtype='float64')
 
     @property
+    @timed('indicator.ema', rows=attribute_rows('dataset'))
     def ema(self):
         """Calculate the Exponential Moving Average (EMA) using the talib library."""
         try:
@@ -38,6 +56,7 @@ class Indicator:
             print(f"Error calculating EMA: {e}")
             return pd.Series(dtype='float64')
     @property
+    @timed('indicator.sma', rows=attribute_rows('dataset'))
     def sma(self):
         """Calculate the Simple Moving Average (SMA) using the talib library."""
         try:
@@ -46,6 +65,7 @@ class Indicator:
             print(f"Error calculating SMA: {e}")
             return pd.Series(dtype='float64')
     @property
+    @timed('indicator.bollinger_bands', rows=attribute_rows('dataset'))
     def bollinger_bands(self):
         """Calculate the Bollinger Bands using the talib library.
         
@@ -59,6 +79,7 @@ class Indicator:
             print(f"Error calculating Bollinger Bands: {e}")
             return pd.DataFrame()
     @property
+    @timed('indicator.adx', rows=attribute_rows('dataset'))
     def adx(self):
         """Calculate the Average Directional Index (ADX) using the talib library.
         
@@ -71,6 +92,7 @@ class Indicator:
             print(f"Error calculating ADX: {e}")
             return pd.Series(dtype='float64')
     @property
+    @timed('indicator.cci', rows=attribute_rows('dataset'))
     def cci(self):
         """Calculate the Commodity Channel Index (CCI) using the talib library."""
         try:
@@ -79,6 +101,7 @@ class Indicator:
             print(f"Error calculating CCI: {e}")
             return pd.Series(dtype='float64')
     @property
+    @timed('indicator.atr', rows=attribute_rows('dataset'))
     def atr(self):
         """Calculate the Average True Range (ATR) using the talib library.
         
@@ -92,6 +115,7 @@ class Indicator:
             return pd.Series(dtype='float64')
 
     @property
+    @timed('indicator.roc', rows=attribute_rows('dataset'))
     def roc(self):
         """Calculate the Rate of Change (ROC) using the talib library."""
         try:
@@ -101,6 +125,7 @@ class Indicator:
             return pd.Series(dtype='float64')
 
     @property
+    @timed('indicator.stoch', rows=attribute_rows('dataset'))
     def stoch(self):
         """Calculate the Stochastic Oscillator using the talib library.
         
@@ -115,6 +140,7 @@ class Indicator:
             return pd.DataFrame()
 
     @property
+    @timed('indicator.williams', rows=attribute_rows('dataset'))
     def williams(self):
         """Calculate the Williams %R using the talib library."""
         try:
@@ -124,6 +150,7 @@ class Indicator:
             return pd.Series(dtype='float64')
     
     @property
+    @timed('indicator.obv', rows=attribute_rows('dataset'))
     def obv(self):
         """Calculate the On Balance Volume (OBV) using the talib library."""
         try:
@@ -133,6 +160,7 @@ class Indicator:
             return pd.Series(dtype='float64')
 
     @property
+    @timed('indicator.momentum', rows=attribute_rows('dataset'))
     def momentum(self):
         """Calculate the Momentum using the talib library."""
         try:
@@ -142,6 +170,7 @@ class Indicator:
             return pd.Series(dtype='float64')
 
     @property
+    @timed('indicator.donchian', rows=attribute_rows('dataset'))
     def donchian(self):
         """Calculate the Donchian Channel using the talib library."""
         try:
@@ -151,6 +180,7 @@ class Indicator:
             return pd.Series(dtype='float64')
 
     @property
+    @timed('indicator.aroon', rows=attribute_rows('dataset'))
     def aroon(self):
         """Calculate the Aroon indicator using the talib library."""
         try:
@@ -161,6 +191,7 @@ class Indicator:
             return pd.DataFrame()
 
     @property
+    @timed('indicator.adix', rows=attribute_rows('dataset'))
     def adix(self):
         """Calculate the Average Directional Index Rating (ADXR) using the talib library."""
         try:
@@ -170,6 +201,7 @@ class Indicator:
             return pd.Series(dtype='float64')
 
     @property
+    @timed('indicator.cmo', rows=attribute_rows('dataset'))
     def cmo(self):
         """Calculate the Chande Momentum Oscillator (CMO) using the talib library."""
         try:
@@ -179,6 +211,7 @@ class Indicator:
             return pd.Series(dtype='float64')
 
     @property
+    @timed('indicator.trix', rows=attribute_rows('dataset'))
     def trix(self):
         """Calculate the TRIX indicator using the talib library."""
         try:
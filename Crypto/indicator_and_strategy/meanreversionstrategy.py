@@ -0,0 +1,154 @@
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+
+from indicator_and_strategy.momentumstrategy import Strategy
+from instrumentation.recorder import attribute_rows, timed
+
+
+def zscore_positions(zscore: np.ndarray, entry_z: float = 2.0, exit_z: float = 0.0) -> np.ndarray:
+    """
+    Mean-reversion positions from a z-score, along the last axis (one row per parameter set).
+
+    Go long when the z-score drops below -entry_z and hold until it recovers to -exit_z; go short
+    above entry_z and hold until it falls back to exit_z. Each side is a forward-filled on/off
+    state, so the whole series is scanned without a loop; with exit_z > -entry_z the two states
+    never overlap. NaN z-scores (warm-up) keep the previous state.
+
+    Returns:
+        np.ndarray: +1 long, -1 short, 0 flat, with the shape of `zscore`.
+    """
+    zscore = np.asarray(zscore, dtype=np.float64)
+    entry_z = np.asarray(entry_z, dtype=np.float64)
+    exit_z = np.asarray(exit_z, dtype=np.float64)
+    if entry_z.ndim:
+        entry_z, exit_z = entry_z[:, None], exit_z[:, None]
+
+    def state(on, off):
+        changed = on | off
+        last = np.where(changed, np.arange(zscore.shape[-1]), -1)
+        last = np.maximum.accumulate(last, axis=-1)
+        value = np.take_along_axis(on, np.maximum(last, 0), axis=-1)
+        return value & (last >= 0)
+
+    long = state(zscore < -entry_z, zscore >= -exit_z)
+    short = state(zscore > entry_z, zscore <= exit_z)
+    return long.astype(np.int8) - short.astype(np.int8)
+
+
+def position_kernel(close: np.ndarray, position: np.ndarray):
+    """
+    Backtest a position series taken at each bar's close.
+
+    A trade runs from the bar a non-zero position is entered to the bar it changes, and realizes
+    side * (exit close - entry close). The position taken at bar i earns the close change from bar
+    i to bar i+1, as in `momentum_kernel`.
+
+    Returns:
+        tuple: (indices of bars that realized a trade, realized pnls, per-bar unrealized returns).
+    """
+    held = np.concatenate(([0], position[:-1]))
+    unrlz = np.diff(close, prepend=close[:1]) * held
+    changes = np.flatnonzero(position != held)
+    sides = held[changes]
+    entries = np.concatenate(([0], changes[:-1]))
+    closed = sides != 0
+    pnls = sides[closed] * (close[changes[closed]] - close[entries[closed]])
+    return changes[closed], pnls, unrlz
+
+
+class MeanReversionStrategy(Strategy):
+    """
+    Rolling z-score / Bollinger Band mean reversion.
+
+    The rolling mean and population standard deviation of the close give the z-score and the bands
+    (mean +- entry_z * std) in one pass; the strategy is long below the lower band until the close
+    reverts to `exit_z`, and short above the upper band likewise.
+
+    Args:
+        dataset (pd.DataFrame): Frame with 'date' and 'close' columns.
+        window (int): Rolling window. Defaults to 20.
+        entry_z (float): Z-score (band width in standard deviations) that opens a position. Defaults to 2.
+        exit_z (float): Z-score on the way back to the mean that closes it. Defaults to 0.
+    """
+
+    def __init__(self, dataset: pd.DataFrame, window: int = 20, entry_z: float = 2.0, exit_z: float = 0.0):
+        super().__init__(dataset)
+        self.window = window
+        self.entry_z = entry_z
+        self.exit_z = exit_z
+        self.trades_dates, self.pnls, self.unrlz_dates, self.unrlz_return = self.execute_strategy()
+
+    @classmethod
+    def sweep_inputs(cls, close: np.ndarray, combos: list) -> dict:
+        windows = sorted({combo['window'] for combo in combos})
+        closing_price = pd.Series(close)
+        zscores = np.stack([cls._zscore(closing_price, w)[0].to_numpy() for w in windows])
+        return {'windows': np.array(windows), 'zscores': zscores}
+
+    @classmethod
+    def batch_signals(cls, inputs: dict, combos: list) -> tuple:
+        zscore = inputs['zscores'][np.searchsorted(inputs['windows'], [combo['window'] for combo in combos])]
+        position = zscore_positions(zscore, [combo.get('entry_z', 2.0) for combo in combos],
+                                    [combo.get('exit_z', 0.0) for combo in combos])
+        previous = np.zeros_like(position)
+        previous[:, 1:] = position[:, :-1]
+        # as position_kernel: a change realizes the side held before it
+        return position != previous, position, previous
+
+    @staticmethod
+    def _zscore(closing_price: pd.Series, window: int) -> tuple:
+        rolling = closing_price.rolling(window=window)
+        mean = rolling.mean()
+        std = rolling.std(ddof=0)
+        return (closing_price - mean) / std.where(std > 0), mean, std
+
+    def target_positions(self) -> np.ndarray:
+        return self.positions
+
+    def _calculate_bands(self):
+        self.closing_price = self.dataset.close
+        zscore, mean, std = self._zscore(self.closing_price, self.window)
+        self.dataset['ma'] = mean
+        self.dataset['upper'] = mean + self.entry_z * std
+        self.dataset['lower'] = mean - self.entry_z * std
+        self.dataset['zscore'] = zscore
+
+        return self.dataset
+
+    @timed('strategy.mean_reversion', rows=attribute_rows('dataset'))
+    def execute_strategy(self):
+        self._calculate_bands()
+        close = self.dataset['close'].to_numpy(dtype=np.float64)
+        self.positions = zscore_positions(self.dataset['zscore'].to_numpy(), self.entry_z, self.exit_z)
+        trade_idx, pnls, unrlz = position_kernel(close, self.positions)
+        dates = self.dataset['date'].to_numpy()
+
+        self.trades_dates = dates[trade_idx]
+        self.pnls = pnls
+        self.unrlz_dates = dates
+        self.unrlz_return = unrlz
+
+        self.metrics.reset()
+        self.metrics.update_batch(unrlz, np.concatenate(([0], self.positions[:-1])))
+        self.metrics.record_trades(pnls)
+
+        return self.trades_dates, self.pnls, self.unrlz_dates, self.unrlz_return
+
+    def visualize_strategy(self):
+        plt.figure(figsize=(16,8))
+        plt.title('Unrealized PnL vs Realized PnL')
+        plt.plot(self.unrlz_dates, np.cumsum(self.unrlz_return))
+        plt.plot(self.trades_dates, np.cumsum(self.pnls), '-o')
+        plt.axhline(y=0, color='black', linestyle='--')
+
+        return plt.show()
+
+    def calculate_realized_pnl(self):
+        return np.cumsum(self.pnls)
+
+    def calculate_unrealized_pnl(self):
+        return np.cumsum(self.unrlz_return)
+
+    def calculate_ppt(self):
+        return np.mean(self.pnls)
@@ -0,0 +1,189 @@
+import math
+
+import numpy as np
+
+
+class StreamingMetrics:
+    """
+    Running performance metrics with O(1) memory.
+
+    Per-bar returns and positions update running accumulators (Welford mean/variance, downside
+    square sum, equity peak and drawdown, exposure and turnover counters, the length of the open
+    holding run), and closed trades update win and PnL counters. Nothing is stored per bar, so the
+    same object can score a batch backtest chunk by chunk or a live paper-trading session bar by bar.
+
+    Args:
+        periods_per_year (float): Bars per year used to annualize Sharpe and Sortino. Defaults to 365.
+        target_return (float): Minimum acceptable return per bar for the Sortino ratio. Defaults to 0.
+    """
+
+    def __init__(self, periods_per_year: float = 365, target_return: float = 0.0):
+        self.periods_per_year = periods_per_year
+        self.target_return = target_return
+        self.reset()
+
+    def reset(self):
+        """Clear all accumulators."""
+        self.bars = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._downside_sq = 0.0
+        self._equity = 0.0
+        self._peak = 0.0
+        self.max_drawdown = 0.0
+        self._exposed_bars = 0
+        self._turnover = 0.0
+        self._position = 0.0
+        self._run = 0
+        self._holding_total = 0
+        self._holdings = 0
+        self.trades = 0
+        self.wins = 0
+        self.realized_pnl = 0.0
+
+    def update(self, bar_return: float, position: float = 0.0):
+        """
+        Feed one bar.
+
+        Args:
+            bar_return (float): Return (or PnL) earned over the bar.
+            position (float): Position held over the bar.
+        """
+        self.bars += 1
+        delta = bar_return - self._mean
+        self._mean += delta / self.bars
+        self._m2 += delta * (bar_return - self._mean)
+        shortfall = min(bar_return - self.target_return, 0.0)
+        self._downside_sq += shortfall * shortfall
+
+        self._equity += bar_return
+        self._peak = max(self._peak, self._equity)
+        self.max_drawdown = max(self.max_drawdown, self._peak - self._equity)
+
+        self._exposed_bars += position != 0
+        self._turnover += abs(position - self._position)
+        if position == self._position:
+            self._run += 1
+        else:
+            self._close_run(self._position, self._run)
+            self._position, self._run = position, 1
+
+    def update_batch(self, returns, positions=None):
+        """
+        Feed a chunk of bars at once; equivalent to calling `update` for each bar.
+
+        Args:
+            returns (array-like): Per-bar returns.
+            positions (array-like, optional): Per-bar positions. Defaults to flat.
+        """
+        returns = np.asarray(returns, dtype=np.float64)
+        n = len(returns)
+        if n == 0:
+            return
+        positions = np.zeros(n) if positions is None else np.asarray(positions, dtype=np.float64)
+
+        # Chan et al. parallel merge of the chunk's mean/M2 into the running ones
+        chunk_mean = float(returns.mean())
+        chunk_m2 = float(np.square(returns - chunk_mean).sum())
+        total = self.bars + n
+        delta = chunk_mean - self._mean
+        self._m2 += chunk_m2 + delta * delta * self.bars * n / total
+        self._mean += delta * n / total
+        self.bars = total
+        self._downside_sq += float(np.square(np.minimum(returns - self.target_return, 0.0)).sum())
+
+        equity = self._equity + np.cumsum(returns)
+        peak = np.maximum(self._peak, np.maximum.accumulate(equity))
+        self.max_drawdown = max(self.max_drawdown, float((peak - equity).max()))
+        self._equity, self._peak = float(equity[-1]), float(peak[-1])
+
+        previous = np.concatenate(([self._position], positions[:-1]))
+        self._exposed_bars += int(np.count_nonzero(positions))
+        self._turnover += float(np.abs(positions - previous).sum())
+
+        starts = np.flatnonzero(positions != previous)
+        if len(starts) == 0:
+            self._run += n
+            return
+        self._close_run(self._position, self._run + int(starts[0]))
+        lengths = np.diff(starts)
+        held = positions[starts[:-1]] != 0
+        self._holding_total += int(lengths[held].sum())
+        self._holdings += int(held.sum())
+        self._position, self._run = float(positions[starts[-1]]), int(n - starts[-1])
+
+    def record_trade(self, pnl: float):
+        """Record one closed trade's realized PnL."""
+        self.trades += 1
+        self.wins += pnl > 0
+        self.realized_pnl += pnl
+
+    def record_trades(self, pnls):
+        """Record a batch of closed trades' realized PnLs."""
+        pnls = np.asarray(pnls, dtype=np.float64)
+        self.trades += len(pnls)
+        self.wins += int(np.count_nonzero(pnls > 0))
+        self.realized_pnl += float(pnls.sum())
+
+    def _close_run(self, position: float, length: int):
+        if position != 0 and length > 0:
+            self._holding_total += int(length)
+            self._holdings += 1
+
+    @property
+    def mean_return(self) -> float:
+        return self._mean if self.bars else math.nan
+
+    @property
+    def volatility(self) -> float:
+        """Population standard deviation of the per-bar returns."""
+        return math.sqrt(self._m2 / self.bars) if self.bars else math.nan
+
+    @property
+    def sharpe_ratio(self) -> float:
+        volatility = self.volatility
+        if not volatility:
+            return math.nan
+        return self._mean / volatility * math.sqrt(self.periods_per_year)
+
+    @property
+    def sortino_ratio(self) -> float:
+        if not self.bars or not self._downside_sq:
+            return math.nan
+        downside = math.sqrt(self._downside_sq / self.bars)
+        return (self._mean - self.target_return) / downside * math.sqrt(self.periods_per_year)
+
+    @property
+    def win_rate(self) -> float:
+        return self.wins / self.trades if self.trades else math.nan
+
+    @property
+    def average_holding_time(self) -> float:
+        """Mean length in bars of the holding runs (a run ends when the position changes), including the open one."""
+        holding_total = self._holding_total + (self._run if self._position != 0 else 0)
+        holdings = self._holdings + (self._position != 0 and self._run > 0)
+        return holding_total / holdings if holdings else math.nan
+
+    @property
+    def turnover(self) -> float:
+        """Mean absolute position change per bar."""
+        return self._turnover / self.bars if self.bars else math.nan
+
+    @property
+    def exposure(self) -> float:
+        """Fraction of bars with a non-zero position."""
+        return self._exposed_bars / self.bars if self.bars else math.nan
+
+    def summary(self) -> dict:
+        return {
+            'bars': self.bars,
+            'trades': self.trades,
+            'realized_pnl': self.realized_pnl,
+            'sharpe_ratio': self.sharpe_ratio,
+            'sortino_ratio': self.sortino_ratio,
+            'max_drawdown': self.max_drawdown,
+            'win_rate': self.win_rate,
+            'average_holding_time': self.average_holding_time,
+            'turnover': self.turnover,
+            'exposure': self.exposure,
+        }
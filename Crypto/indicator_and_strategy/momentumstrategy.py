@@ -3,12 +3,16 @@ import pandas as pd, numpy as np
 from dataclasses import dataclass
 from abc import ABC , abstractmethod
 from indicator_and_strategy.indicators import Indicator
+from indicator_and_strategy.metrics import StreamingMetrics
+from instrumentation.recorder import attribute_rows, timed
 import matplotlib.pyplot as plt
 
 
 class Strategy(ABC):
     def __init__(self, dataset: pd.DataFrame):
         self.dataset = dataset
+        # running metrics; subclasses feed them from execute_strategy, live loops via update/record_trade
+        self.metrics = StreamingMetrics()
 
     def calculate_realized_pnl(self):
         pass
@@ -20,13 +24,41 @@ class Strategy(ABC):
         pass
 
     def calculate_holding_time(self):
-        pass
+        return self.metrics.average_holding_time
 
     def calculate_trades(self):
-        pass
+        return self.metrics.trades
 
     def calculate_sharpe_ratio(self):
-        pass
+        return self.metrics.sharpe_ratio
+
+    def target_positions(self) -> np.ndarray:
+        """
+        Position (+1 long, -1 short, 0 flat) the strategy wants after each bar's close.
+        Used by `Backtester` to replay the strategy through a fill model.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not provide target positions")
+
+    @classmethod
+    def sweep_inputs(cls, close: np.ndarray, combos: list) -> dict:
+        """
+        Precompute the arrays shared by every parameter combination of a sweep (e.g. one rolling
+        mean per distinct window). Used by `ParameterSweep`; override together with `batch_signals`.
+        """
+        raise NotImplementedError(f"{cls.__name__} does not support parameter sweeps")
+
+    @classmethod
+    def batch_signals(cls, inputs: dict, combos: list) -> tuple:
+        """
+        Evaluate many parameter combinations at once.
+
+        Returns:
+            tuple: (events, direction, exit_side), all (combinations x bars). `events` marks the bars
+                   where a new position is entered, `direction` holds +1 (long), -1 (short) or 0 (flat)
+                   there, and `exit_side` the sign the trade closed there is realized with (0 for none),
+                   following the strategy's own `execute_strategy` accounting.
+        """
+        raise NotImplementedError(f"{cls.__name__} does not support parameter sweeps")
 
 
     @abstractmethod
@@ -34,6 +66,50 @@ class Strategy(ABC):
         pass
 
 
+def crossover_events(sma: np.ndarray, lma: np.ndarray):
+    """
+    Find moving-average crossovers.
+
+    Like the original per-bar loop, bar 0 compares against the last bar (positional i-1 wraparound).
+
+    Returns:
+        tuple: (indices of crossover bars, direction at each: 1 for sma crossing above lma, -1 for below).
+    """
+    prev_sma, prev_lma = np.roll(sma, 1), np.roll(lma, 1)
+    long_cross = (sma > lma) & (prev_sma <= prev_lma)
+    short_cross = ~long_cross & (sma < lma) & (prev_sma >= prev_lma)
+    events = np.flatnonzero(long_cross | short_cross)
+    return events, np.where(long_cross[events], 1, -1)
+
+
+def momentum_kernel(close: np.ndarray, sma: np.ndarray, lma: np.ndarray):
+    """
+    Vectorized crossover backtest: enter long on an upward cross, short on a downward cross.
+
+    Each crossover closes the previous entry (when its price is truthy, as in the original loop)
+    and opens a new one at the crossing bar's close. The position taken at bar i earns the close
+    change from bar i to bar i+1.
+
+    Returns:
+        tuple: (indices of bars that realized a trade, realized pnls, per-bar unrealized returns,
+                position taken at each bar's close).
+    """
+    n = len(close)
+    events, direction = crossover_events(sma, lma)
+
+    last_event = np.full(n, -1)
+    last_event[events] = np.arange(len(events))
+    last_event = np.maximum.accumulate(last_event)
+    position = np.where(last_event >= 0, direction[np.maximum(last_event, 0)] if len(events) else 0, 0)
+    held = np.concatenate(([0], position[:-1]))
+    unrlz = np.diff(close, prepend=close[:1]) * held
+
+    entries = close[events]
+    realized = entries[:-1] != 0
+    pnls = -direction[1:] * (entries[1:] - entries[:-1])
+    return events[1:][realized], pnls[realized], unrlz, position
+
+
 class MomentumStrategy(Strategy):
     def __init__(self, dataset: pd.DataFrame ,short_window: int = 2, long_window: int = 5):
         super().__init__(dataset)
@@ -41,6 +117,31 @@ class MomentumStrategy(Strategy):
         self.long_window = long_window
         self.trades_dates, self.pnls, self.unrlz_dates, self.unrlz_return = self.execute_strategy()
 
+    @classmethod
+    def sweep_inputs(cls, close: np.ndarray, combos: list) -> dict:
+        windows = sorted({combo[key] for combo in combos for key in ('short_window', 'long_window')})
+        closing_price = pd.Series(close)
+        # same rolling implementation as _calculate_moving_averages, so exact ties cross identically
+        means = np.stack([closing_price.rolling(window=w, min_periods=1).mean().to_numpy() for w in windows])
+        return {'windows': np.array(windows), 'means': means}
+
+    @classmethod
+    def batch_signals(cls, inputs: dict, combos: list) -> tuple:
+        windows, means = inputs['windows'], inputs['means']
+        # for finite floats sma - lma has the sign of the comparison, so one spread matrix replaces sma and lma
+        spread = (means[np.searchsorted(windows, [combo['short_window'] for combo in combos])]
+                  - means[np.searchsorted(windows, [combo['long_window'] for combo in combos])])
+        prev_spread = np.roll(spread, 1, axis=1)
+        long_cross = (spread > 0) & (prev_spread <= 0)
+        short_cross = ~long_cross & (spread < 0) & (prev_spread >= 0)
+        direction = long_cross.astype(np.int8) - short_cross.astype(np.int8)
+        # as momentum_kernel: a crossover realizes the previous entry with the sign opposite to its own
+        # direction, also when two crossovers in a row go the same way
+        return long_cross | short_cross, direction, -direction
+
+    def target_positions(self) -> np.ndarray:
+        return self.positions
+
     def _calculate_moving_averages(self):    
         # calculate sma and lma 
         self.closing_price = self.dataset.close
@@ -49,41 +150,24 @@ class MomentumStrategy(Strategy):
 
         return self.dataset
     
+    @timed('strategy.momentum', rows=attribute_rows('dataset'))
     def execute_strategy(self):
         self._calculate_moving_averages()
-        entry = None
-        self.trades_dates = []
-        self.pnls = []
-        inpos = 0
-        self.unrlz_return = []
-        self.unrlz_dates = []
-
-
-        for i in range(len(self.dataset)):
-            if i == 0: 
-                prv_close = self.dataset['close'][i]
-                unrlz = (self.dataset['close'][i] - prv_close) * inpos
-            else:   
-                unrlz = (self.dataset['close'][i] - self.dataset['close'][i-1]) * inpos
-
-            self.unrlz_return.append(unrlz)
-            self.unrlz_dates.append(self.dataset.date[i])
-
-            if self.dataset['sma'][i] > self.dataset['lma'][i] and self.dataset['sma'][i-1] <= self.dataset['lma'][i-1]:
-                if entry:
-                    pnl = entry - self.dataset['close'][i]
-                    self.pnls.append(pnl)
-                    self.trades_dates.append(self.dataset.date[i])
-                entry = self.dataset['close'][i]
-                inpos = 1
-
-            elif self.dataset['sma'][i] < self.dataset['lma'][i] and self.dataset['sma'][i-1] >= self.dataset['lma'][i-1]:
-                if entry:
-                    pnl = self.dataset['close'][i] - entry
-                    self.pnls.append(pnl)
-                    self.trades_dates.append(self.dataset.date[i])
-                entry = self.dataset['close'][i]
-                inpos = -1
+        close = self.dataset['close'].to_numpy(dtype=np.float64)
+        trade_idx, pnls, unrlz, self.positions = momentum_kernel(close,
+                                                 self.dataset['sma'].to_numpy(dtype=np.float64),
+                                                 self.dataset['lma'].to_numpy(dtype=np.float64))
+        dates = self.dataset['date'].to_numpy()
+
+        # NumPy arrays rather than lists: boxing a year of minute dates into Timestamps costs more than the backtest
+        self.trades_dates = dates[trade_idx]
+        self.pnls = pnls
+        self.unrlz_dates = dates
+        self.unrlz_return = unrlz
+
+        self.metrics.reset()
+        self.metrics.update_batch(unrlz, np.concatenate(([0], self.positions[:-1])))
+        self.metrics.record_trades(pnls)
 
         return self.trades_dates, self.pnls, self.unrlz_dates, self.unrlz_return
 
@@ -0,0 +1,115 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from indicator_and_strategy.indicator_engine import IndicatorEngine
+
+
+OHLCV = ('open', 'high', 'low', 'close', 'volume')
+
+# Per-worker views over the shared input/output blocks, set by _attach.
+_worker = {}
+
+
+def _attach(input_name: str, output_name: str, n_rows: int, n_columns: int, columns: tuple):
+    """Process-pool initializer: map the shared blocks once per worker."""
+    input_shm = shared_memory.SharedMemory(name=input_name)
+    output_shm = shared_memory.SharedMemory(name=output_name)
+    _worker['shm'] = (input_shm, output_shm)
+    _worker['inputs'] = np.ndarray((len(columns), n_rows), dtype=np.float64, buffer=input_shm.buf)
+    _worker['output'] = np.ndarray((n_rows, n_columns), dtype=np.float64, buffer=output_shm.buf, order='F')
+    _worker['columns'] = columns
+
+
+def _compute_groups(groups: list, specs: list, window: int):
+    """Compute `specs` for each (start, stop) ticker slice, writing straight into the shared output."""
+    inputs, output, columns = _worker['inputs'], _worker['output'], _worker['columns']
+    for start, stop in groups:
+        arrays = {column: inputs[i, start:stop] for i, column in enumerate(columns)}
+        IndicatorEngine.from_arrays(arrays, window).compute_matrix(specs, out=output[start:stop])
+    return len(groups)
+
+
+@dataclass
+class MultiAssetIndicator:
+    """
+    Per-ticker indicators over a long-format multi-asset frame.
+
+    Rows are grouped by ticker (and ordered by 'date' within a ticker when that column exists), so
+    no indicator window ever spans two tickers. The OHLCV columns are copied once into a shared
+    memory block, ticker slices are fanned out to a process pool that writes into a shared output
+    matrix, and the result is scattered back to the original row order.
+
+    Args:
+        dataset (pd.DataFrame): Long-format frame with a ticker column and OHLCV columns.
+        window (int): Default lookback window. Defaults to 14.
+        tic_column (str): Name of the ticker column. Defaults to 'tic'.
+        max_workers (int, optional): Worker processes. Defaults to the CPU count; 1 computes in-process.
+    """
+    dataset: pd.DataFrame
+    window: int = 14
+    tic_column: str = 'tic'
+    max_workers: int = None
+
+    def compute(self, specs) -> pd.DataFrame:
+        """
+        Compute `specs` (as accepted by `Indicator.compute`) per ticker.
+
+        Returns:
+            pd.DataFrame: Indicator columns aligned to the rows and index of `dataset`.
+        """
+        codes, _ = pd.factorize(self.dataset[self.tic_column])
+        if 'date' in self.dataset.columns:
+            order = np.lexsort((self.dataset['date'].to_numpy(), codes))
+        else:
+            order = np.argsort(codes, kind='stable')
+        sorted_codes = codes[order]
+        bounds = np.concatenate(([0], np.flatnonzero(np.diff(sorted_codes)) + 1, [len(order)]))
+        groups = list(zip(bounds[:-1].tolist(), bounds[1:].tolist()))
+
+        columns = tuple(column for column in OHLCV if column in self.dataset.columns)
+        n_rows = len(order)
+        output_columns = IndicatorEngine.from_arrays({'close': np.empty(0)}, self.window).columns(specs)
+        n_columns = len(output_columns)
+        max_workers = self.max_workers or os.cpu_count() or 1
+
+        if max_workers == 1 or len(groups) == 1:
+            output = np.empty((n_rows, n_columns), dtype=np.float64, order='F')
+            for start, stop in groups:
+                rows = order[start:stop]
+                arrays = {column: self.dataset[column].to_numpy()[rows] for column in columns}
+                IndicatorEngine.from_arrays(arrays, self.window).compute_matrix(specs, out=output[start:stop])
+            return self._realign(output, order, output_columns)
+
+        input_shm = shared_memory.SharedMemory(create=True, size=max(len(columns) * n_rows * 8, 1))
+        output_shm = shared_memory.SharedMemory(create=True, size=max(n_rows * n_columns * 8, 1))
+        try:
+            inputs = np.ndarray((len(columns), n_rows), dtype=np.float64, buffer=input_shm.buf)
+            for i, column in enumerate(columns):
+                np.take(self.dataset[column].to_numpy(dtype=np.float64), order, out=inputs[i])
+
+            # a few batches per worker so large and small tickers balance out
+            n_batches = min(len(groups), max_workers * 4)
+            batches = [groups[i::n_batches] for i in range(n_batches)]
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=_attach,
+                                     initargs=(input_shm.name, output_shm.name, n_rows, n_columns, columns)) as pool:
+                list(pool.map(_compute_groups, batches, [specs] * n_batches, [self.window] * n_batches))
+
+            output = np.ndarray((n_rows, n_columns), dtype=np.float64, buffer=output_shm.buf, order='F')
+            result = self._realign(output, order, output_columns)
+            del inputs, output
+        finally:
+            input_shm.close()
+            input_shm.unlink()
+            output_shm.close()
+            output_shm.unlink()
+        return result
+
+    def _realign(self, output: np.ndarray, order: np.ndarray, columns: list) -> pd.DataFrame:
+        realigned = np.empty_like(output, order='F')
+        realigned[order] = output
+        return pd.DataFrame(realigned, index=self.dataset.index, columns=columns, copy=False)
@@ -0,0 +1,132 @@
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+
+# MacKinnon (2010) asymptotic critical values of the Engle-Granger test, two series with a constant
+EG_CRITICAL_VALUES = {0.01: -3.89644, 0.05: -3.33613, 0.10: -3.04445}
+
+# Per-worker cross-moment matrices set by _attach.
+_worker = {}
+
+
+def _attach(moments: dict):
+    """Process-pool initializer: receive the shared cross-moment matrices once per worker."""
+    _worker.update(moments)
+
+
+def _scan_rows(rows: tuple) -> np.ndarray:
+    return pair_statistics(_worker, *rows)
+
+
+def cross_moments(prices: np.ndarray) -> dict:
+    """
+    The statistics every pair test is built from, for all series at once.
+
+    With P the column-centered (bars x series) matrix, L = P[:-1] its lagged values and
+    D = P[1:] - P[:-1] its changes, three matrix products give every pair's sums of squares and
+    cross products: full = P'P, lagged = L'L, diff_lag = D'L and diff = D'D.
+    """
+    centered = prices - prices.mean(axis=0)
+    lagged = centered[:-1]
+    diffs = np.diff(centered, axis=0)
+    return {'full': centered.T @ centered, 'lagged': lagged.T @ lagged, 'diff_lag': diffs.T @ lagged,
+            'diff': diffs.T @ diffs, 'n': np.array(len(diffs))}
+
+
+def pair_statistics(moments: dict, row_start: int, row_end: int) -> np.ndarray:
+    """
+    Engle-Granger statistics of the pairs (y, x) with y in [row_start, row_end) and x > y.
+
+    y is regressed on x with a constant (beta = Sxy / Sxx on centered data), and the Dickey-Fuller
+    regression without lags, d(e_t) = gamma * e_(t-1), runs on the residual e = y - beta * x. Its
+    sums are expanded in the cross moments, so no residual series is ever formed.
+
+    Returns:
+        np.ndarray: (pairs x 5) rows of y index, x index, beta, DF t-statistic and half-life in bars.
+    """
+    full, lagged, diff_lag, diff = moments['full'], moments['lagged'], moments['diff_lag'], moments['diff']
+    n = int(moments['n'])
+    n_series = len(full)
+    y, x = np.triu_indices(n_series, k=1)
+    keep = (y >= row_start) & (y < row_end)
+    y, x = y[keep], x[keep]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        beta = full[y, x] / full[x, x]
+        lag_sq = lagged[y, y] - 2 * beta * lagged[y, x] + beta * beta * lagged[x, x]
+        cross = diff_lag[y, y] - beta * (diff_lag[y, x] + diff_lag[x, y]) + beta * beta * diff_lag[x, x]
+        diff_sq = diff[y, y] - 2 * beta * diff[y, x] + beta * beta * diff[x, x]
+        gamma = cross / lag_sq
+        residual_var = np.maximum(diff_sq - gamma * cross, 0.0) / (n - 1)
+        t_stat = gamma / np.sqrt(residual_var / lag_sq)
+        half_life = np.where((gamma < 0) & (gamma > -1), -math.log(2) / np.log1p(gamma), np.inf)
+    return np.column_stack([y, x, beta, t_stat, half_life])
+
+
+@dataclass
+class PairsScanner:
+    """
+    Engle-Granger cointegration and half-life scan over every pair of a universe.
+
+    The cross-moment matrices of all series are computed once with three matrix products, and each
+    pair's hedge ratio, Dickey-Fuller statistic and mean-reversion half-life follow in closed form
+    from them. Blocks of rows of the pair triangle are evaluated on a process pool.
+
+    Args:
+        prices (pd.DataFrame): Prices indexed by date with one column per ticker.
+        lookback (int, optional): Use only the last `lookback` bars. Defaults to the whole frame.
+        log_prices (bool): Test log prices (hedge ratio in returns terms). Defaults to True.
+        max_workers (int, optional): Worker processes. Defaults to the CPU count; 1 evaluates in-process.
+        block_rows (int): Rows of the pair triangle per task. Defaults to 64.
+    """
+    prices: pd.DataFrame
+    lookback: int = None
+    log_prices: bool = True
+    max_workers: int = None
+    block_rows: int = 64
+
+    def scan(self, significance: float = None, max_half_life: float = None) -> pd.DataFrame:
+        """
+        Test every pair.
+
+        Tickers with missing prices in the window are left out, since the moments need a common sample.
+
+        Args:
+            significance (float, optional): Keep pairs whose statistic is below the critical value at this
+                                             level (0.01, 0.05 or 0.10). Defaults to keeping every pair.
+            max_half_life (float, optional): Keep pairs reverting within this many bars.
+
+        Returns:
+            pd.DataFrame: One row per pair with 'y', 'x', 'beta', 'adf_stat' and 'half_life', most
+                          cointegrated (lowest statistic) first.
+        """
+        window = self.prices if self.lookback is None else self.prices.iloc[-self.lookback:]
+        window = window.loc[:, window.notna().all()]
+        values = window.to_numpy(dtype=np.float64)
+        if self.log_prices:
+            values = np.log(values)
+        moments = cross_moments(values)
+
+        n_series = values.shape[1]
+        blocks = [(start, min(start + self.block_rows, n_series)) for start in range(0, n_series, self.block_rows)]
+        max_workers = self.max_workers or os.cpu_count() or 1
+        if max_workers == 1 or len(blocks) == 1:
+            results = [pair_statistics(moments, *block) for block in blocks]
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=_attach, initargs=(moments,)) as pool:
+                results = list(pool.map(_scan_rows, blocks))
+
+        stats = np.concatenate(results) if results else np.empty((0, 5))
+        tickers = window.columns.to_numpy()
+        table = pd.DataFrame({'y': tickers[stats[:, 0].astype(np.int64)], 'x': tickers[stats[:, 1].astype(np.int64)],
+                              'beta': stats[:, 2], 'adf_stat': stats[:, 3], 'half_life': stats[:, 4]})
+        if significance is not None:
+            table = table[table['adf_stat'] < EG_CRITICAL_VALUES[significance]]
+        if max_half_life is not None:
+            table = table[table['half_life'] <= max_half_life]
+        return table.sort_values('adf_stat', na_position='last').reset_index(drop=True)
@@ -0,0 +1,167 @@
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+
+# Per-worker state set by _attach: strategy class, close prices and the shared sweep inputs.
+_worker = {}
+
+
+def _attach(strategy_cls, blocks: dict):
+    """Process-pool initializer: map the shared arrays once per worker."""
+    arrays, handles = {}, []
+    for key, (name, shape, dtype) in blocks.items():
+        shm = shared_memory.SharedMemory(name=name)
+        handles.append(shm)
+        arrays[key] = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+    _worker.update(strategy_cls=strategy_cls, close=arrays.pop('close'), inputs=arrays, handles=handles)
+
+
+def _evaluate(combos: list, periods_per_year: float) -> np.ndarray:
+    events, direction, exit_side = _worker['strategy_cls'].batch_signals(_worker['inputs'], combos)
+    return batch_metrics(_worker['close'], events, direction, exit_side, periods_per_year)
+
+
+def batch_metrics(close: np.ndarray, events: np.ndarray, direction: np.ndarray, exit_side: np.ndarray,
+                  periods_per_year: float) -> np.ndarray:
+    """
+    Score a (combinations x bars) signals matrix as the strategies' `execute_strategy` does.
+
+    Every event opens a new position (+1, -1 or 0 for flat) at the event bar's close and realizes
+    exit_side * (close - previous entry close) when `exit_side` is non-zero there and the previous
+    entry price is non-zero; the position held through a bar earns that bar's close change. Only the
+    sparse event list is touched: a holding segment's return sum and square sum come from prefix
+    sums of the close changes, so no dense position matrix is built.
+
+    Returns:
+        np.ndarray: (combinations x 4) array of total realized PnL, PPT, trade count and Sharpe ratio
+                    of the per-bar unrealized returns.
+    """
+    n_combos, n_bars = events.shape
+    change = np.diff(close, prepend=close[:1])
+    change_sq = np.cumsum(change * change)
+
+    rows, bars = np.nonzero(events)
+    side = direction[rows, bars].astype(np.float64)
+    last_in_row = np.ones(len(rows), dtype=bool)
+    last_in_row[:-1] = rows[:-1] != rows[1:]
+    first_in_row = np.ones(len(rows), dtype=bool)
+    first_in_row[1:] = rows[1:] != rows[:-1]
+
+    # holding segment after each event: bars (event, segment_end], earning side * change
+    segment_end = np.where(last_in_row, n_bars - 1, np.roll(bars, -1))
+    segment_sum = side * (close[segment_end] - close[bars])
+    segment_sq = side * side * (change_sq[segment_end] - change_sq[bars])
+    unrealized_sum = np.bincount(rows, segment_sum, minlength=n_combos)
+    unrealized_sq = np.bincount(rows, segment_sq, minlength=n_combos)
+
+    entry = close[np.roll(bars, 1)]
+    exit_side = exit_side[rows, bars].astype(np.float64)
+    realized = ~first_in_row & (entry != 0) & (exit_side != 0)
+    pnl = np.bincount(rows[realized], exit_side[realized] * (close[bars[realized]] - entry[realized]),
+                      minlength=n_combos)
+    trades = np.bincount(rows[realized], minlength=n_combos)
+
+    mean = unrealized_sum / n_bars
+    std = np.sqrt(np.maximum(unrealized_sq / n_bars - mean * mean, 0.0))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ppt = pnl / trades
+        sharpe = mean / std * np.sqrt(periods_per_year)
+    return np.column_stack([pnl, ppt, trades, sharpe])
+
+
+@dataclass
+class ParameterSweep:
+    """
+    Grid or random search over the parameters of a `Strategy` subclass.
+
+    The strategy's `sweep_inputs` runs once for the whole sweep (e.g. one rolling mean per distinct
+    window), the arrays are placed in shared memory, and chunks of parameter combinations are
+    evaluated as 2-D signal matrices by `batch_signals` on a process pool.
+
+    Args:
+        strategy_cls (type): A `Strategy` subclass implementing `sweep_inputs` and `batch_signals`.
+        dataset (pd.DataFrame): Frame with a 'close' column.
+        max_workers (int, optional): Worker processes. Defaults to the CPU count; 1 evaluates in-process.
+        periods_per_year (float): Bars per year used to annualize the Sharpe ratio. Defaults to 365.
+        max_cells (int): Upper bound on combinations x bars evaluated per chunk, to bound memory. Defaults to 5e6.
+    """
+    strategy_cls: type
+    dataset: pd.DataFrame
+    max_workers: int = None
+    periods_per_year: float = 365
+    max_cells: int = 5_000_000
+
+    def grid(self, where=None, rank_by: str = 'sharpe', **param_values) -> pd.DataFrame:
+        """
+        Evaluate the cartesian product of `param_values`, e.g. grid(short_window=range(2, 52), long_window=range(5, 55)).
+
+        Args:
+            where (callable, optional): Filter on a combination dict, e.g. lambda p: p['short_window'] < p['long_window'].
+            rank_by (str): Result column to sort by, descending. Defaults to 'sharpe'.
+        """
+        names = list(param_values)
+        combos = [dict(zip(names, values)) for values in itertools.product(*param_values.values())]
+        return self.run([combo for combo in combos if where is None or where(combo)], rank_by)
+
+    def random(self, n: int, seed: int = None, where=None, rank_by: str = 'sharpe', **param_ranges) -> pd.DataFrame:
+        """
+        Evaluate `n` distinct combinations drawn uniformly from integer ranges, e.g. random(500, short_window=(2, 50)).
+
+        Ranges are (low, high) inclusive.
+        """
+        rng = np.random.default_rng(seed)
+        names = list(param_ranges)
+        draws = np.column_stack([rng.integers(low, high + 1, size=n * 4) for low, high in param_ranges.values()])
+        combos = [dict(zip(names, map(int, row))) for row in np.unique(draws, axis=0)]
+        combos = [combo for combo in combos if where is None or where(combo)]
+        rng.shuffle(combos)
+        return self.run(combos[:n], rank_by)
+
+    def run(self, combos: list, rank_by: str = 'sharpe') -> pd.DataFrame:
+        """
+        Evaluate explicit parameter combinations.
+
+        Returns:
+            pd.DataFrame: One row per combination with its parameters and 'pnl', 'ppt', 'trades' and
+                          'sharpe', sorted by `rank_by` descending.
+        """
+        close = self.dataset['close'].to_numpy(dtype=np.float64)
+        inputs = self.strategy_cls.sweep_inputs(close, combos)
+        chunk = max(1, self.max_cells // max(len(close), 1))
+        chunks = [combos[i:i + chunk] for i in range(0, len(combos), chunk)]
+        max_workers = self.max_workers or os.cpu_count() or 1
+
+        if max_workers == 1 or len(chunks) == 1:
+            results = [batch_metrics(close, *self.strategy_cls.batch_signals(inputs, c), self.periods_per_year)
+                       for c in chunks]
+        else:
+            results = self._run_pool(close, inputs, chunks, max_workers)
+
+        metrics = np.concatenate(results) if results else np.empty((0, 4))
+        table = pd.DataFrame(combos)
+        table[['pnl', 'ppt', 'trades', 'sharpe']] = metrics
+        table['trades'] = table['trades'].astype('int64')
+        return table.sort_values(rank_by, ascending=False, na_position='last').reset_index(drop=True)
+
+    def _run_pool(self, close: np.ndarray, inputs: dict, chunks: list, max_workers: int) -> list:
+        blocks, handles = {}, []
+        try:
+            for key, array in {'close': close, **inputs}.items():
+                array = np.ascontiguousarray(array)
+                shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+                handles.append(shm)
+                np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[...] = array
+                blocks[key] = (shm.name, array.shape, array.dtype)
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=_attach,
+                                     initargs=(self.strategy_cls, blocks)) as pool:
+                return list(pool.map(_evaluate, chunks, [self.periods_per_year] * len(chunks)))
+        finally:
+            for shm in handles:
+                shm.close()
+                shm.unlink()
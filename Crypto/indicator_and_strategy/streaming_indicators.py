@@ -0,0 +1,450 @@
+import math
+from abc import ABC, abstractmethod
+from collections import deque
+
+
+NAN = float('nan')
+
+
+def _is_zero(value: float) -> bool:
+    """Mirror talib's TA_IS_ZERO tolerance."""
+    return -1e-8 < value < 1e-8
+
+
+class StreamingIndicator(ABC):
+    """
+    Base class for stateful indicators that update in O(1) per bar (O(window) for the ones needing
+    deviations about the window mean: CCI and Bollinger Bands).
+
+    Subclasses keep only the state they need (running sums, previous values, small ring buffers)
+    and return NaN until warmed up. After warm-up the values match the talib batch functions used
+    by `Indicator` bar-for-bar.
+    """
+
+    @abstractmethod
+    def update_bar(self, high: float, low: float, close: float, volume: float):
+        """Feed one bar and return the latest value (a tuple for multi-output indicators)."""
+
+
+class SMA(StreamingIndicator):
+    """Simple Moving Average, as talib.SMA."""
+
+    def __init__(self, window: int = 14):
+        self.window = window
+        self._values = deque()
+        self._total = 0.0
+        self.value = NAN
+
+    def update(self, value: float) -> float:
+        self._values.append(value)
+        self._total += value
+        if len(self._values) > self.window:
+            self._total -= self._values.popleft()
+        if len(self._values) == self.window:
+            self.value = self._total / self.window
+        return self.value
+
+    def update_bar(self, high, low, close, volume):
+        return self.update(close)
+
+
+class EMA(StreamingIndicator):
+    """Exponential Moving Average seeded with the SMA of the first `window` values, as talib.EMA."""
+
+    def __init__(self, window: int = 14):
+        self.window = window
+        self.k = 2.0 / (window + 1)
+        self._count = 0
+        self._total = 0.0
+        self.value = NAN
+
+    def update(self, value: float) -> float:
+        self._count += 1
+        if self._count < self.window:
+            self._total += value
+        elif self._count == self.window:
+            self.value = (self._total + value) / self.window
+        else:
+            self.value = ((value - self.value) * self.k) + self.value
+        return self.value
+
+    def update_bar(self, high, low, close, volume):
+        return self.update(close)
+
+
+class RSI(StreamingIndicator):
+    """Relative Strength Index with Wilder smoothing, as talib.RSI."""
+
+    def __init__(self, window: int = 14):
+        self.window = window
+        self._count = 0
+        self._previous = None
+        self._gain = 0.0
+        self._loss = 0.0
+        self.value = NAN
+
+    def update(self, value: float) -> float:
+        if self._previous is None:
+            self._previous = value
+            return self.value
+        change = value - self._previous
+        self._previous = value
+        self._count += 1
+        gain, loss = (change, 0.0) if change >= 0 else (0.0, -change)
+
+        if self._count < self.window:
+            self._gain += gain
+            self._loss += loss
+            return self.value
+        if self._count == self.window:
+            self._gain = (self._gain + gain) / self.window
+            self._loss = (self._loss + loss) / self.window
+        else:
+            self._gain = (self._gain * (self.window - 1) + gain) / self.window
+            self._loss = (self._loss * (self.window - 1) + loss) / self.window
+
+        total = self._gain + self._loss
+        self.value = 100.0 * (self._gain / total) if not _is_zero(total) else 0.0
+        return self.value
+
+    def update_bar(self, high, low, close, volume):
+        return self.update(close)
+
+
+class MACD(StreamingIndicator):
+    """
+    Moving Average Convergence Divergence, as talib.MACD.
+
+    Like talib, both EMAs are seeded on the bar where the slow EMA has a full window (the fast EMA
+    from the SMA of the last `fast` closes), and the signal line is an EMA of the MACD line.
+    Returns (macd, signal, hist).
+    """
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        if slow < fast:
+            fast, slow = slow, fast
+        self.fast, self.slow = fast, slow
+        self._warmup = deque(maxlen=slow)
+        self._fast_k, self._slow_k = 2.0 / (fast + 1), 2.0 / (slow + 1)
+        self._fast_ema = self._slow_ema = None
+        self._signal = EMA(signal)
+        self.value = (NAN, NAN, NAN)
+
+    def update(self, value: float) -> tuple:
+        if self._slow_ema is None:
+            self._warmup.append(value)
+            if len(self._warmup) < self.slow:
+                return self.value
+            closes = list(self._warmup)
+            self._slow_ema = sum(closes) / self.slow
+            self._fast_ema = sum(closes[-self.fast:]) / self.fast
+            self._warmup = None
+        else:
+            self._fast_ema = ((value - self._fast_ema) * self._fast_k) + self._fast_ema
+            self._slow_ema = ((value - self._slow_ema) * self._slow_k) + self._slow_ema
+
+        macd = self._fast_ema - self._slow_ema
+        signal = self._signal.update(macd)
+        if not math.isnan(signal):
+            self.value = (macd, signal, macd - signal)
+        return self.value
+
+    def update_bar(self, high, low, close, volume):
+        return self.update(close)
+
+
+class BollingerBands(StreamingIndicator):
+    """
+    Bollinger Bands over an SMA and population standard deviation, as talib.BBANDS. Returns (upper, middle, lower).
+
+    The variance is summed from deviations about the mean of the window (O(window), as in CCI):
+    a running sum of squares loses everything to cancellation at prices in the tens of thousands,
+    so flat stretches would get bands where talib has none. Like talib, variances below 1e-8 count as 0.
+    """
+
+    def __init__(self, window: int = 14, nbdev: float = 2.0):
+        self.window = window
+        self.nbdev = nbdev
+        self._values = deque()
+        self._total = 0.0
+        self.value = (NAN, NAN, NAN)
+
+    def update(self, value: float) -> tuple:
+        self._values.append(value)
+        self._total += value
+        if len(self._values) > self.window:
+            self._total -= self._values.popleft()
+        if len(self._values) == self.window:
+            middle = self._total / self.window
+            variance = sum((v - middle) * (v - middle) for v in self._values) / self.window
+            deviation = math.sqrt(variance) * self.nbdev if variance >= 1e-8 else 0.0
+            self.value = (middle + deviation, middle, middle - deviation)
+        return self.value
+
+    def update_bar(self, high, low, close, volume):
+        return self.update(close)
+
+
+def _true_range(high: float, low: float, previous_close: float) -> float:
+    true_range = high - low
+    true_range = max(true_range, abs(high - previous_close))
+    return max(true_range, abs(low - previous_close))
+
+
+class ATR(StreamingIndicator):
+    """Average True Range seeded with the mean of the first `window` true ranges, as talib.ATR."""
+
+    def __init__(self, window: int = 14):
+        self.window = window
+        self._count = 0
+        self._previous_close = None
+        self._total = 0.0
+        self.value = NAN
+
+    def update(self, high: float, low: float, close: float) -> float:
+        if self._previous_close is None:
+            self._previous_close = close
+            return self.value
+        true_range = _true_range(high, low, self._previous_close)
+        self._previous_close = close
+        self._count += 1
+        if self._count < self.window:
+            self._total += true_range
+        elif self._count == self.window:
+            self.value = (self._total + true_range) / self.window
+        else:
+            self.value = (self.value * (self.window - 1) + true_range) / self.window
+        return self.value
+
+    def update_bar(self, high, low, close, volume):
+        return self.update(high, low, close)
+
+
+class ADX(StreamingIndicator):
+    """Average Directional Index, following talib.ADX's Wilder sums and DX averaging."""
+
+    def __init__(self, window: int = 14):
+        self.window = window
+        self._count = 0
+        self._previous = None
+        self._plus_dm = self._minus_dm = self._tr = 0.0
+        self._sum_dx = 0.0
+        self.value = NAN
+
+    def update(self, high: float, low: float, close: float) -> float:
+        if self._previous is None:
+            self._previous = (high, low, close)
+            return self.value
+        previous_high, previous_low, previous_close = self._previous
+        self._previous = (high, low, close)
+        diff_plus = high - previous_high
+        diff_minus = previous_low - low
+        true_range = _true_range(high, low, previous_close)
+        self._count += 1
+        n = self.window
+
+        if self._count >= n:
+            self._minus_dm -= self._minus_dm / n
+            self._plus_dm -= self._plus_dm / n
+        if diff_minus > 0 and diff_plus < diff_minus:
+            self._minus_dm += diff_minus
+        elif diff_plus > 0 and diff_plus > diff_minus:
+            self._plus_dm += diff_plus
+        if self._count < n:
+            self._tr += true_range
+            return self.value
+        self._tr = self._tr - self._tr / n + true_range
+
+        dx = None
+        if not _is_zero(self._tr):
+            minus_di = 100.0 * (self._minus_dm / self._tr)
+            plus_di = 100.0 * (self._plus_dm / self._tr)
+            total = minus_di + plus_di
+            if not _is_zero(total):
+                dx = 100.0 * (abs(minus_di - plus_di) / total)
+
+        if self._count < 2 * n - 1:
+            self._sum_dx += dx if dx is not None else 0.0
+        elif self._count == 2 * n - 1:
+            self.value = (self._sum_dx + (dx if dx is not None else 0.0)) / n
+        elif dx is not None:
+            self.value = ((self.value * (n - 1)) + dx) / n
+        return self.value
+
+    def update_bar(self, high, low, close, volume):
+        return self.update(high, low, close)
+
+
+class CCI(StreamingIndicator):
+    """Commodity Channel Index over the typical price, as talib.CCI (0 when the mean deviation is 0)."""
+
+    def __init__(self, window: int = 14):
+        self.window = window
+        self._values = deque()
+        self._total = 0.0
+        self.value = NAN
+
+    def update(self, high: float, low: float, close: float) -> float:
+        typical = (high + low + close) / 3
+        self._values.append(typical)
+        self._total += typical
+        if len(self._values) > self.window:
+            self._total -= self._values.popleft()
+        if len(self._values) == self.window:
+            mean = self._total / self.window
+            deviation = sum(abs(value - mean) for value in self._values) / self.window
+            self.value = (typical - mean) / (0.015 * deviation) if not _is_zero(deviation) else 0.0
+        return self.value
+
+    def update_bar(self, high, low, close, volume):
+        return self.update(high, low, close)
+
+
+class OBV(StreamingIndicator):
+    """On Balance Volume starting from the first bar's volume, as talib.OBV."""
+
+    def __init__(self):
+        self._previous_close = None
+        self.value = NAN
+
+    def update(self, close: float, volume: float) -> float:
+        if self._previous_close is None:
+            self.value = volume
+        elif close > self._previous_close:
+            self.value += volume
+        elif close < self._previous_close:
+            self.value -= volume
+        self._previous_close = close
+        return self.value
+
+    def update_bar(self, high, low, close, volume):
+        return self.update(close, volume)
+
+
+class _RollingExtreme:
+    """Monotonic deque giving the rolling max (or min) in amortized O(1)."""
+
+    def __init__(self, window: int, maximum: bool):
+        self.window = window
+        self.maximum = maximum
+        self._items = deque()
+        self._index = 0
+
+    def update(self, value: float) -> float:
+        items = self._items
+        if self.maximum:
+            while items and items[-1][1] <= value:
+                items.pop()
+        else:
+            while items and items[-1][1] >= value:
+                items.pop()
+        items.append((self._index, value))
+        if items[0][0] <= self._index - self.window:
+            items.popleft()
+        self._index += 1
+        return items[0][1]
+
+    @property
+    def ready(self) -> bool:
+        return self._index >= self.window
+
+
+class Stoch(StreamingIndicator):
+    """Slow Stochastic Oscillator with SMA smoothing, as talib.STOCH defaults. Returns (slowk, slowd)."""
+
+    def __init__(self, fastk_period: int = 5, slowk_period: int = 3, slowd_period: int = 3):
+        self._highest = _RollingExtreme(fastk_period, maximum=True)
+        self._lowest = _RollingExtreme(fastk_period, maximum=False)
+        self._slowk = SMA(slowk_period)
+        self._slowd = SMA(slowd_period)
+        self.value = (NAN, NAN)
+
+    def update(self, high: float, low: float, close: float) -> tuple:
+        highest = self._highest.update(high)
+        lowest = self._lowest.update(low)
+        if not self._highest.ready:
+            return self.value
+        diff = (highest - lowest) / 100.0
+        fastk = (close - lowest) / diff if diff != 0 else 0.0
+        slowk = self._slowk.update(fastk)
+        if math.isnan(slowk):
+            return self.value
+        slowd = self._slowd.update(slowk)
+        if not math.isnan(slowd):
+            self.value = (slowk, slowd)
+        return self.value
+
+    def update_bar(self, high, low, close, volume):
+        return self.update(high, low, close)
+
+
+class Williams(StreamingIndicator):
+    """Williams %R, as talib.WILLR."""
+
+    def __init__(self, window: int = 14):
+        self._highest = _RollingExtreme(window, maximum=True)
+        self._lowest = _RollingExtreme(window, maximum=False)
+        self.value = NAN
+
+    def update(self, high: float, low: float, close: float) -> float:
+        highest = self._highest.update(high)
+        lowest = self._lowest.update(low)
+        if self._highest.ready:
+            diff = (highest - lowest) * -0.01
+            self.value = (highest - close) / diff if diff != 0 else 0.0
+        return self.value
+
+    def update_bar(self, high, low, close, volume):
+        return self.update(high, low, close)
+
+
+class ROC(StreamingIndicator):
+    """Rate of Change in percent, as talib.ROC."""
+
+    def __init__(self, window: int = 14):
+        self._values = deque(maxlen=window + 1)
+        self.value = NAN
+
+    def update(self, value: float) -> float:
+        self._values.append(value)
+        if len(self._values) == self._values.maxlen:
+            previous = self._values[0]
+            self.value = ((value / previous) - 1.0) * 100.0 if previous != 0 else 0.0
+        return self.value
+
+    def update_bar(self, high, low, close, volume):
+        return self.update(close)
+
+
+class Momentum(StreamingIndicator):
+    """Momentum (close minus the close `window` bars ago), as talib.MOM."""
+
+    def __init__(self, window: int = 14):
+        self._values = deque(maxlen=window + 1)
+        self.value = NAN
+
+    def update(self, value: float) -> float:
+        self._values.append(value)
+        if len(self._values) == self._values.maxlen:
+            self.value = value - self._values[0]
+        return self.value
+
+    def update_bar(self, high, low, close, volume):
+        return self.update(close)
+
+
+STREAMING_INDICATORS = {
+    'sma': SMA,
+    'ema': EMA,
+    'rsi': RSI,
+    'macd': MACD,
+    'bollinger_bands': BollingerBands,
+    'atr': ATR,
+    'adx': ADX,
+    'cci': CCI,
+    'obv': OBV,
+    'stoch': Stoch,
+    'williams': Williams,
+    'roc': ROC,
+    'momentum': Momentum,
+}
@@ -0,0 +1,185 @@
+import json
+import os
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from instrumentation.recorder import Recorder, recorder as default_recorder
+
+try:
+    from stable_baselines3.common.callbacks import BaseCallback
+except ImportError:  # stable-baselines3 is optional; StageLogCallback needs it only when training
+    BaseCallback = object
+
+
+def write_json(path, recorder: Recorder = None, extra: dict = None):
+    """Write a snapshot of the recorder to `path` atomically (a reader never sees a partial file)."""
+    recorder = recorder or default_recorder
+    payload = {'timestamp': time.time(), 'pid': os.getpid(), 'stages': recorder.snapshot(), **(extra or {})}
+    tmp = f'{path}.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(payload, f, indent=2)
+    os.replace(tmp, path)
+
+
+def to_prometheus(recorder: Recorder = None, prefix: str = 'rl') -> str:
+    """Render the recorder in the Prometheus text exposition format, one histogram per stage."""
+    recorder = recorder or default_recorder
+    lines = [f'# TYPE {prefix}_stage_seconds histogram', f'# TYPE {prefix}_stage_rows_total counter',
+             f'# TYPE {prefix}_stage_alloc_bytes_total counter', f'# TYPE {prefix}_stage_peak_bytes gauge']
+    for name, stats in sorted(recorder.stats.items()):
+        label = f'stage="{name}"'
+        filled = [i for i, count in enumerate(stats.buckets) if count]
+        cumulative = 0
+        # buckets below the first non-empty one are all zero and left out
+        for i in range(filled[0] if filled else 0, filled[-1] + 1 if filled else 0):
+            cumulative += stats.buckets[i]
+            lines.append(f'{prefix}_stage_seconds_bucket{{{label},le="{2 ** i * 1e-9:.9g}"}} {cumulative}')
+        lines.append(f'{prefix}_stage_seconds_bucket{{{label},le="+Inf"}} {stats.calls}')
+        lines.append(f'{prefix}_stage_seconds_sum{{{label}}} {stats.total_ns * 1e-9:.9g}')
+        lines.append(f'{prefix}_stage_seconds_count{{{label}}} {stats.calls}')
+        lines.append(f'{prefix}_stage_rows_total{{{label}}} {stats.rows}')
+        lines.append(f'{prefix}_stage_alloc_bytes_total{{{label}}} {stats.alloc_bytes}')
+        lines.append(f'{prefix}_stage_peak_bytes{{{label}}} {stats.peak_bytes}')
+    return '\n'.join(lines) + '\n'
+
+
+class JsonExporter:
+    """
+    Rewrite a JSON metrics file every `interval` seconds from a background thread, and once more on stop.
+
+    Args:
+        path: Metrics file.
+        interval (float): Seconds between writes. Defaults to 10.
+        recorder (Recorder, optional): Defaults to the process-wide recorder.
+    """
+
+    def __init__(self, path, interval: float = 10.0, recorder: Recorder = None):
+        self.path = path
+        self.interval = interval
+        self.recorder = recorder or default_recorder
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            write_json(self.path, self.recorder)
+
+    def start(self) -> 'JsonExporter':
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        write_json(self.path, self.recorder)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class MetricsServer:
+    """
+    Local HTTP endpoint: GET /metrics (Prometheus text) and GET /metrics.json (the recorder snapshot).
+
+    Args:
+        host (str): Defaults to '127.0.0.1'.
+        port (int): Defaults to 0 (any free port; see `url`).
+        recorder (Recorder, optional): Defaults to the process-wide recorder.
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, recorder: Recorder = None):
+        recorder = recorder or default_recorder
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def setup(self):
+                super().setup()
+                self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+            def do_GET(self):
+                if self.path == '/metrics':
+                    body, content_type = to_prometheus(recorder).encode(), 'text/plain; version=0.0.4'
+                elif self.path == '/metrics.json':
+                    body, content_type = json.dumps(recorder.snapshot()).encode(), 'application/json'
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self) -> 'MetricsServer':
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class StageLogCallback(BaseCallback):
+    """
+    stable-baselines3 callback writing each stage's time per rollout next to SB3's own 'time/fps'.
+
+    After every rollout it logs 'stages/<stage>_ms' (time spent in the stage during that rollout)
+    and 'stages/<stage>_share' (fraction of the rollout's wall time), so a drop in fps in
+    progress.csv lines up with the stage that slowed down.
+    """
+
+    def __init__(self, recorder: Recorder = None, verbose: int = 0):
+        if BaseCallback is object:
+            raise ImportError("StageLogCallback requires stable-baselines3")
+        super().__init__(verbose)
+        self.recorder = recorder or default_recorder
+        self._totals = {}
+        self._rollout_start = None
+
+    def _on_rollout_start(self):
+        self._rollout_start = time.perf_counter_ns()
+
+    def _on_step(self) -> bool:
+        return True
+
+    def _on_rollout_end(self):
+        wall = time.perf_counter_ns() - self._rollout_start if self._rollout_start is not None else 0
+        totals = {name: stats.total_ns for name, stats in self.recorder.stats.items()}
+        for name, total in totals.items():
+            spent = total - self._totals.get(name, 0)
+            self.logger.record(f'stages/{name}_ms', spent * 1e-6)
+            if wall:
+                self.logger.record(f'stages/{name}_share', spent / wall)
+        self._totals = totals
+
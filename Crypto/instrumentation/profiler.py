@@ -0,0 +1,108 @@
+import collections
+import sys
+import threading
+import time
+
+from instrumentation.recorder import Recorder, recorder as default_recorder
+
+
+class SamplingProfiler:
+    """
+    Opt-in statistical profiler: a background thread samples every other thread's Python stack.
+
+    Every `interval` seconds each thread's stack is folded into 'module:function;...' and counted,
+    together with the innermost recorder stage the thread was in, so the samples say both which
+    stage the time went to and which functions inside it. Nothing is traced between samples, so
+    the cost is one stack walk per thread per interval, independent of how hot the code is.
+
+    The sampler needs the GIL to look, so samples fall where the running thread lets go of it
+    (bytecode switch points, NumPy releasing it around large operations): stage shares are sound,
+    function shares within a stage are indicative.
+
+    `folded()` gives the flame-graph input format (one 'stack count' line per distinct stack),
+    e.g. for flamegraph.pl or speedscope.
+
+    Args:
+        interval (float): Seconds between samples. Defaults to 0.005.
+        recorder (Recorder, optional): Where the stage stacks are read. Defaults to the process-wide recorder.
+        max_depth (int): Innermost frames kept per sample. Defaults to 64.
+    """
+
+    def __init__(self, interval: float = 0.005, recorder: Recorder = None, max_depth: int = 64):
+        self.interval = interval
+        self.recorder = recorder or default_recorder
+        self.max_depth = max_depth
+        self.stacks = collections.Counter()
+        self.stages = collections.Counter()
+        self.samples = 0
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def _fold(self, frame) -> str:
+        names = []
+        while frame is not None and len(names) < self.max_depth:
+            code = frame.f_code
+            names.append(f"{frame.f_globals.get('__name__', '?')}:{code.co_name}")
+            frame = frame.f_back
+        return ';'.join(reversed(names))
+
+    def sample(self):
+        """Take one sample of every thread but the profiler's own."""
+        own = threading.get_ident()
+        stage_stacks = self.recorder.stacks
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            self.stacks[self._fold(frame)] += 1
+            stage_stack = stage_stacks.get(ident)
+            self.stages[stage_stack[-1] if stage_stack else '<none>'] += 1
+        self.samples += 1
+
+    def _run(self):
+        next_at = time.perf_counter()
+        while not self._stopped.is_set():
+            self.sample()
+            next_at += self.interval
+            delay = next_at - time.perf_counter()
+            if delay > 0:
+                self._stopped.wait(delay)
+            else:
+                next_at = time.perf_counter()  # fell behind; don't burst to catch up
+
+    def start(self) -> 'SamplingProfiler':
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name='SamplingProfiler', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def folded(self) -> str:
+        return ''.join(f'{stack} {count}\n' for stack, count in self.stacks.most_common())
+
+    def write_folded(self, path):
+        with open(path, 'w') as f:
+            f.write(self.folded())
+
+    def top(self, n: int = 20) -> list:
+        """The `n` functions most often on top of a stack, as (function, share of samples)."""
+        leaves = collections.Counter()
+        for stack, count in self.stacks.items():
+            leaves[stack.rsplit(';', 1)[-1]] += count
+        total = sum(leaves.values()) or 1
+        return [(name, count / total) for name, count in leaves.most_common(n)]
+
+    def stage_shares(self) -> dict:
+        """Share of samples per innermost stage ('<none>' outside any stage)."""
+        total = sum(self.stages.values()) or 1
+        return {name: count / total for name, count in self.stages.most_common()}
@@ -0,0 +1,287 @@
+import functools
+import inspect
+import os
+import sys
+import threading
+import time
+import tracemalloc
+
+
+# Histogram buckets are powers of two of the duration in nanoseconds: bucket i holds durations in
+# [2**(i-1), 2**i) ns, so 64 buckets cover everything from 1 ns to centuries with <2x resolution.
+N_BUCKETS = 64
+
+
+class StageStats:
+    """Running statistics of one stage: call count, wall-time histogram, rows and allocations."""
+
+    __slots__ = ('calls', 'total_ns', 'min_ns', 'max_ns', 'buckets', 'rows', 'alloc_bytes', 'peak_bytes')
+
+    def __init__(self):
+        self.calls = 0
+        self.total_ns = 0
+        self.min_ns = sys.maxsize
+        self.max_ns = 0
+        self.buckets = [0] * N_BUCKETS
+        self.rows = 0
+        self.alloc_bytes = 0
+        self.peak_bytes = 0
+
+    def add(self, elapsed_ns: int, rows: int = 0):
+        self.calls += 1
+        self.total_ns += elapsed_ns
+        if elapsed_ns < self.min_ns:
+            self.min_ns = elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+        self.buckets[elapsed_ns.bit_length()] += 1  # perf_counter_ns differences stay below 2**63
+        self.rows += rows
+
+    def merge(self, other: 'StageStats'):
+        self.calls += other.calls
+        self.total_ns += other.total_ns
+        self.min_ns = min(self.min_ns, other.min_ns)
+        self.max_ns = max(self.max_ns, other.max_ns)
+        self.buckets = [a + b for a, b in zip(self.buckets, other.buckets)]
+        self.rows += other.rows
+        self.alloc_bytes += other.alloc_bytes
+        self.peak_bytes = max(self.peak_bytes, other.peak_bytes)
+
+    def quantile(self, q: float) -> float:
+        """Upper bound in seconds of the bucket holding the q-quantile (within 2x of the true value)."""
+        rank, seen = q * self.calls, 0
+        for i, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= rank:
+                return min(2 ** i, self.max_ns) * 1e-9
+        return self.max_ns * 1e-9
+
+    def summary(self) -> dict:
+        total = self.total_ns * 1e-9
+        return {
+            'calls': self.calls,
+            'total_s': total,
+            'mean_s': total / self.calls if self.calls else 0.0,
+            'min_s': (self.min_ns if self.calls else 0) * 1e-9,
+            'max_s': self.max_ns * 1e-9,
+            'p50_s': self.quantile(0.5),
+            'p90_s': self.quantile(0.9),
+            'p99_s': self.quantile(0.99),
+            'rows': self.rows,
+            'rows_per_s': self.rows / total if total > 0 else 0.0,
+            'alloc_bytes': self.alloc_bytes,
+            'peak_bytes': self.peak_bytes,
+            # bucket upper bound in seconds -> count, non-empty buckets only
+            'histogram': {f'{2 ** i * 1e-9:.9g}': count for i, count in enumerate(self.buckets) if count},
+        }
+
+
+class _NullStage:
+    """What `stage` returns while recording is off: entering and leaving it does nothing."""
+
+    rows = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    __slots__ = ('recorder', 'name', 'rows', 'start', 'frame')
+
+    def __init__(self, recorder: 'Recorder', name: str, rows: int):
+        self.recorder = recorder
+        self.name = name
+        self.rows = rows
+
+    def __enter__(self):
+        self.frame = self.recorder._push(self.name)
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter_ns() - self.start
+        self.recorder._pop(self.name, self.frame, elapsed, self.rows)
+        return False
+
+
+class Recorder:
+    """
+    Per-stage wall-time histograms, row throughput and allocation counters.
+
+    Stages are named with dots ('fetch.ccxt', 'env.step', 'env.reward', ...) and recorded with the
+    `stage` context manager or the `timed` decorator. While disabled (the default) both reduce to
+    one attribute check, so the hooks stay in the hot paths permanently.
+
+    With `allocations=True`, `tracemalloc` also runs and each stage records the bytes it left
+    allocated and its peak allocation above its starting point (NumPy and pandas buffers included).
+    This costs far more than timing does and is attributed per thread only approximately, since
+    `tracemalloc` is process-wide.
+
+    Each thread records into its own statistics, merged when read, so recording takes no lock. The
+    stage stack of every thread is kept so the `SamplingProfiler` can attribute samples to stages.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.allocations = False
+        self.stacks = {}
+        self._thread_stats = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._started_tracemalloc = False
+
+    def enable(self, allocations: bool = False):
+        self.allocations = allocations
+        if allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+        self.allocations = False
+
+    def reset(self):
+        with self._lock:
+            for stats in self._thread_stats:
+                stats.clear()
+
+    @property
+    def stats(self) -> dict:
+        """{stage: StageStats} merged over all threads."""
+        merged = {}
+        with self._lock:
+            per_thread = [list(stats.items()) for stats in self._thread_stats]
+        for items in per_thread:
+            for name, stats in items:
+                merged.setdefault(name, StageStats()).merge(stats)
+        return merged
+
+    def stage(self, name: str, rows: int = 0):
+        """Context manager recording one call of `name`; set `.rows` on it if the count is known only inside."""
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name, rows)
+
+    def record(self, name: str, elapsed_ns: int, rows: int = 0):
+        """Add a call timed elsewhere (e.g. from a worker's measurements)."""
+        self._stats(name).add(elapsed_ns, rows)
+
+    def snapshot(self) -> dict:
+        """{stage: summary} of everything recorded so far."""
+        return {name: stats.summary() for name, stats in sorted(self.stats.items())}
+
+    def _stats(self, name: str) -> StageStats:
+        local = getattr(self._local, 'stats', None)
+        if local is None:
+            local = self._local.stats = {}
+            with self._lock:
+                self._thread_stats.append(local)
+        stats = local.get(name)
+        if stats is None:
+            stats = local[name] = StageStats()
+        return stats
+
+    def _stack(self) -> list:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+            self.stacks[threading.get_ident()] = stack
+        return stack
+
+    def _push(self, name: str):
+        stack = self._stack()
+        stack.append(name)
+        if not self.allocations or not tracemalloc.is_tracing():
+            return None
+        current, peak = tracemalloc.get_traced_memory()
+        parent = getattr(self._local, 'frame', None)
+        if parent is not None:
+            parent[1] = max(parent[1], peak)  # the reset below would lose the enclosing stage's peak
+        tracemalloc.reset_peak()
+        frame = self._local.frame = [current, current, parent]  # start, highest peak seen, enclosing frame
+        return frame
+
+    def _pop(self, name: str, frame, elapsed_ns: int, rows: int):
+        self._local.stack.pop()
+        stats = self._stats(name)
+        stats.add(elapsed_ns, rows)
+        if frame is not None and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            peak = max(frame[1], peak)
+            stats.alloc_bytes += max(current - frame[0], 0)
+            stats.peak_bytes = max(stats.peak_bytes, peak - frame[0])
+            if frame[2] is not None:
+                frame[2][1] = max(frame[2][1], peak)
+            self._local.frame = frame[2]
+
+
+recorder = Recorder()
+
+
+def stage(name: str, rows: int = 0):
+    """`Recorder.stage` on the process-wide recorder."""
+    if not recorder.enabled:
+        return _NULL_STAGE
+    return _Stage(recorder, name, rows)
+
+
+def result_rows(result, *args, **kwargs) -> int:
+    """Rows of a stage = length of its result (0 for None), for `timed(rows=...)`."""
+    return 0 if result is None else len(result)
+
+
+def attribute_rows(attribute: str):
+    """Rows of a method's stage = length of `self.<attribute>`, for `timed(rows=...)`."""
+    def rows(result, self, *args, **kwargs):
+        return len(getattr(self, attribute))
+    return rows
+
+
+def timed(name: str, rows=None):
+    """
+    Decorator recording every call of the function as stage `name` on the process-wide recorder.
+
+    Args:
+        name (str): Stage name.
+        rows (callable, optional): `rows(result, *args, **kwargs)` giving the rows the call processed,
+                                   e.g. `result_rows` or `attribute_rows('dataset')`.
+    """
+    def decorate(fn):
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                if not recorder.enabled:
+                    return await fn(*args, **kwargs)
+                # awaited stages interleave on one thread, so only the time is recorded, not the stack
+                start = time.perf_counter_ns()
+                result = await fn(*args, **kwargs)
+                recorder.record(name, time.perf_counter_ns() - start,
+                                rows(result, *args, **kwargs) if rows is not None else 0)
+                return result
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not recorder.enabled:
+                return fn(*args, **kwargs)
+            with _Stage(recorder, name, 0) as current:
+                result = fn(*args, **kwargs)
+                if rows is not None:
+                    current.rows = rows(result, *args, **kwargs)
+            return result
+        return wrapper
+    return decorate
+
+
+if os.environ.get('RL_INSTRUMENT'):
+    recorder.enable(allocations=os.environ['RL_INSTRUMENT'] == 'allocations')
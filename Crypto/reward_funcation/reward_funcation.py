@@ -1,49 +1,218 @@
+from abc import ABC, abstractmethod
+
+import numpy as np
+
 
 class RewaredFunction:
+    """
+    Reward formulas as vectorized NumPy functions.
 
-    def __init__():
-        pass
+    Every argument may be a scalar or an array (one value per env, or per step of an episode), so a
+    whole batch of vector envs or a whole recorded episode is scored in one call.
+    """
 
+    @staticmethod
     def traditional_opportunity_cost(current_balance, initial_balance, max_steps, current_step):
-    """
-    Calculates opportunity cost based on traditional definition.
+        """
+        Calculates opportunity cost based on traditional definition.
 
-    Args:
-        current_balance (float): The current account balance.
-        initial_balance (float): The initial account balance.
-        max_steps (int): The maximum number of steps (e.g., investment period).
-        current_step (int): The current step in the investment period.
+        Args:
+            current_balance (float | np.ndarray): The current account balance.
+            initial_balance (float | np.ndarray): The initial account balance.
+            max_steps (int | np.ndarray): The maximum number of steps (e.g., investment period).
+            current_step (int | np.ndarray): The current step in the investment period.
 
-    Returns:
-        float: The opportunity cost.
-    """
+        Returns:
+            np.ndarray: The opportunity cost (0 where the initial balance is zero).
+        """
+        current_balance, initial_balance = np.asarray(current_balance, dtype=np.float64), np.asarray(initial_balance, dtype=np.float64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # potential return if invested elsewhere
+            potential_return = (max_steps - np.asarray(current_step)) * (current_balance - initial_balance) / initial_balance
+        return np.where(initial_balance == 0, 0.0, potential_return)
 
-    # Check for zero initial balance to avoid division by zero
-    if initial_balance == 0:
-        return 0
+    @staticmethod
+    def custom_opportunity_cost(current_balance, max_steps, current_step):
+        """
+        Calculates opportunity cost based on the custom definition.
 
-    # Calculate the potential return if invested elsewhere
-    potential_return = (max_steps - current_step) * (current_balance - initial_balance) / initial_balance
+        Args:
+            current_balance (float | np.ndarray): The current account balance.
+            max_steps (int | np.ndarray): The maximum number of steps (e.g., investment period).
+            current_step (int | np.ndarray): The current step in the investment period.
 
-    return potential_return
+        Returns:
+            np.ndarray: The opportunity cost (0 at step 0).
+        """
+        current_step = np.asarray(current_step, dtype=np.float64)
+        return np.where(current_step == 0, 0.0, np.asarray(current_balance, dtype=np.float64) * current_step / max_steps)
 
+    @staticmethod
+    def equity_change(equity_before, equity_after, initial_balance):
+        """Change in equity over the step relative to the initial balance."""
+        return (np.asarray(equity_after, dtype=np.float64) - equity_before) / initial_balance
 
+    @staticmethod
+    def drawdown_penalized(equity_before, equity_after, peak, initial_balance, penalty: float = 0.5):
+        """
+        Equity change minus `penalty` times the current drawdown from `peak` (the running equity
+        maximum including `equity_after`).
+        """
+        equity_after = np.asarray(equity_after, dtype=np.float64)
+        drawdown = (peak - equity_after) / peak
+        return (equity_after - equity_before) / initial_balance - penalty * drawdown
 
-    def custom_opportunity_cost(current_balance, max_steps, current_step):
-    """
-    Calculates opportunity cost based on the custom definition.
+    @staticmethod
+    def cost_aware(equity_before, equity_after, fees, initial_balance, cost_multiplier: float = 1.0):
+        """
+        Equity change with the step's fees charged `cost_multiplier` more times, so the agent treats
+        trading as more expensive than the fill model does (fees are already inside the equity change).
+        """
+        equity_after = np.asarray(equity_after, dtype=np.float64)
+        return (equity_after - equity_before - cost_multiplier * np.asarray(fees)) / initial_balance
+
+    @staticmethod
+    def differential_sharpe(returns, mean, mean_sq, eta: float = 0.01):
+        """
+        Moody and Saffell's differential Sharpe ratio for one step.
+
+        Args:
+            returns (np.ndarray): This step's returns.
+            mean (np.ndarray): Exponential moving average of past returns (A).
+            mean_sq (np.ndarray): Exponential moving average of past squared returns (B).
+            eta (float): Adaptation rate of the moving averages. Defaults to 0.01.
 
-    Args:
-        current_balance (float): The current account balance.
-        max_steps (int): The maximum number of steps (e.g., investment period).
-        current_step (int): The current step in the investment period.
+        Returns:
+            tuple: (reward, updated mean, updated mean_sq); the reward is 0 while the variance estimate is 0.
+        """
+        returns = np.asarray(returns, dtype=np.float64)
+        delta_mean = returns - mean
+        delta_mean_sq = returns * returns - mean_sq
+        variance = mean_sq - mean * mean
+        with np.errstate(divide='ignore', invalid='ignore'):
+            reward = (mean_sq * delta_mean - 0.5 * mean * delta_mean_sq) / variance ** 1.5
+        reward = np.where(variance > 0, reward, 0.0)
+        return reward, mean + eta * delta_mean, mean_sq + eta * delta_mean_sq
 
-    Returns:
-        float: The opportunity cost.
+    @staticmethod
+    def differential_sharpe_episode(returns, eta: float = 0.01) -> np.ndarray:
+        """
+        Differential Sharpe ratio of every step of whole episodes.
+
+        Args:
+            returns (np.ndarray): (steps,) or (steps x episodes) returns.
+
+        Returns:
+            np.ndarray: Rewards with the shape of `returns`.
+        """
+        returns = np.asarray(returns, dtype=np.float64)
+        rewards = np.empty_like(returns)
+        mean = np.zeros(returns.shape[1:])
+        mean_sq = np.zeros(returns.shape[1:])
+        for t in range(len(returns)):
+            rewards[t], mean, mean_sq = RewaredFunction.differential_sharpe(returns[t], mean, mean_sq, eta)
+        return rewards
+
+
+class Reward(ABC):
+    """
+    Reward plugged into `VecTradingEnv`, evaluated once per vectorized step for all envs.
+
+    Subclasses keep any per-env state in arrays sized by `bind` and clear it in `reset_envs`.
     """
 
-    # Avoid division by zero
-    if current_step == 0:
-        return 0
+    def bind(self, n_envs: int, initial_balance: float):
+        self.initial_balance = initial_balance
+
+    def reset_envs(self, envs: np.ndarray):
+        pass
+
+    @abstractmethod
+    def __call__(self, equity_before: np.ndarray, equity_after: np.ndarray, fees: np.ndarray,
+                 current_step: np.ndarray, max_steps: int) -> np.ndarray:
+        """Rewards of one vectorized step, one per env."""
+
+
+class EquityChangeReward(Reward):
+    def __call__(self, equity_before, equity_after, fees, current_step, max_steps):
+        return RewaredFunction.equity_change(equity_before, equity_after, self.initial_balance)
+
 
-    return current_balance * current_step / max_steps
\ No newline at end of file
+class TraditionalOpportunityCostReward(Reward):
+    """Traditional opportunity cost of the equity, with balances measured in units of the initial cash."""
+
+    def __call__(self, equity_before, equity_after, fees, current_step, max_steps):
+        return RewaredFunction.traditional_opportunity_cost(equity_after / self.initial_balance, 1.0, max_steps, current_step)
+
+
+class CustomOpportunityCostReward(Reward):
+    """Custom opportunity cost of the equity, with balances measured in units of the initial cash."""
+
+    def __call__(self, equity_before, equity_after, fees, current_step, max_steps):
+        return RewaredFunction.custom_opportunity_cost(equity_after / self.initial_balance, max_steps, current_step)
+
+
+class DrawdownPenalizedReward(Reward):
+    def __init__(self, penalty: float = 0.5):
+        self.penalty = penalty
+
+    def bind(self, n_envs, initial_balance):
+        super().bind(n_envs, initial_balance)
+        self.peak = np.full(n_envs, float(initial_balance))
+
+    def reset_envs(self, envs):
+        self.peak[envs] = self.initial_balance
+
+    def __call__(self, equity_before, equity_after, fees, current_step, max_steps):
+        np.maximum(self.peak, equity_after, out=self.peak)
+        return RewaredFunction.drawdown_penalized(equity_before, equity_after, self.peak, self.initial_balance, self.penalty)
+
+
+class CostAwareReward(Reward):
+    def __init__(self, cost_multiplier: float = 1.0):
+        self.cost_multiplier = cost_multiplier
+
+    def __call__(self, equity_before, equity_after, fees, current_step, max_steps):
+        return RewaredFunction.cost_aware(equity_before, equity_after, fees, self.initial_balance, self.cost_multiplier)
+
+
+class DifferentialSharpeReward(Reward):
+    def __init__(self, eta: float = 0.01):
+        self.eta = eta
+
+    def bind(self, n_envs, initial_balance):
+        super().bind(n_envs, initial_balance)
+        self.mean = np.zeros(n_envs)
+        self.mean_sq = np.zeros(n_envs)
+
+    def reset_envs(self, envs):
+        self.mean[envs] = 0.0
+        self.mean_sq[envs] = 0.0
+
+    def __call__(self, equity_before, equity_after, fees, current_step, max_steps):
+        returns = (equity_after - equity_before) / equity_before
+        reward, self.mean, self.mean_sq = RewaredFunction.differential_sharpe(returns, self.mean, self.mean_sq, self.eta)
+        return reward
+
+
+REWARD_FUNCTIONS = {
+    'equity_change': EquityChangeReward,
+    'traditional_opportunity_cost': TraditionalOpportunityCostReward,
+    'custom_opportunity_cost': CustomOpportunityCostReward,
+    'drawdown_penalized': DrawdownPenalizedReward,
+    'cost_aware': CostAwareReward,
+    'differential_sharpe': DifferentialSharpeReward,
+}
+
+
+def get_reward_function(reward='equity_change', **kwargs) -> Reward:
+    """
+    Resolve a reward by name from `REWARD_FUNCTIONS` (keyword arguments go to its constructor), or
+    return a `Reward` instance unchanged.
+    """
+    if isinstance(reward, Reward):
+        return reward
+    try:
+        return REWARD_FUNCTIONS[reward](**kwargs)
+    except KeyError:
+        raise ValueError(f"Unknown reward '{reward}', expected one of {sorted(REWARD_FUNCTIONS)}") from None
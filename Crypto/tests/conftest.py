@@ -0,0 +1,24 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+CRYPTO_DIR = Path(__file__).resolve().parents[1]
+DATA_DIR = Path(__file__).resolve().parent / 'data'
+
+# the packages import each other as top-level modules (`from data_fetcher...`), as when run from Crypto/
+if str(CRYPTO_DIR) not in sys.path:
+    sys.path.insert(0, str(CRYPTO_DIR))
+
+
+@pytest.fixture
+def write_config(tmp_path, monkeypatch):
+    """Run the test in `tmp_path` (fetchers log to the working directory) and write its config.json."""
+    monkeypatch.chdir(tmp_path)
+
+    def write(config: dict) -> Path:
+        path = tmp_path / 'config.json'
+        path.write_text(json.dumps(config))
+        return path
+    return write
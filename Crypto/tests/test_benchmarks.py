@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.__main__ import main
+from benchmarks.fixtures import MINUTE_MS, RECORDED_FIXTURE
+from benchmarks.runner import load
+from benchmarks.suite import Fixture, _checked
+
+
+def test_recorded_fixture():
+    recorded = np.load(RECORDED_FIXTURE)
+    assert recorded.shape == (10_000, 6)
+    assert (np.diff(recorded[:, 0]) == MINUTE_MS).all()
+    assert (recorded[:, 2] >= recorded[:, [1, 4]].max(axis=1)).all()
+    assert (recorded[:, 3] <= recorded[:, [1, 4]].min(axis=1)).all()
+
+    tiled = Fixture(25_000, 'recorded').ohlcv
+    np.testing.assert_array_equal(tiled[:10_000], recorded)
+    assert (np.diff(tiled[:, 0]) == MINUTE_MS).all()
+    np.testing.assert_array_equal(tiled[1:, 1], tiled[:-1, 4])  # each bar opens at the previous close
+
+
+@pytest.mark.parametrize('result', [None, pd.DataFrame(), pd.Series(dtype=float), []], ids=repr)
+def test_checked_rejects_missing_results(result):
+    with pytest.raises(RuntimeError, match='HQM.get_hqm_score'):
+        _checked(lambda: result, 'HQM.get_hqm_score')()
+
+
+def test_checked_passes_results_through():
+    frame = pd.DataFrame({'score': [1.0]})
+    assert _checked(lambda: frame, 'screen')() is frame
+    assert _checked(lambda: 0.0, 'value')() == 0.0
+
+
+def test_missing_baseline_fails_unless_saving_or_not_comparing(tmp_path):
+    baseline = tmp_path / 'baseline.json'
+    common = ['--sizes', '10k', '--filter', r'indicator\.rsi', '--repeats', '1', '--baseline', str(baseline)]
+    args = common + ['--data', 'recorded']
+
+    assert main(args) == 1
+    assert main(args + ['--no-compare']) == 0
+    assert not baseline.exists()
+
+    assert main(args + ['--save-baseline']) == 0
+    assert list(load(baseline)['results']) == ['indicator.rsi[10k]']
+    assert main(args + ['--time-tolerance', '100', '--memory-tolerance', '100']) == 0
+    assert main(common) == 1  # synthetic data against a recorded baseline
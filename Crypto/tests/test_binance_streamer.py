@@ -0,0 +1,87 @@
+import contextlib
+import json
+
+import numpy as np
+import pytest
+
+from benchmarks.fixtures import MockCcxtExchange
+from conftest import DATA_DIR
+from data_fetcher.datafetcher import BinanceStreamer, CcxtFetcher
+from data_fetcher.replay import ReplayServer, load_messages
+
+MESSAGES = load_messages(DATA_DIR / 'binance_btcusdt_1m.jsonl')
+PAYLOADS = [json.loads(message)['data'] for message in MESSAGES]
+CLOSED = [i for i, payload in enumerate(PAYLOADS) if payload['e'] == 'kline' and payload['k']['x']]
+KLINES = [PAYLOADS[i]['k'] for i in CLOSED]
+
+
+def candle_rows(klines) -> np.ndarray:
+    return np.array([[k['t'], *(float(k[f]) for f in 'ohlcv')] for k in klines])
+
+
+@pytest.fixture
+def streamer(write_config):
+    def make(server):
+        config = {'binance': {'symbols': ['BTC/USDT'], 'timeframe': '1m', 'ws_url': server.url,
+                              'reconnect_delay': 0.01, 'max_reconnect_delay': 0.05}}
+        return BinanceStreamer(write_config(config))
+    return make
+
+
+async def take(iterator, n: int) -> list:
+    items = []
+    async with contextlib.aclosing(iterator):
+        async for item in iterator:
+            items.append(item)
+            if len(items) == n:
+                break
+    return items
+
+
+@pytest.mark.asyncio
+async def test_emits_closed_candles_only(streamer):
+    async with ReplayServer(MESSAGES) as server:
+        candles = await take(streamer(server).stream_candles(), len(KLINES))
+
+    assert server.paths == ['/stream?streams=btcusdt@kline_1m']
+    assert [c['date'].value // 1_000_000 for c in candles] == [k['t'] for k in KLINES]
+    assert all(c['tic'] == 'BTC/USDT' for c in candles)
+    np.testing.assert_array_equal(
+        [[c['open'], c['high'], c['low'], c['close'], c['volume']] for c in candles], candle_rows(KLINES)[:, 1:])
+
+
+@pytest.mark.asyncio
+async def test_streams_trades(streamer):
+    trades = [p for p in PAYLOADS if p['e'] == 'trade']
+    async with ReplayServer(MESSAGES) as server:
+        received = await take(streamer(server).stream_trades(), len(trades))
+
+    assert [t['trade_id'] for t in received] == [t['t'] for t in trades]
+    assert [t['price'] for t in received] == [float(t['p']) for t in trades]
+
+
+@pytest.mark.asyncio
+async def test_reconnects_after_disconnect(streamer):
+    # the server hangs up right after the second closed kline; nothing is lost while away
+    async with ReplayServer(MESSAGES, drops={CLOSED[1]: 0}) as server:
+        candles = await take(streamer(server).stream_candles(), len(KLINES))
+
+    assert server.connections == 2
+    assert [c['date'].value // 1_000_000 for c in candles] == [k['t'] for k in KLINES]
+
+
+@pytest.mark.asyncio
+async def test_backfills_gap_over_rest(streamer):
+    # the outage swallows the third and fourth closed klines, which must come back over REST
+    async with ReplayServer(MESSAGES, drops={CLOSED[1]: CLOSED[3] - CLOSED[1]}) as server:
+        live = streamer(server)
+        rest = CcxtFetcher('binance', live.config_file)
+        rest.exchange = MockCcxtExchange(candle_rows(KLINES))
+        live._backfill_fetcher = rest
+        candles = await take(live.stream_candles(), len(KLINES))
+
+    assert server.connections == 2
+    assert rest.exchange.requests == 1
+    assert [c['date'].value // 1_000_000 for c in candles] == [k['t'] for k in KLINES]
+    np.testing.assert_array_equal(
+        [[c['open'], c['high'], c['low'], c['close'], c['volume']] for c in candles], candle_rows(KLINES)[:, 1:])
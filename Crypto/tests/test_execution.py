@@ -0,0 +1,145 @@
+import contextlib
+
+import pytest
+
+from execution.client import ExecutionClient, OrderRequest
+from execution.mock_exchange import MockExchange
+
+PRICES = {'BTCUSDT': 60000.0, 'ETHUSDT': 3000.0}
+
+
+@contextlib.asynccontextmanager
+async def connected(secret_key: str = 'secret', latency: float = 0.0, **kwargs):
+    async with MockExchange(prices=PRICES, latency=latency) as exchange:
+        async with ExecutionClient('key', secret_key, rest_url=exchange.rest_url, stream_url=exchange.stream_url,
+                                   **kwargs) as client:
+            yield exchange, client
+
+
+@pytest.mark.asyncio
+async def test_lost_response_is_settled_by_query():
+    async with connected() as (exchange, client):
+        exchange.unknown_orders = 1
+        state = await client.place_order(OrderRequest('BTCUSDT', 'BUY', 0.01))
+        assert state.status == 'UNKNOWN' and 'execution status unknown' in state.error
+
+        await client.wait_for([state.request.client_order_id], timeout=5)
+        assert state.status == 'FILLED'
+        assert state.filled == pytest.approx(0.01)
+        assert state.order_id == exchange.orders[state.request.client_order_id]['orderId']
+
+
+@pytest.mark.asyncio
+async def test_timed_out_order_is_settled_by_stream():
+    async with connected(latency=0.3, timeout=0.1) as (exchange, client):
+        await client.start_user_stream()
+        state = await client.place_order(OrderRequest('BTCUSDT', 'BUY', 0.01))
+        assert state.status == 'UNKNOWN'
+
+        await client.wait_for(timeout=5)
+        assert state.status == 'FILLED'
+        assert state.quote_filled == pytest.approx(600.0)
+
+
+@pytest.mark.asyncio
+async def test_lost_order_is_rejected_once_the_request_expired():
+    async with connected(recv_window=300) as (exchange, client):
+        exchange.unknown_orders, exchange.execute_unknown = 1, False
+        state = await client.place_order(OrderRequest('BTCUSDT', 'BUY', 0.01))
+        assert state.status == 'UNKNOWN'
+
+        await client.wait_for(timeout=5)
+        assert state.status == 'REJECTED' and 'not found' in state.error
+        assert exchange.orders == {}
+
+
+@pytest.mark.asyncio
+async def test_place_orders_batch():
+    requests = [OrderRequest('BTCUSDT', 'BUY', 0.01), OrderRequest('ETHUSDT', 'SELL', 0.5),
+                OrderRequest('BTCUSDT', 'BUY', 0.02, type='LIMIT', price=59000.0)]
+    async with connected() as (exchange, client):
+        states = await client.place_orders(requests)
+
+    assert [state.request for state in states] == requests
+    assert [state.status for state in states] == ['FILLED', 'FILLED', 'NEW']
+    assert [state.average_price for state in states[:2]] == pytest.approx([60000.0, 3000.0])
+    assert len({state.request.client_order_id for state in states}) == 3
+    assert exchange.requests == 3
+
+
+@pytest.mark.asyncio
+async def test_wait_for_is_driven_by_execution_reports():
+    async with connected() as (exchange, client):
+        await client.start_user_stream()
+        state = await client.place_order(OrderRequest('BTCUSDT', 'BUY', 0.02, type='LIMIT', price=59000.0))
+        assert state.status == 'NEW' and not state.done
+
+        requests = exchange.requests
+        await exchange.fill(state.request.client_order_id)
+        await client.wait_for([state.request.client_order_id], timeout=5)
+        assert exchange.requests == requests  # no polling
+    assert state.status == 'FILLED'
+    assert state.average_price == pytest.approx(59000.0)
+    assert state.commission == pytest.approx(0.02 * 59000.0 * 0.001)
+
+
+@pytest.mark.asyncio
+async def test_cancel_report_is_matched_by_original_client_order_id():
+    async with connected() as (exchange, client):
+        await client.start_user_stream()
+        state = await client.place_order(OrderRequest('BTCUSDT', 'SELL', 0.02, type='LIMIT', price=61000.0))
+
+        # cancelled from elsewhere (another session on the same account): only the stream tells this client
+        async with ExecutionClient('key', 'secret', rest_url=exchange.rest_url) as other:
+            await other._request('DELETE', '/api/v3/order', signed_query=other.sign(
+                {'symbol': 'BTCUSDT', 'origClientOrderId': state.request.client_order_id}))
+        await client.wait_for(timeout=5)
+    assert state.status == 'CANCELED'
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('secret_key, order, code', [
+    ('wrong', OrderRequest('BTCUSDT', 'BUY', 0.01), -1022),
+    ('secret', OrderRequest('DOGEUSDT', 'BUY', 10.0), -1121),
+], ids=['bad-signature', 'bad-symbol'])
+async def test_refused_order_is_rejected(secret_key, order, code):
+    async with connected(secret_key=secret_key) as (exchange, client):
+        state = await client.place_order(order)
+        await client.wait_for(timeout=1)  # final at once, nothing left to settle
+    assert state.status == 'REJECTED'
+    assert f'code {code}' in state.error
+    assert exchange.orders == {}
+
+
+@pytest.mark.asyncio
+async def test_close_deletes_listen_key():
+    async with connected() as (exchange, client):
+        await client.start_user_stream()
+        listen_key = client._listen_key
+        assert exchange.closed_listen_keys == []
+    assert exchange.closed_listen_keys == [listen_key]
+
+
+@pytest.mark.asyncio
+async def test_undecodable_error_page_does_not_fail_the_batch():
+    async with connected() as (exchange, client):
+        exchange.unknown_orders, exchange.html_errors = 1, True
+        states = await client.place_orders([OrderRequest('BTCUSDT', 'BUY', 0.01), OrderRequest('ETHUSDT', 'BUY', 0.1)])
+        assert sorted(state.status for state in states) == ['FILLED', 'UNKNOWN']
+        assert any('Undecodable response' in (state.error or '') for state in states)
+
+        await client.wait_for(timeout=5)
+    assert [state.status for state in states] == ['FILLED', 'FILLED']
+
+
+@pytest.mark.asyncio
+async def test_reports_missed_while_reconnecting_are_reconciled():
+    async with connected() as (exchange, client):
+        await client.start_user_stream()
+        state = await client.place_order(OrderRequest('BTCUSDT', 'BUY', 0.02, type='LIMIT', price=59000.0))
+
+        await exchange.disconnect_streams()
+        await exchange.fill(state.request.client_order_id)  # reported to nobody
+        await client.wait_for(timeout=5)  # the client reconnects after 1 s and queries its open orders
+    assert state.status == 'FILLED'
+    assert state.filled == pytest.approx(0.02)
@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+
+from finrl_implimentation.finrl_implimentation import BUY, SELL, VecTradingEnv
+from indicator_and_strategy.backtester import Backtester, FillModel
+
+MODEL = FillModel(buy_cost_pct=0.001, sell_cost_pct=0.002, slippage_bps=5.0)
+CLOSE = np.array([100.0, 102.0, 101.0, 103.0])
+
+
+def test_fill_agrees_with_array_methods():
+    quantity = np.array([2.0, -3.0, 0.5])
+    price = np.array([100.0, 101.0, 99.0])
+    fill_price = MODEL.fill_price(price, quantity)
+    fee = MODEL.fee(quantity, fill_price)
+    assert [MODEL.fill(q, p) for q, p in zip(quantity, price)] == list(zip(fill_price, fee))
+
+
+def test_backtester_charges_the_fill_model():
+    fills = Backtester(pd.DataFrame({'open': CLOSE, 'close': CLOSE}), MODEL).run([1, -1, -1, -1]).fills
+    quantity = np.array([1.0, -2.0])
+    price = MODEL.fill_price(CLOSE[[1, 2]], quantity)
+
+    assert fills['quantity'].tolist() == quantity.tolist()
+    assert fills['price'].tolist() == price.tolist()
+    assert fills['fee'].tolist() == MODEL.fee(quantity, price).tolist()
+
+
+def test_env_charges_the_fill_model():
+    env = VecTradingEnv(np.zeros((len(CLOSE), 1), dtype=np.float32), CLOSE, n_envs=1, episode_length=3,
+                        fill_model=MODEL, random_start=False)
+    env.reset()
+    env.step([BUY])
+    env.step([SELL])
+    quantity = np.array([1.0, -2.0])
+    price = MODEL.fill_price(CLOSE[[0, 1]], quantity)
+
+    assert env.cash[0] == 100000.0 - (quantity[0] * price[0] + MODEL.fee(quantity[0], price[0])) \
+                                   - (quantity[1] * price[1] + MODEL.fee(quantity[1], price[1]))
+
+
+def test_backtester_fills_nothing_on_missing_volume():
+    dataset = pd.DataFrame({'open': CLOSE, 'close': CLOSE, 'volume': [10.0, np.nan, 10.0, 10.0]})
+    result = Backtester(dataset, FillModel(max_participation=0.1)).run([2, 2, 2, 2])
+
+    assert result.fills['bar'].tolist() == [2, 3]  # the order keeps working through the missing bar
+    assert result.fills['quantity'].tolist() == [1.0, 1.0]
+    assert np.isfinite(result.equity).all() and np.isfinite(result.cash).all()
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+talib = pytest.importorskip('talib')
+
+from indicator_and_strategy import indicator_engine
+from indicator_and_strategy.indicator_engine import IndicatorEngine
+
+
+def bars(n: int = 20_000, seed: int = 0):
+    """Random-walk bars around 60000 with flat stretches (high == low == close), long enough to zero the true range."""
+    rng = np.random.default_rng(seed)
+    close = np.round(60000.0 * np.exp(np.cumsum(rng.normal(0.0, 5e-4, n))), 2)
+    high = close + np.round(np.abs(rng.normal(0.0, 10.0, n)), 2)
+    low = close - np.round(np.abs(rng.normal(0.0, 10.0, n)), 2)
+    for start, length in ((0, 40), (1000, 60), (7000, 30), (15000, 600)):
+        close[start:start + length] = close[start]
+        high[start:start + length] = low[start:start + length] = close[start]
+    return {'high': high, 'low': low, 'close': close, 'volume': np.round(rng.lognormal(1.0, 1.0, n), 4)}
+
+
+@pytest.mark.parametrize('window', [2, 14, 30])
+def test_true_range_indicators_match_talib(window):
+    arrays = bars()
+    matrix = IndicatorEngine.from_arrays(arrays, window).compute_matrix(['atr', 'adx', 'adix'])
+    high, low, close = arrays['high'], arrays['low'], arrays['close']
+
+    np.testing.assert_array_equal(matrix[:, 0], talib.ATR(high, low, close, window))
+    for column, expected in enumerate([talib.ADX(high, low, close, window), talib.ADXR(high, low, close, window)], 1):
+        np.testing.assert_allclose(matrix[:, column], expected, rtol=1e-9, atol=1e-6)
+
+
+def test_true_range_is_computed_once(monkeypatch):
+    calls = []
+    trange = talib.TRANGE
+    monkeypatch.setattr(indicator_engine.talib, 'TRANGE', lambda *args: calls.append(args) or trange(*args))
+
+    IndicatorEngine.from_arrays(bars()).compute_matrix(['atr', 'adx', 'adix', ('atr', 20), ('adx', 20)])
+    assert len(calls) == 1
+
+
+def test_windowless_indicators_are_named_without_window():
+    engine = IndicatorEngine.from_arrays(bars(), 20)
+    assert engine.columns(['macd', 'obv', 'stoch', 'rsi', ('bollinger_bands', 10)]) == [
+        'macd_macd', 'macd_signal', 'macd_hist', 'obv', 'stoch_slowk', 'stoch_slowd', 'rsi_20',
+        'bollinger_bands_10_upper', 'bollinger_bands_10_middle', 'bollinger_bands_10_lower']
+    assert list(engine.compute(['macd', 'obv']).columns) == ['macd_macd', 'macd_signal', 'macd_hist', 'obv']
@@ -0,0 +1,127 @@
+import json
+import urllib.error
+import urllib.request
+
+import numpy as np
+import pytest
+
+from finrl_implimentation.inference import NumpyPolicy, OnnxPolicy, Policy, PolicyServer, export_onnx, export_policy
+
+# 2 inputs -> 3 relu units -> 3 outputs, small enough to work out by hand
+WEIGHTS = [np.array([[1.0, 0.0], [0.0, 1.0], [1.0, 1.0]]),
+           np.array([[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 2.0]])]
+BIASES = [np.array([0.0, 0.0, -1.0]), np.zeros(3)]
+OBS = np.array([[3.0, 1.0], [-1.0, 2.0], [1.0, 0.0]])
+# hidden = relu([x, y, x + y - 1]); output = hidden * [1, 1, 2]
+OUTPUT = np.array([[3.0, 1.0, 6.0], [0.0, 2.0, 0.0], [1.0, 0.0, 0.0]])
+
+
+def mlp(**kwargs) -> NumpyPolicy:
+    return NumpyPolicy(WEIGHTS, BIASES, activation='relu', **kwargs)
+
+
+def test_policy_is_abstract():
+    with pytest.raises(TypeError):
+        Policy()
+
+
+def test_discrete_predict_is_argmax():
+    policy = mlp()
+    np.testing.assert_array_equal(policy.forward(OBS.astype(np.float32)), OUTPUT)
+    np.testing.assert_array_equal(policy.predict(OBS), [2, 1, 0])
+    np.testing.assert_array_equal(policy.predict(OBS[0]), [2])  # a single observation is a batch of one
+
+
+def test_box_predict_is_clipped_to_bounds():
+    policy = mlp(action_space='box', low=np.full(3, -1.0), high=np.full(3, 2.0))
+    np.testing.assert_array_equal(policy.predict(OBS), [[2.0, 1.0, 2.0], [0.0, 2.0, 0.0], [1.0, 0.0, 0.0]])
+
+
+def test_observations_are_normalized_and_clipped():
+    # (obs - 1) / 2 clipped to [-1, 1]: [11, 1] -> [5, 0] -> [1, 0] -> output [1, 0, 0]; unclipped it would be [5, 0, 8]
+    policy = mlp(action_space='box', low=np.full(3, -10.0), high=np.full(3, 10.0), obs_mean=[1.0, 1.0],
+                 obs_var=[4.0, 4.0], clip_obs=1.0, epsilon=0.0)
+    np.testing.assert_array_equal(policy.predict([[11.0, 1.0], [3.0, 3.0], [1.0, 1.0]]),
+                                  [[1.0, 0.0, 0.0], [1.0, 1.0, 2.0], [0.0, 0.0, 0.0]])
+
+
+def post(url: str, payload) -> tuple:
+    request = urllib.request.Request(url, data=json.dumps(payload).encode(), method='POST',
+                                     headers={'Content-Type': 'application/json'})
+    try:
+        with urllib.request.urlopen(request, timeout=5) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_policy_server_predict():
+    with PolicyServer(mlp()) as server:
+        observations = dict(zip(['BTC', 'ETH', 'SOL'], OBS.tolist()))
+        status, payload = post(f'{server.url}/predict', {'observations': observations})
+        assert status == 200
+        assert payload == {'actions': {'BTC': 2, 'ETH': 1, 'SOL': 0}}
+
+        assert post(f'{server.url}/predict', {'observations': {}}) == (200, {'actions': {}})
+        assert post(f'{server.url}/predict', {'obs': {}})[0] == 400
+        with urllib.request.urlopen(f'{server.url}/health', timeout=5) as response:
+            assert json.loads(response.read()) == {'status': 'ok'}
+
+
+# export: needs torch and stable-baselines3 (onnx and onnxruntime as well for the ONNX path)
+
+def trained_model(env_id: str, normalize: bool):
+    pytest.importorskip('torch')
+    sb3 = pytest.importorskip('stable_baselines3')
+    from stable_baselines3.common.env_util import make_vec_env
+    from stable_baselines3.common.vec_env import VecNormalize
+
+    env = make_vec_env(env_id, n_envs=2, seed=0)
+    if normalize:
+        env = VecNormalize(env, clip_obs=2.0)
+    model = sb3.PPO('MlpPolicy', env, n_steps=64, batch_size=64, n_epochs=1, seed=0,
+                    policy_kwargs=dict(net_arch=[16, 16]))
+    model.learn(128)
+    return model, (env if normalize else None)
+
+
+def observations(model, n: int = 256) -> np.ndarray:
+    space = model.observation_space
+    return np.random.default_rng(0).uniform(np.maximum(space.low, -5.0), np.minimum(space.high, 5.0),
+                                            size=(n,) + space.shape).astype(np.float32)
+
+
+def sb3_actions(model, vec_normalize, obs) -> np.ndarray:
+    if vec_normalize is not None:
+        obs = vec_normalize.normalize_obs(obs)
+    return model.predict(obs, deterministic=True)[0]
+
+
+@pytest.mark.parametrize('env_id, normalize', [('CartPole-v1', False), ('CartPole-v1', True), ('Pendulum-v1', True)])
+def test_export_policy_matches_stable_baselines3(tmp_path, env_id, normalize):
+    model, vec_normalize = trained_model(env_id, normalize)
+    export_policy(model, tmp_path / 'policy.npz', vec_normalize=vec_normalize)
+    policy = NumpyPolicy.load(tmp_path / 'policy.npz')
+
+    obs = observations(model)
+    expected = sb3_actions(model, vec_normalize, obs)
+    if policy.action_space == 'discrete':
+        np.testing.assert_array_equal(policy.predict(obs), expected)
+    else:
+        np.testing.assert_allclose(policy.predict(obs), expected, atol=1e-5)
+
+
+@pytest.mark.parametrize('env_id', ['CartPole-v1', 'Pendulum-v1'])
+def test_export_onnx_matches_stable_baselines3(tmp_path, env_id):
+    pytest.importorskip('onnx')
+    pytest.importorskip('onnxruntime')
+    model, vec_normalize = trained_model(env_id, normalize=True)
+    export_onnx(model, tmp_path / 'policy.onnx', vec_normalize=vec_normalize)
+    policy = OnnxPolicy(tmp_path / 'policy.onnx')
+
+    obs = observations(model)
+    expected = sb3_actions(model, vec_normalize, obs)
+    if policy.action_space == 'discrete':
+        np.testing.assert_array_equal(policy.predict(obs), expected)
+    else:
+        np.testing.assert_allclose(policy.predict(obs), expected, atol=1e-5)
@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_implimentation.influxdb import InfluxReader, InfluxWriter, to_line_protocol
+from data_implimentation.mock_influxdb import MockInfluxDB, parse_line
+from data_preprocessor.preprocessor import DataPreprocessor
+
+
+def candles(n: int = 7, tic: str = 'BTC/USDT') -> pd.DataFrame:
+    date = pd.date_range('2024-01-02', periods=n, freq='1min')
+    close = 45000.0 + np.arange(n) * 12.5
+    return pd.DataFrame({'date': date, 'tic': tic, 'open': close - 5.0, 'high': close + 10.25,
+                         'low': close - 10.5, 'close': close, 'volume': np.linspace(0.1, 3.3, n)})
+
+
+@pytest.fixture
+def influx():
+    with MockInfluxDB() as server:
+        yield server
+
+
+def writer(influx, **kwargs) -> InfluxWriter:
+    return InfluxWriter(influx.url, 'org', 'bucket', influx.token, flush_interval=60, **kwargs)
+
+
+def test_line_protocol_escapes_tags():
+    df = candles(1, tic='BTC/USDT perp,x=1\\')
+    df['timeframe'] = '1m'
+    [record] = to_line_protocol(df, source='binance')
+
+    assert record == ('candles,tic=BTC/USDT\\ perp\\,x\\=1\\\\,timeframe=1m,source=binance '
+                      'open=44995.0,high=45010.25,low=44989.5,close=45000.0,volume=0.1 1704153600000')
+    assert parse_line(record)['tags'] == {'tic': 'BTC/USDT perp,x=1\\', 'timeframe': '1m', 'source': 'binance'}
+
+
+def test_non_finite_fields_are_left_out(influx):
+    df = candles(3)
+    df.loc[0, 'volume'] = np.nan
+    df.loc[1, ['open', 'high', 'low', 'close']] = [np.nan, np.inf, np.nan, np.nan]
+    df.loc[2, ['open', 'high', 'low', 'close', 'volume']] = np.nan
+    records = to_line_protocol(df)
+
+    assert len(records) == 2  # the all-NaN row is skipped
+    assert records[0].split(' ')[1] == 'open=44995.0,high=45010.25,low=44989.5,close=45000.0'
+    assert records[1].split(' ')[1] == 'volume=1.7'
+
+    with writer(influx) as w:
+        w.write(df)
+    assert [point['fields'] for point in influx.points] == [
+        {'open': 44995.0, 'high': 45010.25, 'low': 44989.5, 'close': 45000.0}, {'volume': 1.7}]
+
+
+def test_writes_in_batches(influx):
+    with writer(influx, batch_size=3) as w:
+        w.write(candles(7))
+
+    assert [len(write['body'].split('\n')) for write in influx.writes] == [3, 3, 1]
+    assert influx.writes[0]['params'] == {'org': 'org', 'bucket': 'bucket', 'precision': 'ms'}
+    assert len(influx.points) == 7
+
+
+def test_write_flushes_when_batch_is_full(influx):
+    w = writer(influx, batch_size=5)
+    w.write(candles(4))
+    assert influx.writes == []
+    w.write_candle(candles(5).iloc[4].to_dict())
+    assert len(influx.writes) == 1
+    w.close()
+
+
+def test_retries_transient_errors(influx):
+    influx.fail_writes = 2
+    with writer(influx) as w:
+        w.write(candles(3))
+
+    assert influx.fail_writes == 0
+    assert len(influx.writes) == 1
+    assert len(influx.points) == 3
+
+
+def test_does_not_retry_rejected_batches(influx):
+    influx.fail_writes, influx.fail_status = 1, 400
+    with writer(influx) as w:
+        w.write(candles(3))
+        w.flush()
+        w.write(candles(2))
+
+    # a retry of the rejected batch would have been stored as the first write
+    assert [len(write['body'].split('\n')) for write in influx.writes] == [2]
+
+
+def test_round_trip_into_preprocessor_schema(influx):
+    df = candles(7)
+    with writer(influx) as w:
+        w.write(df)
+        w.write(candles(7, tic='ETH/USDT'))
+
+    reader = InfluxReader(influx.url, 'org', 'bucket', influx.token)
+    result = reader.query_candles('BTC/USDT', '2024-01-02 00:01', '2024-01-02 00:06')
+
+    expected = DataPreprocessor(df.rename(columns={'date': 'timestamp'})
+                                  .drop(columns='tic').iloc[1:6].reset_index(drop=True), source='ccxt').preprocess()
+    expected['tic'] = 'BTC/USDT'
+    pd.testing.assert_frame_equal(result, expected)
@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_preprocessor.ingest import from_frame, from_rows
+from data_preprocessor.preprocessor import DataPreprocessor
+
+
+def yfinance_download(tickers=('AAPL',)) -> pd.DataFrame:
+    """A frame shaped like `yf.download`: ('Price', 'Ticker') column pairs over a 'Date' index."""
+    index = pd.date_range('2024-01-02', periods=4, freq='D', name='Date')
+    columns = pd.MultiIndex.from_product([['Close', 'High', 'Low', 'Open', 'Volume'], tickers],
+                                         names=['Price', 'Ticker'])
+    values = np.arange(len(index) * len(columns), dtype=np.float64).reshape(len(index), len(columns)) + 100.0
+    return pd.DataFrame(values, index=index, columns=columns)
+
+
+def test_flattens_yfinance_multiindex_columns():
+    download = yfinance_download()
+    df = from_frame(download)
+
+    assert list(df.columns) == ['open', 'high', 'low', 'close', 'adj_close', 'volume']
+    assert len(df) == 4
+    np.testing.assert_array_equal(df['close'], download[('Close', 'AAPL')])
+    assert isinstance(download.columns, pd.MultiIndex)  # the caller's frame is left alone
+
+
+def test_rejects_multi_ticker_yfinance_frame():
+    with pytest.raises(ValueError, match="one ticker"):
+        from_frame(yfinance_download(('AAPL', 'MSFT')))
+
+
+def candles(tickers, periods: int = 3) -> pd.DataFrame:
+    frames = [pd.DataFrame({'timestamp': pd.date_range('2024-01-02', periods=periods, freq='1min'), 'tic': tic,
+                            'open': 1.0, 'high': 2.0, 'low': 0.5, 'close': 1.5, 'volume': 10.0})
+              for tic in tickers]
+    return pd.concat(frames, ignore_index=True)
+
+
+@pytest.mark.parametrize('tickers', [['BTC/USDT', 'ETH/USDT'], ['ETH/USDT', 'BTC/USDT', 'ADA/USDT']])
+def test_accepts_frames_grouped_by_ticker_in_any_order(tickers):
+    df = DataPreprocessor(candles(tickers), source='ccxt').ingest()
+    assert list(df['tic'].unique()) == tickers
+    assert sorted(df['tic'].cat.categories) == sorted(tickers)
+
+
+def test_accepts_frames_interleaved_by_time():
+    df = candles(['ETH/USDT', 'BTC/USDT']).sort_values(['timestamp', 'tic'])
+    assert len(from_frame(df)) == 6
+
+
+def test_rejects_duplicates_and_disorder_within_a_ticker():
+    df = candles(['ETH/USDT', 'BTC/USDT'])
+    duplicated = df.copy()
+    duplicated.loc[4, 'timestamp'] = duplicated.loc[3, 'timestamp']
+    with pytest.raises(ValueError, match="Duplicate"):
+        from_frame(duplicated)
+    with pytest.raises(ValueError, match="Out-of-order"):
+        from_frame(df.iloc[[0, 2, 1, 3, 4, 5]])
+
+
+def test_accepts_staggered_listings_sorted_by_time():
+    # ETH lists first, BTC (alphabetically first) joins at t1
+    df = pd.DataFrame({'timestamp': pd.to_datetime(['2024-01-02 00:00', '2024-01-02 00:01', '2024-01-02 00:01']),
+                       'tic': ['ETH/USDT', 'BTC/USDT', 'ETH/USDT'], 'open': 1.0, 'high': 2.0, 'low': 0.5,
+                       'close': 1.5, 'volume': 10.0})
+    assert len(from_frame(df)) == 3
+
+    disordered = df.assign(tic=['BTC/USDT', 'ETH/USDT', 'BTC/USDT'])  # neither by time then tic, nor by tic
+    with pytest.raises(ValueError, match="Out-of-order timestamp at row 2"):  # nothing is duplicated
+        from_frame(disordered)
+
+
+def test_rejects_ragged_rows():
+    rows = [[1_700_000_000_000 + i * 60_000, 1.0, 2.0, 0.5, 1.5, 10.0] for i in range(4)]
+    rows[1] = rows[1][:5]
+    rows[2] = rows[2] + [0.0]  # same total count: the middle rows would shift columns silently
+    with pytest.raises(ValueError, match="rows of 6 fields"):
+        from_rows(rows)
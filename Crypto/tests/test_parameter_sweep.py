@@ -0,0 +1,44 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from indicator_and_strategy.meanreversionstrategy import MeanReversionStrategy
+from indicator_and_strategy.momentumstrategy import MomentumStrategy
+from indicator_and_strategy.parameter_sweep import ParameterSweep
+
+
+def prices(n: int = 3000, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = np.round(100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.01, n))), 2)
+    close[500:520] = close[500]  # flat stretch: equal moving averages give repeated same-side crossovers
+    return pd.DataFrame({'date': pd.date_range('2024-01-01', periods=n, freq='h'), 'close': close})
+
+
+GRIDS = {
+    MomentumStrategy: dict(short_window=range(2, 8), long_window=range(5, 11)),
+    MeanReversionStrategy: dict(window=[10, 20, 30], entry_z=[1.0, 1.5, 2.0], exit_z=[0.0, 0.5]),
+}
+
+
+@pytest.mark.parametrize('strategy_cls', GRIDS, ids=lambda cls: cls.__name__)
+def test_sweep_matches_execute_strategy(strategy_cls):
+    dataset = prices()
+    table = ParameterSweep(strategy_cls, dataset, max_workers=1).grid(**GRIDS[strategy_cls])
+    assert len(table) == len(list(itertools.product(*GRIDS[strategy_cls].values())))
+
+    for row in table.to_dict('records'):
+        params = {name: row[name] for name in GRIDS[strategy_cls]}
+        strategy = strategy_cls(dataset[['date', 'close']].copy(), **params)
+        assert row['trades'] == len(strategy.pnls), params
+        assert row['pnl'] == pytest.approx(np.sum(strategy.pnls), abs=1e-9), params
+        assert row['sharpe'] == pytest.approx(strategy.metrics.sharpe_ratio, rel=1e-3, nan_ok=True), params
+
+
+def test_process_pool_matches_in_process():
+    dataset = prices()
+    grid = GRIDS[MeanReversionStrategy]
+    local = ParameterSweep(MeanReversionStrategy, dataset, max_workers=1).grid(**grid)
+    pooled = ParameterSweep(MeanReversionStrategy, dataset, max_workers=2, max_cells=4 * len(dataset)).grid(**grid)
+    pd.testing.assert_frame_equal(pooled, local)
@@ -0,0 +1,35 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_preprocessor.pipeline import FeaturePipeline, FeatureStore
+from finrl_implimentation.finrl_implimentation import build_features
+
+
+def candles(n: int = 50_000, price: float = 0.1, decimals: int = 4, seed: int = 0) -> pd.DataFrame:
+    """Random-walk candles with a flat stretch every 2500 bars, where the short and long moving averages tie."""
+    rng = np.random.default_rng(seed)
+    close = np.round(price * np.exp(np.cumsum(rng.normal(0.0, 1e-3, n))), decimals)
+    for start in range(1000, n, 2500):
+        close[start:start + 100] = close[start]
+    tick = 10.0 ** -decimals
+    high = close + tick * np.round(np.abs(rng.normal(0.0, 5.0, n)))
+    low = close - tick * np.round(np.abs(rng.normal(0.0, 5.0, n)))
+    open_ = np.concatenate(([close[0]], close[:-1]))
+    return pd.DataFrame({'date': pd.date_range('2024-01-01', periods=n, freq='min'), 'open': open_, 'high': high,
+                         'low': low, 'close': close, 'volume': np.round(rng.lognormal(1.0, 1.0, n), 4)})
+
+
+@pytest.mark.parametrize('chunk_size', [50_000, 4_999, 1_025])
+def test_pipeline_matches_build_features(tmp_path, chunk_size):
+    df = candles()
+    expected = build_features(df)
+    pipeline = FeaturePipeline(FeatureStore(tmp_path), tic='BTC/USDT')
+    # with 1025-row chunks the first boundary falls inside the first flat stretch
+    store = pipeline.run(df.iloc[i:i + chunk_size] for i in range(0, len(df), chunk_size))
+    features, close, _ = store.open('BTC/USDT')
+
+    assert features.shape == expected.shape
+    np.testing.assert_array_equal(close, df['close'])
+    np.testing.assert_array_equal(features[:, -1], expected[:, -1])  # momentum signal, bit for bit
+    np.testing.assert_allclose(features[:, :-1], expected[:, :-1], rtol=1e-4, atol=1e-7)
@@ -0,0 +1,85 @@
+import multiprocessing as mp
+import os
+
+import numpy as np
+import pytest
+
+from finrl_implimentation import rollout
+from finrl_implimentation.rollout import SharedMemoryVecEnv
+
+FEATURES = np.random.default_rng(0).normal(size=(400, 4)).astype(np.float32)
+PRICES = 100.0 + np.arange(400.0)
+
+
+def shared_blocks() -> set:
+    return set(os.listdir('/dev/shm')) if os.path.isdir('/dev/shm') else set()
+
+
+def test_constructs_as_stable_baselines3_vec_env():
+    vec_env = pytest.importorskip('stable_baselines3.common.vec_env')
+    env = SharedMemoryVecEnv(FEATURES, PRICES, n_workers=2, envs_per_worker=2, episode_length=20, seed=0)
+    try:
+        assert isinstance(env, vec_env.VecEnv)
+        assert env.num_envs == 4
+        assert env.render_mode is None
+        obs = env.reset()
+        assert obs.shape == (4, FEATURES.shape[1] + 4)
+        obs, rewards, dones, infos = env.step(np.ones(4, dtype=np.int64))
+        assert rewards.shape == dones.shape == (4,) and len(infos) == 4
+    finally:
+        env.close()
+
+
+def test_attribute_access():
+    env = SharedMemoryVecEnv(FEATURES, PRICES, n_workers=2, episode_length=20, seed=0)
+    try:
+        assert env.get_attr('render_mode') == [None, None]
+        assert env.get_attr('render_mode', indices=1) == [None]
+        assert env.env_is_wrapped(object, indices=[0]) == [False]
+        with pytest.raises(AttributeError):
+            env.get_attr('prices')
+        with pytest.raises(AttributeError):
+            env.env_method('render')
+    finally:
+        env.close()
+
+
+def test_failed_construction_releases_workers_and_memory(monkeypatch):
+    def fail(*args, **kwargs):
+        raise RuntimeError("boom")
+
+    before = shared_blocks()
+    monkeypatch.setattr(rollout.spaces, 'Discrete', fail)  # fails after the workers are running
+    with pytest.raises(RuntimeError, match="boom"):
+        SharedMemoryVecEnv(FEATURES, PRICES, n_workers=2, episode_length=20, seed=0)
+
+    assert mp.active_children() == []
+    assert shared_blocks() == before
+
+
+def test_worker_startup_failure_is_raised():
+    before = shared_blocks()
+    # 400 bars over 2 workers: each shard is too short for 300-bar episodes
+    with pytest.raises(ValueError, match="Not enough bars") as info:
+        SharedMemoryVecEnv(FEATURES, PRICES, n_workers=2, episode_length=300, seed=0)
+    assert "In rollout worker 0" in str(info.value.__cause__)
+
+    assert mp.active_children() == []
+    assert shared_blocks() == before
+
+
+def test_seed_reaches_workers():
+    first = SharedMemoryVecEnv(FEATURES, PRICES, n_workers=2, envs_per_worker=2, episode_length=20, seed=0)
+    second = SharedMemoryVecEnv(FEATURES, PRICES, n_workers=2, envs_per_worker=2, episode_length=20, seed=1)
+    try:
+        assert first.seed(7) == [7, 8, 9, 10]
+        assert second.seed(7) == [7, 8, 9, 10]
+        obs = first.reset()
+        np.testing.assert_array_equal(second.reset(), obs)
+
+        first.seed(8)
+        assert not np.array_equal(first.reset(), obs)
+        assert second.seed() == [None] * 4
+    finally:
+        first.close()
+        second.close()
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+talib = pytest.importorskip('talib')
+
+from indicator_and_strategy.streaming_indicators import STREAMING_INDICATORS
+
+
+def bars(n: int = 20_000, seed: int = 0):
+    """Random-walk bars around 60000 with flat stretches (high == low == close), where cancellation bites."""
+    rng = np.random.default_rng(seed)
+    close = 60000.0 * np.exp(np.cumsum(rng.normal(0.0, 5e-4, n)))
+    close = np.round(close, 2)
+    high = close + np.round(np.abs(rng.normal(0.0, 10.0, n)), 2)
+    low = close - np.round(np.abs(rng.normal(0.0, 10.0, n)), 2)
+    for start, length in ((1000, 60), (7000, 30), (15000, 200)):
+        close[start:start + length] = close[start]
+        high[start:start + length] = low[start:start + length] = close[start]
+    volume = np.round(rng.lognormal(1.0, 1.0, n), 4)
+    return high, low, close, volume
+
+
+HIGH, LOW, CLOSE, VOLUME = bars()
+
+REFERENCE = {
+    'sma': lambda: talib.SMA(CLOSE, 14),
+    'ema': lambda: talib.EMA(CLOSE, 14),
+    'rsi': lambda: talib.RSI(CLOSE, 14),
+    'macd': lambda: talib.MACD(CLOSE, 12, 26, 9),
+    'bollinger_bands': lambda: talib.BBANDS(CLOSE, 14, 2.0, 2.0, 0),
+    'atr': lambda: talib.ATR(HIGH, LOW, CLOSE, 14),
+    'adx': lambda: talib.ADX(HIGH, LOW, CLOSE, 14),
+    'cci': lambda: talib.CCI(HIGH, LOW, CLOSE, 14),
+    'obv': lambda: talib.OBV(CLOSE, VOLUME),
+    'stoch': lambda: talib.STOCH(HIGH, LOW, CLOSE),
+    'williams': lambda: talib.WILLR(HIGH, LOW, CLOSE, 14),
+    'roc': lambda: talib.ROC(CLOSE, 14),
+    'momentum': lambda: talib.MOM(CLOSE, 14),
+}
+
+
+def stream(name: str) -> np.ndarray:
+    indicator = STREAMING_INDICATORS[name]()
+    values = [indicator.update_bar(h, l, c, v) for h, l, c, v in zip(HIGH, LOW, CLOSE, VOLUME)]
+    return np.array(values, dtype=np.float64).reshape(len(values), -1)
+
+
+@pytest.mark.parametrize('name', sorted(STREAMING_INDICATORS))
+def test_matches_talib_bar_for_bar(name):
+    expected = REFERENCE[name]()
+    expected = np.column_stack(expected) if isinstance(expected, tuple) else expected[:, None]
+    np.testing.assert_allclose(stream(name), expected, rtol=1e-9, atol=1e-6)
+
+
+def test_bollinger_bands_collapse_on_flat_stretches():
+    upper, middle, lower = stream('bollinger_bands').T
+    talib_upper, _, talib_lower = talib.BBANDS(CLOSE, 14, 2.0, 2.0, 0)
+    flat = np.zeros(len(CLOSE), dtype=bool)
+    for start, length in ((1000, 60), (7000, 30), (15000, 200)):
+        flat[start + 13:start + length] = True  # windows lying wholly inside the stretch
+
+    np.testing.assert_array_equal(talib_upper[flat] - talib_lower[flat], 0.0)
+    np.testing.assert_array_equal(upper[flat] - lower[flat], 0.0)
+    np.testing.assert_array_equal(middle[flat], upper[flat])